@@ -0,0 +1,59 @@
+# Run from the project root with: python -m benchmark.dispatch_bench
+from typing import Any, Callable, Iterable
+from timeit import timeit
+from flask import Flask
+from httpwrap import jsoner
+from webrpc import from_path, from_path_int, WebSuite, WsgiDispatcher
+from werkzeug.test import EnvironBuilder
+from wsgiref.types import StartResponse, WSGIApplication, WSGIEnvironment
+from cofre_de_senhas.service import CabecalhoSegredoComChave, ChaveSegredo, TipoSegredo
+
+
+def _make_app() -> tuple[Flask, WebSuite]:
+    app: Flask = Flask(__name__)
+    ws: WebSuite = WebSuite(app, "/map")
+
+    # Roughly the same URL map that the real application has.
+    for recurso in ["usuarios", "categorias", "admin"]:
+        for metodo in ["GET", "PUT", "MOVE", "DELETE"]:
+            def nomeado(nome: str) -> None:
+                pass
+            nomeado.__name__ = f"{recurso}_{metodo}_nome"
+            ws.route(metodo, f"/{recurso}/nome/<nome>", from_path("nome"))(jsoner(nomeado))
+
+            def branco() -> None:
+                pass
+            branco.__name__ = f"{recurso}_{metodo}_branco"
+            ws.route(metodo, f"/{recurso}/nome/")(jsoner(branco))
+
+    @ws.route("GET", "/segredos/chave/<pk_segredo>", from_path_int("pk_segredo"))
+    @jsoner
+    def buscar_segredo_por_chave(pk_segredo: int) -> CabecalhoSegredoComChave:
+        return CabecalhoSegredoComChave(ChaveSegredo(pk_segredo), "Segredo", "Descrição", TipoSegredo.PUBLICO)
+
+    return app, ws
+
+
+def _call(wsgi: WSGIApplication, environ: WSGIEnvironment) -> None:
+    def start_response(status: str, headers: list[tuple[str, str]], exc_info: Any = None) -> Callable[[bytes], object]:
+        assert status.startswith("200")
+        return lambda data: None
+    sr: StartResponse = start_response
+    body: Iterable[bytes] = wsgi(dict(environ), sr)
+    for _ in body:
+        pass
+
+
+def main() -> None:
+    n: int = 20_000
+    app, ws = _make_app()
+    flask_wsgi: WSGIApplication = app.wsgi_app
+    dispatcher: WsgiDispatcher = WsgiDispatcher(ws)
+    environ: WSGIEnvironment = EnvironBuilder(path = "/segredos/chave/42", method = "GET").get_environ()
+    old: float = timeit(lambda: _call(flask_wsgi, environ), number = n)
+    new: float = timeit(lambda: _call(dispatcher, environ), number = n)
+    print(f"GET /segredos/chave/<pk>  flask routing: {old / n * 1e6:8.2f} us/request    radix dispatcher: {new / n * 1e6:8.2f} us/request")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+# Run from the project root with: python -m benchmark.fetch_bench
+from typing import Any, Callable
+from dataclasses import dataclass
+from sqlite3 import connect
+from timeit import timeit
+from validator import dataclass_validate
+from connection.conn import SimpleConnection
+
+_ROWS: int = 100_000
+
+
+@dataclass_validate
+@dataclass(frozen = True)
+class _Fruit:
+    pk_fruit: int
+    name: str
+    price: float
+    stock: int
+
+
+_DATA: list[tuple[int, str, float, int]] = [(i, f"fruit {i}", i / 10, i % 7) for i in range(_ROWS)]
+
+
+# Stands for the connection and the cursor of a MySQL/MariaDB server, so only the work of the wrappers is measured.
+class _CannedCursor:
+
+    def __init__(self, description: list[tuple[Any, ...]]) -> None:
+        self.__description: list[tuple[Any, ...]] = description
+        self.__rows: list[tuple[Any, ...]] = []
+        self.rowcount: int = 0
+        self.lastrowid: int | None = None
+
+    @property
+    def description(self) -> Any:
+        return self.__description[:]
+
+    def execute(self, sql: str, parameters: Any = (), multi: bool = False) -> None:
+        self.__rows = list(reversed(_DATA))
+
+    def fetchone(self) -> tuple[Any, ...] | None:
+        return self.__rows.pop() if self.__rows else None
+
+    def close(self) -> None:
+        pass
+
+
+class _CannedConnection:
+
+    def __init__(self, description: list[tuple[Any, ...]]) -> None:
+        self.__description: list[tuple[Any, ...]] = description
+        self.unread_result: bool = False
+
+    def cursor(self, **kwargs: Any) -> _CannedCursor:
+        return _CannedCursor(self.__description)
+
+
+def _sqlite() -> SimpleConnection:
+    from connection.sqlite3conn import _Sqlite3ConnectionWrapper
+    raw = connect(":memory:", check_same_thread = False)
+    raw.execute("CREATE TABLE fruit (pk_fruit INTEGER PRIMARY KEY, name TEXT NOT NULL, price REAL NOT NULL, stock INTEGER NOT NULL)")
+    raw.executemany("INSERT INTO fruit VALUES (?, ?, ?, ?)", _DATA)
+    return _Sqlite3ConnectionWrapper(raw, ":memory:")
+
+
+def _mariadb() -> SimpleConnection:
+    from connection.mariadbconn import _MariaDBConnectionWrapper
+    names: list[str] = ["pk_fruit", "name", "price", "stock"]
+    codes: list[int] = [3, 253, 5, 3]
+    description: list[tuple[Any, ...]] = [(n, c, 11, 11, 0, 0, 0, 4097, "fruit", n, "fruit") for n, c in zip(names, codes)]
+    return _MariaDBConnectionWrapper(_CannedConnection(description), "fruits")  # type: ignore[arg-type]
+
+
+def _mysql() -> SimpleConnection:
+    from connection.mysqlconn import _MySQLConnectionWrapper
+    names: list[str] = ["pk_fruit", "name", "price", "stock"]
+    codes: list[int] = [3, 253, 5, 3]
+    description: list[tuple[Any, ...]] = [(n, c, None, None, None, None, 0, 4097, 63) for n, c in zip(names, codes)]
+    return _MySQLConnectionWrapper(_CannedConnection(description), "fruits")  # type: ignore[arg-type]
+
+
+def main() -> None:
+    backends: dict[str, Callable[[], SimpleConnection]] = {"SQLite": _sqlite, "MariaDB": _mariadb, "MySQL": _mysql}
+    for name, make in backends.items():
+        try:
+            conn: SimpleConnection = make()
+        except ImportError as x:
+            print(f"{name:8}: skipped, {x}")
+            continue
+
+        def fetch() -> None:
+            conn.execute("SELECT pk_fruit, name, price, stock FROM fruit ORDER BY pk_fruit")
+            while conn.fetchone() is not None:
+                pass
+
+        def inflate() -> None:
+            conn.execute("SELECT pk_fruit, name, price, stock FROM fruit ORDER BY pk_fruit")
+            while conn.fetchone_class(_Fruit) is not None:
+                pass
+
+        n: int = 3
+        f: float = timeit(fetch, number = n)
+        i: float = timeit(inflate, number = n)
+        print(f"{name:8}: over {_ROWS} rows, fetchone: {f / n / _ROWS * 1e9:8.1f} ns per row    fetchone_class: {i / n / _ROWS * 1e9:8.1f} ns per row")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# Run from the project root with: python -m benchmark.groupcommit_bench
+from random import Random
+from tempfile import TemporaryDirectory
+from threading import Event, Thread
+from time import sleep
+from connection.pool import PoolConfig, PooledConnectionData
+from connection.sqlite3conn import SqliteConnectionData
+from connection.trans import TransactedConnection
+
+_THREADS: int = 8
+_SECONDS: float = 3.0
+_ROWS: int = 10_000
+
+
+def _prepare(file_name: str) -> None:
+    with SqliteConnectionData.create(file_name = file_name).connect() as c:
+        c.execute("CREATE TABLE fruit (pk_fruit INTEGER PRIMARY KEY, name TEXT NOT NULL, stock INTEGER NOT NULL)")
+        c.executemany("INSERT INTO fruit VALUES (?, ?, ?)", [(i, f"fruit {i}", 0) for i in range(_ROWS)])
+
+
+# Each thread runs small write transactions in a loop. Counts the transactions done in _SECONDS.
+def _run(name: str, directory: str, synchronous: str, group_commit: bool) -> tuple[int, int]:
+    file_name: str = f"{directory}/{name}.db"
+    _prepare(file_name)
+    data: SqliteConnectionData = SqliteConnectionData.create(
+        file_name = file_name,
+        profile = "server",
+        synchronous = synchronous,
+        group_commit = group_commit
+    )
+    pooled: PooledConnectionData = PooledConnectionData.create(inner = data, config = PoolConfig(max_size = _THREADS))
+    conn: TransactedConnection = data.connect() if group_commit else pooled.connect()
+    stop: Event = Event()
+    counts: list[list[int]] = []
+
+    @conn.transact
+    def update(pk: int) -> None:
+        conn.execute("UPDATE fruit SET stock = stock + 1 WHERE pk_fruit = ?", [pk])
+
+    def work(seed: int) -> None:
+        random: Random = Random(seed)
+        mine: list[int] = [0, 0]
+        counts.append(mine)
+        while not stop.is_set():
+            try:
+                update(random.randrange(_ROWS))
+                mine[0] += 1
+            except Exception:
+                mine[1] += 1
+
+    threads: list[Thread] = [Thread(target = work, args = (i, )) for i in range(_THREADS)]
+    for t in threads:
+        t.start()
+    sleep(_SECONDS)
+    stop.set()
+    for t in threads:
+        t.join()
+    conn.close()
+    return sum(c[0] for c in counts), sum(c[1] for c in counts)
+
+
+def main() -> None:
+    with TemporaryDirectory() as directory:
+        for synchronous in ["NORMAL", "FULL"]:
+            for group_commit in [False, True]:
+                name: str = f"{synchronous.lower()}{' + group commit' if group_commit else ''}"
+                writes, errors = _run(name.replace(" ", "_"), directory, synchronous, group_commit)
+                print(f"{name:21}: {writes / _SECONDS:9.1f} writes/s    {errors} errors")
+
+
+if __name__ == "__main__":
+    main()
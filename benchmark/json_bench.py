@@ -0,0 +1,38 @@
+# Run from the project root with: python -m benchmark.json_bench
+from typing import Any
+from timeit import timeit
+from flask import Flask
+from httpwrap import para_json
+from sucesso import Sucesso
+from cofre_de_senhas.service import (
+    CabecalhoSegredoComChave, ChaveSegredo, ChaveUsuario, NivelAcesso, ResultadoListaDeUsuarios, ResultadoPesquisaDeSegredos,
+    SegredoComChave, TipoPermissao, TipoSegredo, UsuarioComChave
+)
+
+
+def _bench(app: Flask, name: str, value: Any, n: int) -> None:
+    envelope: Sucesso = Sucesso.criar(value)
+    assert app.json.loads(para_json(envelope)) == app.json.loads(app.json.dumps(envelope))
+    old: float = timeit(lambda: app.json.dumps(envelope), number = n)
+    new: float = timeit(lambda: para_json(envelope), number = n)
+    print(f"{name:<28} flask provider: {old / n * 1e6:9.2f} us/response    para_json: {new / n * 1e6:9.2f} us/response    speedup: {old / new:5.2f}x")
+
+
+def main() -> None:
+    app: Flask = Flask(__name__)
+    campos: dict[str, str] = {f"campo {i}": f"valor {i}" for i in range(10)}
+    segredo: SegredoComChave = SegredoComChave(
+        ChaveSegredo(1), "Segredo", "Descrição", TipoSegredo.ENCONTRAVEL, campos, ["Aplicação", "Produção"], {"Harry Potter": TipoPermissao.PROPRIETARIO}
+    )
+    cabecalhos: list[CabecalhoSegredoComChave] = [
+        CabecalhoSegredoComChave(ChaveSegredo(i), f"Segredo {i}", "Descrição", TipoSegredo.PUBLICO) for i in range(500)
+    ]
+    usuarios: list[UsuarioComChave] = [UsuarioComChave(ChaveUsuario(i), f"Usuário {i}", NivelAcesso.NORMAL) for i in range(500)]
+    with app.app_context():
+        _bench(app, "SegredoComChave", segredo, 20_000)
+        _bench(app, "500 CabecalhoSegredoComChave", ResultadoPesquisaDeSegredos(cabecalhos, "c2VncmVkbzo1MDA="), 200)
+        _bench(app, "500 UsuarioComChave", ResultadoListaDeUsuarios(usuarios), 200)
+
+
+if __name__ == "__main__":
+    main()
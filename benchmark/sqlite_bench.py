@@ -0,0 +1,67 @@
+# Run from the project root with: python -m benchmark.sqlite_bench
+from random import Random
+from tempfile import TemporaryDirectory
+from threading import Event, Thread
+from time import sleep
+from connection.pool import PoolConfig, PooledConnectionData, PooledTransactedConnection
+from connection.sqlite3conn import SqliteConnectionData
+
+_THREADS: int = 8
+_SECONDS: float = 3.0
+_ROWS: int = 10_000
+_WRITES: float = 0.1
+
+
+def _prepare(file_name: str) -> None:
+    with SqliteConnectionData.create(file_name = file_name).connect() as c:
+        c.execute("CREATE TABLE fruit (pk_fruit INTEGER PRIMARY KEY, name TEXT NOT NULL, stock INTEGER NOT NULL)")
+        c.executemany("INSERT INTO fruit VALUES (?, ?, ?)", [(i, f"fruit {i}", 0) for i in range(_ROWS)])
+
+
+# Each thread runs transactions in a loop. One in ten updates a row, the others read one. Counts the transactions done in _SECONDS.
+def _run(profile: str, directory: str) -> tuple[int, int, int]:
+    file_name: str = f"{directory}/{profile}.db"
+    _prepare(file_name)
+    data: SqliteConnectionData = SqliteConnectionData.create(file_name = file_name, profile = profile)
+    conn: PooledTransactedConnection = PooledConnectionData.create(inner = data, config = PoolConfig(max_size = _THREADS)).connect()
+    stop: Event = Event()
+    counts: list[list[int]] = []
+
+    def work(seed: int) -> None:
+        random: Random = Random(seed)
+        mine: list[int] = [0, 0, 0]
+        counts.append(mine)
+        while not stop.is_set():
+            pk: int = random.randrange(_ROWS)
+            try:
+                with conn as c:
+                    if random.random() < _WRITES:
+                        c.execute("UPDATE fruit SET stock = stock + 1 WHERE pk_fruit = ?", [pk])
+                        mine[1] += 1
+                    else:
+                        c.execute("SELECT pk_fruit, name, stock FROM fruit WHERE pk_fruit = ?", [pk])
+                        c.fetchone()
+                        mine[0] += 1
+            except Exception:
+                mine[2] += 1
+
+    threads: list[Thread] = [Thread(target = work, args = (i, )) for i in range(_THREADS)]
+    for t in threads:
+        t.start()
+    sleep(_SECONDS)
+    stop.set()
+    for t in threads:
+        t.join()
+    conn.close()
+    return sum(c[0] for c in counts), sum(c[1] for c in counts), sum(c[2] for c in counts)
+
+
+def main() -> None:
+    with TemporaryDirectory() as directory:
+        for profile in ["default", "server"]:
+            reads, writes, errors = _run(profile, directory)
+            print(f"{profile:8}: {(reads + writes) / _SECONDS:9.1f} transactions/s    {reads} reads    {writes} writes    {errors} errors")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+# Run from the project root with: python -m benchmark.trans_bench
+from typing import Any, override, Self, Sequence
+from timeit import timeit
+from connection.conn import Descriptor, RAW_DATA, SimpleConnection
+from connection.trans import TransactedConnection
+
+
+# A connection that does nothing, so only the overhead of TransactedConnection is measured.
+class _Null(SimpleConnection):
+
+    @override
+    def commit(self) -> None:
+        pass
+
+    @override
+    def rollback(self) -> None:
+        pass
+
+    @override
+    def close(self) -> None:
+        pass
+
+    @override
+    def fetchone(self) -> tuple[RAW_DATA, ...] | None:
+        return None
+
+    @override
+    def fetchall(self) -> Sequence[tuple[RAW_DATA, ...]]:
+        return []
+
+    @override
+    def fetchmany(self, size: int = 0) -> Sequence[tuple[RAW_DATA, ...]]:
+        return []
+
+    @override
+    def callproc(self, sql: str, parameters: Sequence[RAW_DATA] = ()) -> Self:
+        return self
+
+    @override
+    def execute(self, sql: str, parameters: Sequence[RAW_DATA] = ()) -> Self:
+        return self
+
+    @override
+    def executemany(self, sql: str, parameters: Sequence[Sequence[RAW_DATA]] = ()) -> Self:
+        return self
+
+    @override
+    def executescript(self, sql: str) -> Self:
+        return self
+
+    @property
+    @override
+    def rowcount(self) -> int:
+        return 0
+
+    @property
+    @override
+    def description(self) -> Descriptor:
+        return Descriptor([])
+
+    @property
+    @override
+    def lastrowid(self) -> int | None:
+        return None
+
+    @property
+    @override
+    def raw_connection(self) -> object:
+        return self
+
+    @property
+    @override
+    def raw_cursor(self) -> object:
+        return self
+
+    @property
+    @override
+    def placeholder(self) -> str:
+        return "?"
+
+    @property
+    @override
+    def database_type(self) -> str:
+        return "Null"
+
+    @property
+    @override
+    def database_name(self) -> str:
+        return "null"
+
+
+def main() -> None:
+    conn: TransactedConnection = TransactedConnection(_Null, "?", "Null", "null")
+
+    def execute() -> Any:
+        return conn.execute("SELECT 1").fetchone()
+
+    def transaction() -> None:
+        with conn:
+            with conn:
+                conn.execute("SELECT 1")
+
+    n: int = 1_000_000
+    with conn:
+        e: float = timeit(execute, number = n)
+    t: float = timeit(transaction, number = n // 10)
+    print(f"execute + fetchone inside a transaction: {e / n * 1e9:8.1f} ns    nested transaction with one execute: {t / (n // 10) * 1e9:8.1f} ns")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+# Run from the project root with: python -m benchmark.validator_bench
+from typing import Any, Callable
+from timeit import timeit
+from dataclasses import dataclass
+from validator import dataclass_validate, dataclass_type_validator_with_values
+from cofre_de_senhas.dao import DadosUsuario, CampoDeSegredo
+from cofre_de_senhas.service import ChaveSegredo, SegredoComChave, TipoPermissao, TipoSegredo
+
+
+@dataclass(frozen = True)
+class _Plain:
+    pk_usuario: int
+    login: str
+    fk_nivel_acesso: int
+    hash_com_sal: str
+
+
+@dataclass_validate
+@dataclass(frozen = True)
+class _Dicts:
+    campos: dict[str, str]
+    nomes: list[str]
+
+
+def _bench(name: str, make: Callable[[], Any], legacy: Callable[[Any], None], n: int) -> None:
+    sample: Any = make()
+    new: float = timeit(make, number = n)
+    old: float = timeit(lambda: legacy(sample), number = n)
+    print(f"{name:<20} compiled construction: {new / n * 1e6:8.2f} us/obj    legacy validation alone: {old / n * 1e6:8.2f} us/obj")
+
+
+def main() -> None:
+    n: int = 20_000
+    validate: Callable[[Any], None] = lambda x: dataclass_type_validator_with_values(x, {})
+    plain: float = timeit(lambda: _Plain(1, "Harry Potter", 1, "x" * 80), number = n)
+    print(f"{'plain dataclass':<20} construction without any validation: {plain / n * 1e6:8.2f} us/obj")
+    _bench("DadosUsuario", lambda: DadosUsuario(1, "Harry Potter", 1, "x" * 80), validate, n)
+    _bench("CampoDeSegredo", lambda: CampoDeSegredo(1, "Senha", "xpto"), validate, n)
+    campos: dict[str, str] = {f"campo {i}": f"valor {i}" for i in range(20)}
+    _bench("dict/list fields", lambda: _Dicts(campos, list(campos.keys())), validate, n)
+    _bench(
+        "SegredoComChave",
+        lambda: SegredoComChave(
+            ChaveSegredo(1), "Segredo", "Descrição", TipoSegredo.ENCONTRAVEL, campos, ["Aplicação"], {"Harry Potter": TipoPermissao.PROPRIETARIO}
+        ),
+        validate,
+        n
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,8 @@
+# Ponto de entrada para servidores ASGI, por exemplo: uvicorn asgi:app
+# O arquivo de configuração do banco de dados vem da variável de ambiente COFRE_CONFIG (cofre.json se ela não existir).
+from cofre_de_senhas.controller import criar_asgi
+from connection.load import DatabaseConfig
+from webrpc import AsgiAdapter
+import os
+
+app: AsgiAdapter = criar_asgi(DatabaseConfig.from_file(os.environ.get("COFRE_CONFIG", "cofre.json")))
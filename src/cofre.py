@@ -1,10 +1,81 @@
-from cofre_de_senhas.controller import servir
+from typing import Callable
+from argparse import ArgumentParser, Namespace
+from cofre_de_senhas.controller import ler_chave_secreta, servir
 from connection.load import DatabaseConfig
+from validator import set_validation_mode, ValidationMode
+from servidor import ConfiguracaoServidor
+from prefork import ConfiguracaoPrefork, Mestre
 
 PORTA: int = 5000
 
+
+def _argumentos() -> Namespace:
+    p: ArgumentParser = ArgumentParser(description = "Cofre de senhas")
+    p.add_argument("--porta", type = int, default = PORTA, help = "Porta HTTP a ser servida.")
+    p.add_argument("--config", default = "cofre.json", help = "Arquivo de configuração do banco de dados.")
+    p.add_argument(
+        "--validacao",
+        choices = [m.value for m in ValidationMode],
+        default = ValidationMode.FULL.value,
+        help = "Validação das dataclasses em tempo de execução: em tudo (full), somente nos dados recebidos (boundary) ou nunca (off)."
+    )
+    p.add_argument(
+        "--cache-usuarios",
+        type = float,
+        default = 0.0,
+        help = (
+            "Por quantos segundos o usuário logado pode ser reaproveitado entre requisições sem ser buscado de novo no banco de dados (0 desliga). "
+            "Com --processos, cada processo lembra os seus, e um usuário alterado pode continuar valendo por esse tempo nos outros."
+        )
+    )
+    p.add_argument(
+        "--trabalhadores",
+        type = int,
+        default = ConfiguracaoServidor.trabalhadores,
+        help = "Quantas requisições são atendidas ao mesmo tempo (0 cria uma thread nova por conexão, sem limite)."
+    )
+    p.add_argument(
+        "--fila",
+        type = int,
+        default = ConfiguracaoServidor.fila,
+        help = "Quantas conexões podem esperar por um trabalhador livre antes que o servidor passe a responder 503."
+    )
+    p.add_argument(
+        "--keep-alive",
+        type = float,
+        default = ConfiguracaoServidor.keep_alive,
+        help = (
+            "Por quantos segundos uma conexão ociosa é mantida aberta esperando a próxima requisição (0 desliga). "
+            "Se todos os trabalhadores estiverem ocupados quando chegar uma conexão nova, a ociosa mais antiga é fechada antes disso."
+        )
+    )
+    p.add_argument(
+        "--drenagem",
+        type = float,
+        default = ConfiguracaoServidor.drenagem,
+        help = "Por quantos segundos, ao desligar, o servidor espera que as requisições já aceitas terminem."
+    )
+    p.add_argument(
+        "--processos",
+        type = int,
+        default = 0,
+        help = "Quantos processos trabalhadores criar com fork, compartilhando a porta (0 atende tudo neste processo). SIGHUP recarrega os trabalhadores."
+    )
+    return p.parse_args()
+
+
 if __name__ == "__main__":
-    servir(PORTA, DatabaseConfig.from_file("cofre.json"))
+    args: Namespace = _argumentos()
+    set_validation_mode(ValidationMode(args.validacao))
+    servidor: ConfiguracaoServidor = ConfiguracaoServidor(args.trabalhadores, args.fila, args.keep_alive, args.drenagem)
+    if args.processos == 0:
+        servir(args.porta, DatabaseConfig.from_file(args.config), args.cache_usuarios, servidor)
+    else:
+        def trabalhar(config: DatabaseConfig, chave_secreta: str | None, fd: int) -> Callable[[], None]:
+            return servir(args.porta, config, args.cache_usuarios, servidor, chave_secreta, fd)
+
+        carregar: Callable[[], DatabaseConfig] = lambda: DatabaseConfig.from_file(args.config)
+        Mestre(args.porta, carregar, ler_chave_secreta, trabalhar, ConfiguracaoPrefork(args.processos), servidor.drenagem).executar()
 
     # Workaround for bug https://github.com/python/cpython/issues/115533 and https://github.com/python/cpython/issues/113964
     # See https://github.com/python/cpython/issues/115533#issuecomment-1959143451
@@ -8,7 +8,8 @@ from ..erro import (
     ValorIncorretoException, ExclusaoSemCascataException
 )
 from ..dao import CategoriaDAO, CategoriaPK, DadosCategoria, DadosCategoriaSemPK, SegredoPK, NomeCategoriaUK
-from ..service import ChaveCategoria, CategoriaComChave, NomeCategoria, ChaveUsuario, RenomeCategoria, ResultadoListaDeCategorias
+from ..service import ChaveCategoria, CategoriaComChave, NomeCategoria, ChaveUsuario, RenomeCategoria, ResultadoListaDeCategorias, Paginacao
+from ..paginacao import paginar
 from ..usuario.usuario import Usuario, ServicosImpl as ServicosUsuarioImpl
 
 
@@ -197,6 +198,15 @@ class ServicosImpl:
             return u1
         return ResultadoListaDeCategorias([x._up for x in self.__listar_interno()])
 
+    def __listar_pagina(self, quem_faz: ChaveUsuario, pagina: Paginacao) -> ResultadoListaDeCategorias | _LEE | _UBE | _VIE:
+        u1: Usuario | _LEE | _UBE = self.__servicos_usuario.verificar_acesso(quem_faz)
+        if not isinstance(u1, Usuario):
+            return u1
+        r: tuple[list[DadosCategoria], str | None] | _VIE = paginar("categoria", pagina, self.__dao.listar_pagina, lambda d: d.pk_categoria)
+        if isinstance(r, _VIE):
+            return r
+        return ResultadoListaDeCategorias([Categoria._promote(d)._up for d in r[0]], r[1])
+
     def buscar_por_nome(self, quem_faz: ChaveUsuario, dados: NomeCategoria) -> CategoriaComChave | _LEE | _UBE | _CNEE:
         return self.__buscar_por_nome(quem_faz, dados)
 
@@ -214,3 +224,6 @@ class ServicosImpl:
 
     def listar(self, quem_faz: ChaveUsuario) -> ResultadoListaDeCategorias | _LEE | _UBE:
         return self.__listar(quem_faz)
+
+    def listar_pagina(self, quem_faz: ChaveUsuario, pagina: Paginacao) -> ResultadoListaDeCategorias | _LEE | _UBE | _VIE:
+        return self.__listar_pagina(quem_faz, pagina)
@@ -1,7 +1,7 @@
 from typing import override
 from dataclasses import dataclass
 from connection.trans import TransactedConnection
-from ..dao import CategoriaDAO, CategoriaPK, DadosCategoria, DadosCategoriaSemPK, SegredoPK, NomeCategoriaUK
+from ..dao import CategoriaDAO, CategoriaPK, DadosCategoria, DadosCategoriaSemPK, SegredoPK, NomeCategoriaUK, BuscaPagina
 
 
 @dataclass
@@ -33,6 +33,16 @@ class CategoriaDAOImpl(CategoriaDAO):
         sql: str = "SELECT c.pk_categoria, c.nome FROM categoria c ORDER BY pk_categoria"
         return self._connection.execute(sql).fetchall_class(DadosCategoria)
 
+    @override
+    def listar_pagina(self, busca: BuscaPagina) -> list[DadosCategoria]:
+        depois: list[int] = [] if busca.depois is None else [busca.depois]
+        sql: str = " ".join([
+            "SELECT pk_categoria, nome FROM categoria",
+            "" if busca.depois is None else f"WHERE pk_categoria > {self._placeholder}",
+            f"ORDER BY pk_categoria LIMIT {self._placeholder}"
+        ])
+        return self._connection.execute(sql, depois + [busca.limite]).fetchall_class(DadosCategoria)
+
     def __listar_por_nomes_sql(self, quantidade: int) -> str:
         wildcards: str = ", ".join([self._placeholder for i in range(0, quantidade)])
         if self._database_type in ["MySQL", "MariaDB"]:
@@ -1,15 +1,16 @@
 from typing import Any, Callable, override, TypeAlias, TypeVar
 from threading import Thread
-from flask import Flask, render_template, session
-from werkzeug.serving import BaseWSGIServer, make_server
-from httpwrap import empty_json, bodyless, dummy_body, jsoner, move
+from time import time
+from flask import Flask, has_request_context, render_template, Response, session
+from werkzeug.serving import BaseWSGIServer
+from httpwrap import empty_json, bodyless, dummy_body, jsoner, move, Fluxo
 from sucesso import ConteudoIncompreensivelException
-from webrpc import from_body_typed, from_path, from_path_int, WebSuite
+from webrpc import AsgiAdapter, from_body_typed, from_path, from_path_int, from_query_string, from_query_string_multi, parse_int, WebSuite, WsgiDispatcher
 from .service import (
     GerenciadorLogin, UsuarioComChave, ChaveUsuario, NivelAcesso, UsuarioComNivel, DadosNovoNivel,
     UsuarioNovo, DadosNovoUsuario, RenomeUsuario, LoginComSenha, LoginUsuario, TrocaSenha, SenhaAlterada, SenhaUsuario, ResetLoginUsuario,
     NomeCategoria, CategoriaComChave, ChaveCategoria, RenomeCategoria,
-    SegredoComChave, SegredoSemChave, ChaveSegredo,
+    SegredoComChave, SegredoSemChave, ChaveSegredo, PesquisaSegredos, Paginacao,
     ResultadoListaDeUsuarios, ResultadoListaDeCategorias, ResultadoPesquisaDeSegredos
 )
 from .erro import (
@@ -25,10 +26,15 @@ from .service_impl import ServicosImpl
 from .bd.bd_dao_impl import CofreDeSenhasDAOImpl
 from .categoria.categoria_dao_impl import CategoriaDAOImpl
 from .usuario.usuario_dao_impl import UsuarioDAOImpl
+from .usuario.usuario import CacheIdentidade
 from .segredo.segredo_dao_impl import SegredoDAOImpl
 from connection.trans import TransactedConnection
+from connection.pool import PooledTransactedConnection, PoolStatistics
+from connection.routing import RoutingStatistics, RoutingTransactedConnection, WriteTracker
 from connection.load import DatabaseConfig
 from dacite import from_dict
+from validator import reset_validation_count, validation_count
+from servidor import ConfiguracaoServidor, criar_servidor
 
 
 _UNLE: TypeAlias = UsuarioNaoLogadoException
@@ -81,6 +87,24 @@ class _Nao(GerenciadorLogin):
         assert False, "Não deve haver pocesso de login."
 
 
+# Com réplicas, depois de uma escrita, as leituras do mesmo cliente vão para o banco primário por algum tempo, mesmo em outras requisições.
+# A hora da última escrita vai no cookie da sessão, e não fica na memória do processo. Assim, com vários processos (--processos),
+# o cliente lê o que escreveu mesmo que a requisição seguinte caia em outro processo.
+class _EscritasNaSessao(WriteTracker):
+
+    @override
+    def wrote(self) -> None:
+        if has_request_context():
+            session["ultima_escrita"] = time()
+
+    @override
+    def wrote_within(self, seconds: float) -> bool:
+        if not has_request_context():
+            return False
+        ultima: Any = session.get("ultima_escrita")
+        return isinstance(ultima, float) and time() - ultima < seconds
+
+
 def _check(a: Any) -> None:
     if isinstance(a, BaseException):
         raise a
@@ -92,23 +116,54 @@ def _thrower(a: type[_X], b: _X | BaseException) -> _X:
     return b
 
 
-def servir(porta: int, config: DatabaseConfig) -> Callable[[], None]:
+def _pagina(continuacao: str, limite: str) -> Paginacao:
+    return Paginacao(None if continuacao == "" else continuacao, parse_int(limite))
+
+
+# Lê a chave da sessão do banco de dados com uma conexão própria, que é fechada logo depois.
+# Serve para que o processo mestre do modo pré-fork possa lê-la uma vez só e repassá-la aos trabalhadores.
+def ler_chave_secreta(config: DatabaseConfig) -> str | None:
+    cofre: TransactedConnection = config.connect()
+    try:
+        segredo_chave: str | _CBE = ServicosImpl(_Nao(), cofre).chave_secreta
+        return segredo_chave if isinstance(segredo_chave, str) else None
+    finally:
+        if isinstance(cofre, PooledTransactedConnection):
+            cofre.pool.close()
+        if isinstance(cofre, RoutingTransactedConnection):
+            for p in cofre.pools:
+                p.close()
+
+
+def criar_app(config: DatabaseConfig, ttl_usuarios: float = 0.0, chave_secreta: str | None = None) -> Flask:
     app: Flask = Flask(__name__)
     app.secret_key = ""
     ws: WebSuite = WebSuite(app, "/map")
 
+    @app.before_request
+    def zerar_validacoes() -> None:
+        reset_validation_count()
+
+    @app.after_request
+    def contar_validacoes(response: Response) -> Response:
+        response.headers["X-Validation-Count"] = str(validation_count())
+        return response
+
     gl: GerenciadorLogin = GerenciadorLoginImpl()
     nao: GerenciadorLogin = _Nao()
     cofre: TransactedConnection = config.connect()
+    if isinstance(cofre, RoutingTransactedConnection):
+        cofre.write_tracker = _EscritasNaSessao()
 
     CategoriaDAOImpl(cofre)
     CofreDeSenhasDAOImpl(cofre)
     SegredoDAOImpl(cofre)
     UsuarioDAOImpl(cofre)
-    sx: ServicosImpl = ServicosImpl(gl, cofre)
-    sn: ServicosImpl = ServicosImpl(nao, cofre)
+    cache: CacheIdentidade = CacheIdentidade(cofre, ttl_usuarios)
+    sx: ServicosImpl = ServicosImpl(gl, cofre, cache)
+    sn: ServicosImpl = ServicosImpl(nao, cofre, cache)
 
-    segredo_chave: str | _CBE = sn.chave_secreta
+    segredo_chave: str | _CBE = sn.chave_secreta if chave_secreta is None else chave_secreta
     if isinstance(segredo_chave, str):
         app.secret_key = segredo_chave
 
@@ -125,11 +180,11 @@ def servir(porta: int, config: DatabaseConfig) -> Callable[[], None]:
         bodyless()
         sx.usuario.logout()
 
-    @ws.route("GET", "/usuarios")
+    @ws.route("GET", "/usuarios", from_query_string("continuacao", ""), from_query_string("limite", "100"))
     @jsoner
-    def listar_usuarios() -> ResultadoListaDeUsuarios:
+    def listar_usuarios(continuacao: str, limite: str) -> ResultadoListaDeUsuarios:
         bodyless()
-        return _thrower(ResultadoListaDeUsuarios, sx.usuario.listar())
+        return _thrower(ResultadoListaDeUsuarios, sx.usuario.listar_pagina(_pagina(continuacao, limite)))
 
     @ws.route("GET", "/usuarios/chave/<pk_usuario>", from_path_int("pk_usuario"))
     @jsoner
@@ -276,11 +331,11 @@ def servir(porta: int, config: DatabaseConfig) -> Callable[[], None]:
     def renomear_categoria_branco() -> None:
         return __renomear_categoria("")
 
-    @ws.route("GET", "/categorias")
+    @ws.route("GET", "/categorias", from_query_string("continuacao", ""), from_query_string("limite", "100"))
     @jsoner
-    def listar_categorias() -> ResultadoListaDeCategorias:
+    def listar_categorias(continuacao: str, limite: str) -> ResultadoListaDeCategorias:
         bodyless()
-        return _thrower(ResultadoListaDeCategorias, sx.categoria.listar())
+        return _thrower(ResultadoListaDeCategorias, sx.categoria.listar_pagina(_pagina(continuacao, limite)))
 
     def __excluir_categoria(nome: str) -> None:
         bodyless()
@@ -322,22 +377,60 @@ def servir(porta: int, config: DatabaseConfig) -> Callable[[], None]:
         bodyless()
         return _thrower(SegredoComChave, sx.segredo.buscar_por_chave(ChaveSegredo(pk_segredo)))
 
-    @ws.route("GET", "/segredos")
+    # Sem paginação, todos os segredos são enviados aos poucos, na medida em que são lidos do banco de dados.
+    @ws.route("GET", "/segredos", from_query_string("continuacao", ""), from_query_string("limite", ""))
     @jsoner
-    def listar_segredos() -> ResultadoPesquisaDeSegredos:
+    def listar_segredos(continuacao: str, limite: str) -> ResultadoPesquisaDeSegredos | Fluxo:
         bodyless()
-        return _thrower(ResultadoPesquisaDeSegredos, sx.segredo.listar())
-
-    # @ws.route("GET", "/segredos/...")
-    # @jsoner
-    # def pesquisar_segredos() -> ResultadoPesquisaDeSegredos:
-    #     return _thrower(ResultadoPesquisaDeSegredos, sx.segredo.pesquisar(PesquisaSegredos(...)))
+        if continuacao == "" and limite == "":
+            return Fluxo("segredos", sx.segredo.listar_fluxo())
+        return _thrower(ResultadoPesquisaDeSegredos, sx.segredo.listar_pagina(_pagina(continuacao, limite or "100")))
+
+    @ws.route(
+        "GET",
+        "/segredos/pesquisa",
+        from_query_string("nome", ""),
+        from_query_string_multi("categoria"),
+        from_query_string("continuacao", ""),
+        from_query_string("limite", "100")
+    )
+    @jsoner
+    def pesquisar_segredos(nome: str, categoria: list[str], continuacao: str, limite: str) -> ResultadoPesquisaDeSegredos:
+        bodyless()
+        pagina: Paginacao = _pagina(continuacao, limite)
+        pesquisa: PesquisaSegredos = PesquisaSegredos(nome, categoria, pagina.continuacao, pagina.limite)
+        return _thrower(ResultadoPesquisaDeSegredos, sx.segredo.pesquisar(pesquisa))
 
     @ws.route("GET", "/healthcheck")
     @empty_json
     def health_check() -> None:
         bodyless()
 
+    # As estatísticas das conexões só são mostradas a administradores.
+    def exigir_admin() -> None:
+        chave: ChaveUsuario = _thrower(ChaveUsuario, gl.usuario_logado)
+        eu: UsuarioComChave = _thrower(UsuarioComChave, sx.usuario.buscar_por_chave(chave))
+        if eu.nivel_acesso != NivelAcesso.CHAVEIRO_DEUS_SUPREMO:
+            raise PermissaoNegadaException()
+
+    @ws.hidden_route("GET", "/healthcheck/pool")
+    @jsoner
+    def health_check_pool() -> PoolStatistics | None:
+        bodyless()
+        exigir_admin()
+        if isinstance(cofre, PooledTransactedConnection):
+            return cofre.statistics
+        return None
+
+    @ws.hidden_route("GET", "/healthcheck/routing")
+    @jsoner
+    def health_check_routing() -> RoutingStatistics | None:
+        bodyless()
+        exigir_admin()
+        if isinstance(cofre, RoutingTransactedConnection):
+            return cofre.statistics
+        return None
+
     # admin
 
     @ws.route("PUT", "/admin/nome/<nome>", from_path("nome"), from_body_typed("dados", SenhaUsuario))
@@ -362,9 +455,23 @@ def servir(porta: int, config: DatabaseConfig) -> Callable[[], None]:
         bodyless()
         return render_template("index.html")
 
+    app.wsgi_app = WsgiDispatcher(ws)  # type: ignore[method-assign]
+    return app
+
+
+def servir(
+        porta: int,
+        config: DatabaseConfig,
+        ttl_usuarios: float = 0.0,
+        servidor: ConfiguracaoServidor = ConfiguracaoServidor(),
+        chave_secreta: str | None = None,
+        fd: int | None = None
+) -> Callable[[], None]:
+    app: Flask = criar_app(config, ttl_usuarios, chave_secreta)
+
     # E aqui, a mágica acontece...
 
-    server: BaseWSGIServer = make_server("0.0.0.0", porta, app, True)
+    server: BaseWSGIServer = criar_servidor("0.0.0.0", porta, app, servidor, fd)
     app.app_context().push()
 
     def trabalho() -> None:
@@ -377,3 +484,8 @@ def servir(porta: int, config: DatabaseConfig) -> Callable[[], None]:
     t.start()
 
     return stop
+
+
+# A mesma aplicação, para ser servida por um servidor ASGI. As requisições são executadas em até max_threads threads.
+def criar_asgi(config: DatabaseConfig, ttl_usuarios: float = 0.0, chave_secreta: str | None = None, max_threads: int = 16) -> AsgiAdapter:
+    return AsgiAdapter(criar_app(config, ttl_usuarios, chave_secreta), max_threads)
@@ -1,3 +1,4 @@
+from typing import Iterator
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from validator import dataclass_validate
@@ -133,6 +134,32 @@ class BuscaPermissaoPorLogin:
     login: str
 
 
+@dataclass_validate
+@dataclass(frozen = True)
+class BuscaPagina:
+    depois: int | None  # None para começar do início.
+    limite: int
+
+
+@dataclass_validate
+@dataclass(frozen = True)
+class BuscaSegredos:
+    pk_usuario: int | None  # None para quem pode ver todos os segredos.
+    nome: str
+    categorias: list[str]
+    depois: int | None
+    limite: int
+
+
+@dataclass_validate
+@dataclass(frozen = True)
+class AgregadoSegredo:
+    cabecalho: DadosSegredo
+    campos: list[CampoDeSegredo]
+    permissoes: list[DadosUsuarioComPermissao]
+    categorias: list[DadosCategoria]
+
+
 class DAO(ABC):
 
     def __init__(self, con: TransactedConnection) -> None:
@@ -209,28 +236,74 @@ class SegredoDAO(DAO):
     def limpar_segredo(self, pk: SegredoPK) -> None:
         pass
 
+    @abstractmethod
+    def buscar_agregados(self, pks: list[SegredoPK]) -> list[AgregadoSegredo]:
+        pass
+
+    @abstractmethod
+    def pesquisar(self, busca: BuscaSegredos) -> list[DadosSegredo]:
+        pass
+
+    # Os segredos são lidos do banco de dados em lotes, conforme o iterador é consumido. Nenhuma outra consulta pode ser feita na
+    # mesma transação enquanto isso.
+    @abstractmethod
+    def listar_fluxo(self, pk_usuario: int | None, lote: int) -> Iterator[DadosSegredo]:
+        pass
+
     # Categoria de segredo
 
     @abstractmethod
     def criar_categoria_segredo(self, c: CategoriaDeSegredo) -> bool:
         pass
 
+    @abstractmethod
+    def criar_categorias_segredo(self, cs: list[CategoriaDeSegredo]) -> None:
+        pass
+
+    @abstractmethod
+    def deletar_categorias_segredo(self, cs: list[CategoriaDeSegredo]) -> None:
+        pass
+
     # Campos
 
     @abstractmethod
     def criar_campo_segredo(self, campo: CampoDeSegredo) -> bool:
         pass
 
+    @abstractmethod
+    def criar_campos_segredo(self, campos: list[CampoDeSegredo]) -> None:
+        pass
+
     @abstractmethod
     def ler_campos_segredo(self, pk: SegredoPK) -> list[CampoDeSegredo]:
         pass
 
+    @abstractmethod
+    def alterar_campos_segredo(self, campos: list[CampoDeSegredo]) -> None:
+        pass
+
+    @abstractmethod
+    def deletar_campos_segredo(self, campos: list[CampoDeSegredo]) -> None:
+        pass
+
     # Permissões
 
     @abstractmethod
     def criar_permissao(self, permissao: PermissaoDeSegredo) -> bool:
         pass
 
+    @abstractmethod
+    def criar_permissoes(self, permissoes: list[PermissaoDeSegredo]) -> None:
+        pass
+
+    @abstractmethod
+    def alterar_permissoes(self, permissoes: list[PermissaoDeSegredo]) -> None:
+        pass
+
+    @abstractmethod
+    def deletar_permissoes(self, permissoes: list[PermissaoDeSegredo]) -> None:
+        pass
+
     @abstractmethod
     def buscar_permissao(self, busca: BuscaPermissaoPorLogin) -> PermissaoDeSegredo | None:
         pass
@@ -252,6 +325,10 @@ class CategoriaDAO(DAO):
     def listar(self) -> list[DadosCategoria]:
         pass
 
+    @abstractmethod
+    def listar_pagina(self, busca: BuscaPagina) -> list[DadosCategoria]:
+        pass
+
     @abstractmethod
     def listar_por_nomes(self, nomes: list[NomeCategoriaUK]) -> list[DadosCategoria]:
         pass
@@ -305,6 +382,10 @@ class UsuarioDAO(DAO):
     def listar(self) -> list[DadosUsuario]:
         pass
 
+    @abstractmethod
+    def listar_pagina(self, busca: BuscaPagina) -> list[DadosUsuario]:
+        pass
+
     @abstractmethod
     def listar_por_logins(self, logins: list[LoginUsuarioUK]) -> list[DadosUsuario]:
         pass
@@ -317,6 +398,11 @@ class UsuarioDAO(DAO):
     def salvar_com_pk(self, dados: DadosUsuario) -> bool:
         pass
 
+    # Troca o hash da senha somente se ele ainda for o antigo.
+    @abstractmethod
+    def substituir_hash(self, pk_usuario: UsuarioPK, antigo: str, novo: str) -> bool:
+        pass
+
     @abstractmethod
     def deletar_por_pk(self, pk_usuario: UsuarioPK) -> bool:
         pass
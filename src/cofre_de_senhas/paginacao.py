@@ -0,0 +1,45 @@
+from typing import Callable, TypeAlias, TypeVar
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from .dao import BuscaPagina
+from .erro import ValorIncorretoException
+from .service import Paginacao
+
+
+_VIE: TypeAlias = ValorIncorretoException
+_T = TypeVar("_T")
+
+LIMITE_PAGINA: int = 500
+
+
+def limitar(limite: int) -> int:
+    return max(1, min(limite, LIMITE_PAGINA))
+
+
+# A continuação é opaca para o cliente. Ela guarda o nome do recurso listado para não ser reaproveitada em outra listagem.
+def criar_continuacao(recurso: str, pk: int) -> str:
+    return urlsafe_b64encode(f"{recurso}:{pk}".encode("utf-8")).decode("ascii")
+
+
+def ler_continuacao(recurso: str, continuacao: str) -> int | _VIE:
+    try:
+        partes: list[str] = urlsafe_b64decode(continuacao.encode("ascii")).decode("utf-8").split(":")
+        if len(partes) != 2 or partes[0] != recurso:
+            return ValorIncorretoException()
+        return int(partes[1])
+    except ValueError:  # Inclui UnicodeError e binascii.Error.
+        return ValorIncorretoException()
+
+
+# Busca uma linha a mais do que o limite para saber se ainda há algo depois da página.
+def paginar(recurso: str, pagina: Paginacao, buscar: Callable[[BuscaPagina], list[_T]], pk: Callable[[_T], int]) -> tuple[list[_T], str | None] | _VIE:
+    depois: int | None = None
+    if pagina.continuacao is not None:
+        lido: int | _VIE = ler_continuacao(recurso, pagina.continuacao)
+        if isinstance(lido, _VIE):
+            return lido
+        depois = lido
+    limite: int = limitar(pagina.limite)
+    encontrados: list[_T] = buscar(BuscaPagina(depois, limite + 1))
+    if len(encontrados) <= limite:
+        return (encontrados, None)
+    return (encontrados[:limite], criar_continuacao(recurso, pk(encontrados[limite - 1])))
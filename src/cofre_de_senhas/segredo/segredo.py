@@ -1,9 +1,9 @@
-from typing import TypeAlias
+from typing import Iterator, TypeAlias
 from validator import dataclass_validate
 from dataclasses import dataclass, replace
 from ..dao import (
-    SegredoDAO, SegredoPK, DadosSegredo, DadosSegredoSemPK,
-    LoginUsuarioUK, BuscaPermissaoPorLogin,
+    SegredoDAO, SegredoPK, DadosSegredo, DadosSegredoSemPK, AgregadoSegredo, BuscaSegredos, BuscaPagina,
+    LoginUsuarioUK,
     CategoriaDeSegredo, CampoDeSegredo, PermissaoDeSegredo
 )
 from ..erro import (
@@ -16,8 +16,9 @@ from ..erro import (
 from ..service import (
     TipoPermissao, TipoSegredo, ChaveUsuario,
     SegredoComChave, SegredoSemChave, CabecalhoSegredoComChave, ChaveSegredo,
-    PesquisaSegredos, ResultadoPesquisaDeSegredos
+    PesquisaSegredos, ResultadoPesquisaDeSegredos, Paginacao
 )
+from ..paginacao import paginar
 from ..usuario.usuario import Usuario, Permissao, ServicosImpl as ServicosUsuarioImpl
 from ..categoria.categoria import Categoria, ServicosImpl as ServicosCategoriaImpl
 
@@ -30,6 +31,8 @@ _CNEE: TypeAlias = CategoriaNaoExisteException
 _LEE: TypeAlias = LoginExpiradoException
 _VIE: TypeAlias = ValorIncorretoException
 
+_LOTE_FLUXO: int = 100
+
 
 @dataclass_validate
 @dataclass(frozen = True)
@@ -70,6 +73,14 @@ class Segredo:
                 return SegredoNaoExisteException()
             return PermissaoNegadaException()
 
+    @staticmethod
+    def _promote(agregado: AgregadoSegredo) -> "Segredo":
+        cabecalho: Segredo.Cabecalho = Segredo.Cabecalho._promote(agregado.cabecalho)
+        usuarios: dict[str, Permissao] = Permissao._mapear_todos(agregado.permissoes)
+        categorias: dict[str, Categoria] = Categoria._mapear_todos(agregado.categorias)
+        campos: dict[str, str] = {c.pk_nome: c.valor for c in agregado.campos}
+        return Segredo(cabecalho, usuarios, categorias, campos)
+
     @property
     def _pk(self) -> SegredoPK:
         return self.cabecalho.pk
@@ -95,39 +106,56 @@ class ServicosImpl:
         self.__servicos_usuario: ServicosUsuarioImpl = servicos_usuario
         self.__servicos_categoria: ServicosCategoriaImpl = servicos_categoria
 
-    def __salvar(self, s: Segredo) -> Segredo:
-        self.__dao.salvar_com_pk(s._down)
-        return self.__salvar_dados_internos(s)
-
-    def __salvar_dados_internos(self, s: Segredo) -> Segredo:
-        spk: SegredoPK = s._pk
-
-        def __limpar() -> None:
-            self.__dao.limpar_segredo(spk)
-
-        def __criar_campos() -> None:
-            for descricao in s.campos.keys():
-                valor: str = s.campos[descricao]
-                self.__dao.criar_campo_segredo(CampoDeSegredo(spk.pk_segredo, descricao, valor))
-
-        def __criar_permissoes() -> None:
-            for permissao in s.usuarios.values():
-                self.__dao.criar_permissao(PermissaoDeSegredo(permissao.usuario.pk.pk_usuario, spk.pk_segredo, permissao.tipo.value))
-
-        def __criar_categorias() -> None:
-            for categoria in s.categorias.values():
-                self.__dao.criar_categoria_segredo(CategoriaDeSegredo(spk.pk_segredo, categoria.pk.pk_categoria))
-
-        assert s.usuarios is not None, "Deveriam haver usuários no segredo."
-        assert s.categorias is not None, "Deveriam haver categorias no segredo."
-        assert s.campos is not None, "Deveriam haver campos no segredo."
-
-        __limpar()
-        __criar_campos()
-        __criar_permissoes()
-        __criar_categorias()
-
-        return s
+    def __salvar(self, antes: Segredo, depois: Segredo) -> Segredo:
+        if antes.cabecalho != depois.cabecalho:
+            self.__dao.salvar_com_pk(depois._down)
+        return self.__salvar_dados_internos(antes, depois)
+
+    # Grava somente as diferenças entre o estado anterior (antes) e o novo estado (depois) do segredo.
+    def __salvar_dados_internos(self, antes: Segredo, depois: Segredo) -> Segredo:
+        spk: SegredoPK = depois._pk
+
+        def __salvar_campos() -> None:
+            a: dict[str, str] = antes.campos
+            d: dict[str, str] = depois.campos
+            excluidos: list[CampoDeSegredo] = [CampoDeSegredo(spk.pk_segredo, k, a[k]) for k in a.keys() if k not in d]
+            alterados: list[CampoDeSegredo] = [CampoDeSegredo(spk.pk_segredo, k, d[k]) for k in d.keys() if k in a and a[k] != d[k]]
+            criados: list[CampoDeSegredo] = [CampoDeSegredo(spk.pk_segredo, k, d[k]) for k in d.keys() if k not in a]
+            self.__dao.deletar_campos_segredo(excluidos)
+            self.__dao.alterar_campos_segredo(alterados)
+            self.__dao.criar_campos_segredo(criados)
+
+        def __salvar_permissoes() -> None:
+            a: dict[str, Permissao] = antes.usuarios
+            d: dict[str, Permissao] = depois.usuarios
+            excluidas: list[PermissaoDeSegredo] = [self.__permissao(spk, a[k]) for k in a.keys() if k not in d]
+            alteradas: list[PermissaoDeSegredo] = [self.__permissao(spk, d[k]) for k in d.keys() if k in a and a[k] != d[k]]
+            criadas: list[PermissaoDeSegredo] = [self.__permissao(spk, d[k]) for k in d.keys() if k not in a]
+            self.__dao.deletar_permissoes(excluidas)
+            self.__dao.alterar_permissoes(alteradas)
+            self.__dao.criar_permissoes(criadas)
+
+        def __salvar_categorias() -> None:
+            a: dict[str, Categoria] = antes.categorias
+            d: dict[str, Categoria] = depois.categorias
+            excluidas: list[CategoriaDeSegredo] = [CategoriaDeSegredo(spk.pk_segredo, a[k].pk.pk_categoria) for k in a.keys() if k not in d]
+            criadas: list[CategoriaDeSegredo] = [CategoriaDeSegredo(spk.pk_segredo, d[k].pk.pk_categoria) for k in d.keys() if k not in a]
+            self.__dao.deletar_categorias_segredo(excluidas)
+            self.__dao.criar_categorias_segredo(criadas)
+
+        assert depois.usuarios is not None, "Deveriam haver usuários no segredo."
+        assert depois.categorias is not None, "Deveriam haver categorias no segredo."
+        assert depois.campos is not None, "Deveriam haver campos no segredo."
+
+        __salvar_campos()
+        __salvar_permissoes()
+        __salvar_categorias()
+
+        return depois
+
+    @staticmethod
+    def __permissao(spk: SegredoPK, permissao: Permissao) -> PermissaoDeSegredo:
+        return PermissaoDeSegredo(permissao.usuario.pk.pk_usuario, spk.pk_segredo, permissao.tipo.value)
 
     def __mapear_interno(self, dados: SegredoSemChave) -> tuple[dict[str, Permissao], dict[str, Categoria]] | _UNEE | _CNEE:
         cts: set[str] = set(dados.categorias)
@@ -181,19 +209,19 @@ class ServicosImpl:
         categorias: dict[str, Categoria] = pc[1]
 
         c: Segredo.Cabecalho = replace(s1.cabecalho, nome = dados.nome, descricao = dados.descricao, tipo_segredo = dados.tipo)
-        self.__salvar(replace(s1, cabecalho = c, campos = dados.campos, categorias = categorias, usuarios = permissoes))
+        self.__salvar(s1, replace(s1, cabecalho = c, campos = dados.campos, categorias = categorias, usuarios = permissoes))
         return None
 
     def __permitir_escrita_para(self, s: Segredo, acesso: Usuario, somente_proprietario: bool) -> None | _PNE | _SNEE:
         if acesso.is_admin:
             return None
 
-        busca: BuscaPermissaoPorLogin = BuscaPermissaoPorLogin(s._pk.pk_segredo, acesso.login)
-        permissao_encontrada: PermissaoDeSegredo | None = self.__dao.buscar_permissao(busca)
+        # As permissões já foram carregadas junto com o segredo, não é necessário ir ao banco de dados novamente.
+        permissao_encontrada: Permissao | None = s.usuarios.get(acesso.login)
         if permissao_encontrada is None:
             return s.cabecalho._erro_sem_permissao
 
-        permissao: TipoPermissao = TipoPermissao(permissao_encontrada.fk_tipo_permissao)
+        permissao: TipoPermissao = permissao_encontrada.tipo
 
         aceitaveis: list[TipoPermissao] = [TipoPermissao.PROPRIETARIO]
         if not somente_proprietario:
@@ -218,15 +246,10 @@ class ServicosImpl:
         return permissoes
 
     def __encontrar_por_chave(self, chave: ChaveSegredo) -> Segredo | None:
-        dados: DadosSegredo | None = self.__dao.buscar_por_pk(SegredoPK(chave.valor))
-        if dados is None:
+        agregados: list[AgregadoSegredo] = self.__dao.buscar_agregados([SegredoPK(chave.valor)])
+        if len(agregados) == 0:
             return None
-        cabecalho: Segredo.Cabecalho = Segredo.Cabecalho._promote(dados)
-        spk: SegredoPK = cabecalho.pk
-        campos: dict[str, str] = {c.pk_nome: c.valor for c in self.__dao.ler_campos_segredo(spk)}
-        usuarios: dict[str, Permissao] = self.__servicos_usuario.listar_por_permissao(cabecalho)
-        categorias: dict[str, Categoria] = self.__servicos_categoria.listar_por_segredo(spk)
-        return Segredo(cabecalho, usuarios, categorias, campos)
+        return Segredo._promote(agregados[0])
 
     def __encontrar_existente_por_chave(self, chave: ChaveSegredo) -> Segredo | _SNEE:
         encontrado: Segredo | None = self.__encontrar_por_chave(chave)
@@ -258,7 +281,8 @@ class ServicosImpl:
 
         rowid: SegredoPK = self.__dao.criar(DadosSegredoSemPK(dados.nome, dados.descricao, dados.tipo.value))
         cabecalho: Segredo.Cabecalho = Segredo.Cabecalho(rowid.pk_segredo, dados.nome, dados.descricao, dados.tipo)
-        return self.__salvar_dados_internos(Segredo(cabecalho, permissoes, categorias, dados.campos))._up_eager
+        vazio: Segredo = Segredo(cabecalho, {}, {}, {})
+        return self.__salvar_dados_internos(vazio, Segredo(cabecalho, permissoes, categorias, dados.campos))._up_eager
 
     def __listar_todos(self) -> list[Segredo.Cabecalho]:
         return [Segredo.Cabecalho._promote(s) for s in self.__dao.listar()]
@@ -272,6 +296,27 @@ class ServicosImpl:
             return u1
         return ResultadoPesquisaDeSegredos([x._up for x in self.__listar_interno(u1)])
 
+    def __listar_pagina(self, quem_faz: ChaveUsuario, pagina: Paginacao) -> ResultadoPesquisaDeSegredos | _LEE | _UBE | _VIE:
+        u1: Usuario | _LEE | _UBE = self.__servicos_usuario.verificar_acesso(quem_faz)
+        if not isinstance(u1, Usuario):
+            return u1
+        pk_usuario: int | None = None if u1.is_admin else u1.pk_usuario
+
+        def buscar(b: BuscaPagina) -> list[DadosSegredo]:
+            return self.__dao.pesquisar(BuscaSegredos(pk_usuario, "", [], b.depois, b.limite))
+
+        r: tuple[list[DadosSegredo], str | None] | _VIE = paginar("segredo", pagina, buscar, lambda d: d.pk_segredo)
+        if isinstance(r, _VIE):
+            return r
+        return ResultadoPesquisaDeSegredos([Segredo.Cabecalho._promote(d)._up for d in r[0]], r[1])
+
+    def __listar_fluxo(self, quem_faz: ChaveUsuario) -> Iterator[CabecalhoSegredoComChave]:
+        u1: Usuario | _LEE | _UBE = self.__servicos_usuario.verificar_acesso(quem_faz)
+        if not isinstance(u1, Usuario):
+            raise u1
+        for s in self.__dao.listar_fluxo(None if u1.is_admin else u1.pk_usuario, _LOTE_FLUXO):
+            yield Segredo.Cabecalho._promote(s)._up
+
     def __listar_interno(self, quem_faz: Usuario) -> list[Segredo.Cabecalho]:
         if quem_faz.is_admin:
             return self.__listar_todos()
@@ -315,11 +360,19 @@ class ServicosImpl:
         self.__dao.deletar_por_pk(s1.cabecalho.pk)
         return None
 
-    def __pesquisar(self, quem_faz: ChaveUsuario, dados: PesquisaSegredos) -> ResultadoPesquisaDeSegredos | _LEE | _UBE:
+    def __pesquisar(self, quem_faz: ChaveUsuario, dados: PesquisaSegredos) -> ResultadoPesquisaDeSegredos | _LEE | _UBE | _VIE:
         u1: Usuario | _LEE | _UBE = self.__servicos_usuario.verificar_acesso(quem_faz)
         if not isinstance(u1, Usuario):
             return u1
-        raise NotImplementedError()
+        pk_usuario: int | None = None if u1.is_admin else u1.pk_usuario
+
+        def buscar(b: BuscaPagina) -> list[DadosSegredo]:
+            return self.__dao.pesquisar(BuscaSegredos(pk_usuario, dados.nome, dados.categorias, b.depois, b.limite))
+
+        r: tuple[list[DadosSegredo], str | None] | _VIE = paginar("pesquisa", Paginacao(dados.continuacao, dados.limite), buscar, lambda d: d.pk_segredo)
+        if isinstance(r, _VIE):
+            return r
+        return ResultadoPesquisaDeSegredos([Segredo.Cabecalho._promote(d)._up for d in r[0]], r[1])
 
     def criar(self, quem_faz: ChaveUsuario, dados: SegredoSemChave) -> SegredoComChave | _UNEE | _CNEE | _UBE | _LEE | _VIE:
         return self.__criar(quem_faz, dados)
@@ -333,11 +386,17 @@ class ServicosImpl:
     def listar(self, quem_faz: ChaveUsuario) -> ResultadoPesquisaDeSegredos | _LEE | _UBE:
         return self.__listar(quem_faz)
 
+    def listar_pagina(self, quem_faz: ChaveUsuario, pagina: Paginacao) -> ResultadoPesquisaDeSegredos | _LEE | _UBE | _VIE:
+        return self.__listar_pagina(quem_faz, pagina)
+
+    def listar_fluxo(self, quem_faz: ChaveUsuario) -> Iterator[CabecalhoSegredoComChave]:
+        return self.__listar_fluxo(quem_faz)
+
     def buscar(self, quem_faz: ChaveUsuario, chave: ChaveSegredo) -> SegredoComChave | _LEE | _UBE | _SNEE:
         return self.__buscar(quem_faz, chave)
 
     def buscar_por_chave_sem_logar(self, chave: ChaveSegredo) -> SegredoComChave | _SNEE:
         return self.__buscar_por_chave_sem_logar(chave)
 
-    def pesquisar(self, quem_faz: ChaveUsuario, dados: PesquisaSegredos) -> ResultadoPesquisaDeSegredos | _LEE | _UBE:
+    def pesquisar(self, quem_faz: ChaveUsuario, dados: PesquisaSegredos) -> ResultadoPesquisaDeSegredos | _LEE | _UBE | _VIE:
         return self.__pesquisar(quem_faz, dados)
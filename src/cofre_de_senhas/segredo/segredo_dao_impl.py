@@ -1,11 +1,53 @@
-from typing import override
+from typing import Iterator, override
+from dataclasses import dataclass
+from validator import dataclass_validate
 from connection.trans import TransactedConnection
 from ..dao import (
     SegredoDAO, SegredoPK, DadosSegredo, DadosSegredoSemPK, CampoDeSegredo,
-    LoginUsuarioUK, CategoriaDeSegredo, PermissaoDeSegredo, BuscaPermissaoPorLogin
+    LoginUsuarioUK, CategoriaDeSegredo, PermissaoDeSegredo, BuscaPermissaoPorLogin,
+    AgregadoSegredo, DadosUsuarioComPermissao, DadosCategoria, BuscaSegredos
 )
 
 
+# Cada linha da consulta de agregados é de um dos tipos abaixo, e o significado das colunas n1, n2, n3, t1 e t2 depende do tipo.
+_CABECALHO: int = 0  # n1 = fk_tipo_segredo, t1 = nome, t2 = descricao
+_CAMPO: int = 1  # t1 = pk_nome, t2 = valor
+_PERMISSAO: int = 2  # n1 = pk_usuario, n2 = fk_nivel_acesso, n3 = fk_tipo_permissao, t1 = login, t2 = hash_com_sal
+_CATEGORIA: int = 3  # n1 = pk_categoria, t1 = nome
+
+
+@dataclass_validate
+@dataclass(frozen = True)
+class _LinhaAgregado:
+    tipo: int
+    pk_segredo: int
+    n1: int | None
+    n2: int | None
+    n3: int | None
+    t1: str | None
+    t2: str | None
+
+    @property
+    def cabecalho(self) -> DadosSegredo:
+        assert self.n1 is not None and self.t1 is not None and self.t2 is not None
+        return DadosSegredo(self.pk_segredo, self.t1, self.t2, self.n1)
+
+    @property
+    def campo(self) -> CampoDeSegredo:
+        assert self.t1 is not None and self.t2 is not None
+        return CampoDeSegredo(self.pk_segredo, self.t1, self.t2)
+
+    @property
+    def permissao(self) -> DadosUsuarioComPermissao:
+        assert self.n1 is not None and self.n2 is not None and self.n3 is not None and self.t1 is not None and self.t2 is not None
+        return DadosUsuarioComPermissao(self.n1, self.t1, self.n2, self.t2, self.n3)
+
+    @property
+    def categoria(self) -> DadosCategoria:
+        assert self.n1 is not None and self.t1 is not None
+        return DadosCategoria(self.n1, self.t1)
+
+
 class SegredoDAOImpl(SegredoDAO):
 
     def __init__(self, con: TransactedConnection) -> None:
@@ -75,6 +117,111 @@ class SegredoDAOImpl(SegredoDAO):
         sql3: str = f"DELETE FROM categoria_segredo WHERE pfk_segredo = {self._placeholder}"
         self._connection.execute(sql1, [pk.pk_segredo]).execute(sql2, [pk.pk_segredo]).execute(sql3, [pk.pk_segredo])
 
+    @override
+    def buscar_agregados(self, pks: list[SegredoPK]) -> list[AgregadoSegredo]:
+        if len(pks) == 0:
+            return []
+        wildcards: str = ", ".join([self._placeholder for pk in pks])
+        sql: str = " ".join([
+            f"SELECT {_CABECALHO} AS tipo, s.pk_segredo, s.fk_tipo_segredo AS n1, NULL AS n2, NULL AS n3, s.nome AS t1, s.descricao AS t2",
+            "FROM segredo s",
+            f"WHERE s.pk_segredo IN ({wildcards})",
+            "UNION ALL",
+            f"SELECT {_CAMPO}, c.pfk_segredo, NULL, NULL, NULL, c.pk_nome, c.valor",
+            "FROM campo_segredo c",
+            f"WHERE c.pfk_segredo IN ({wildcards})",
+            "UNION ALL",
+            f"SELECT {_PERMISSAO}, p.pfk_segredo, u.pk_usuario, u.fk_nivel_acesso, p.fk_tipo_permissao, u.login, u.hash_com_sal",
+            "FROM permissao p",
+            "INNER JOIN usuario u ON u.pk_usuario = p.pfk_usuario",
+            f"WHERE p.pfk_segredo IN ({wildcards})",
+            "UNION ALL",
+            f"SELECT {_CATEGORIA}, cs.pfk_segredo, c.pk_categoria, NULL, NULL, c.nome, NULL",
+            "FROM categoria_segredo cs",
+            "INNER JOIN categoria c ON c.pk_categoria = cs.pfk_categoria",
+            f"WHERE cs.pfk_segredo IN ({wildcards})",
+            "ORDER BY pk_segredo, tipo, n1, t1"
+        ])
+        valores: list[int] = [pk.pk_segredo for pk in pks]
+        linhas: list[_LinhaAgregado] = self._connection.execute(sql, valores * 4).fetchall_class(_LinhaAgregado)
+
+        cabecalhos: dict[int, DadosSegredo] = {}
+        campos: dict[int, list[CampoDeSegredo]] = {}
+        permissoes: dict[int, list[DadosUsuarioComPermissao]] = {}
+        categorias: dict[int, list[DadosCategoria]] = {}
+
+        for linha in linhas:
+            pk: int = linha.pk_segredo
+            if linha.tipo == _CABECALHO:
+                cabecalhos[pk] = linha.cabecalho
+            elif linha.tipo == _CAMPO:
+                campos.setdefault(pk, []).append(linha.campo)
+            elif linha.tipo == _PERMISSAO:
+                permissoes.setdefault(pk, []).append(linha.permissao)
+            else:
+                categorias.setdefault(pk, []).append(linha.categoria)
+
+        return [AgregadoSegredo(c, campos.get(pk, []), permissoes.get(pk, []), categorias.get(pk, [])) for pk, c in cabecalhos.items()]
+
+    @override
+    def pesquisar(self, busca: BuscaSegredos) -> list[DadosSegredo]:
+        padrao: str = busca.nome.replace("!", "!!").replace("%", "!%").replace("_", "!_")
+        filtros: list[str] = [f"s.nome LIKE {self._placeholder} ESCAPE '!'"]
+        valores: list[int | str] = [f"%{padrao}%"]
+
+        if busca.pk_usuario is not None:
+            filtros.append(self.__filtro_visivel)
+            valores.append(busca.pk_usuario)
+
+        categorias: list[str] = sorted(set(busca.categorias))
+        if len(categorias) > 0:
+            wildcards: str = ", ".join([self._placeholder for c in categorias])
+            filtros.append(" ".join([
+                "s.pk_segredo IN (",
+                "SELECT cs.pfk_segredo FROM categoria_segredo cs",
+                "INNER JOIN categoria c ON c.pk_categoria = cs.pfk_categoria",
+                f"WHERE c.nome IN ({wildcards})",
+                "GROUP BY cs.pfk_segredo",
+                f"HAVING COUNT(*) = {self._placeholder}",
+                ")"
+            ]))
+            valores.extend(categorias)
+            valores.append(len(categorias))
+
+        if busca.depois is not None:
+            filtros.append(f"s.pk_segredo > {self._placeholder}")
+            valores.append(busca.depois)
+
+        valores.append(busca.limite)
+        sql: str = " ".join([
+            "SELECT s.pk_segredo, s.nome, s.descricao, s.fk_tipo_segredo",
+            "FROM segredo s",
+            "WHERE " + " AND ".join(filtros),
+            "ORDER BY s.pk_segredo",
+            f"LIMIT {self._placeholder}"
+        ])
+        return self._connection.execute(sql, valores).fetchall_class(DadosSegredo)
+
+    @property
+    def __filtro_visivel(self) -> str:
+        return " ".join([
+            "(s.fk_tipo_segredo IN (1, 2) OR EXISTS (",
+            "SELECT 1 FROM permissao p",
+            f"WHERE p.pfk_usuario = {self._placeholder} AND p.pfk_segredo = s.pk_segredo",
+            "))"
+        ])
+
+    @override
+    def listar_fluxo(self, pk_usuario: int | None, lote: int) -> Iterator[DadosSegredo]:
+        sql: str = " ".join([
+            "SELECT s.pk_segredo, s.nome, s.descricao, s.fk_tipo_segredo",
+            "FROM segredo s",
+            "" if pk_usuario is None else f"WHERE {self.__filtro_visivel}",
+            "ORDER BY s.pk_segredo"
+        ])
+        self._connection.execute_streaming(sql, [] if pk_usuario is None else [pk_usuario])
+        return self._connection.iter_class(DadosSegredo, lote)
+
     @override
     def listar_por_pks(self, pks: list[SegredoPK]) -> list[DadosSegredo]:
         wildcards: str = ", ".join([self._placeholder for pk in pks])
@@ -101,6 +248,20 @@ class SegredoDAOImpl(SegredoDAO):
         self._connection.execute(sql, [c.pk_segredo, c.pk_categoria])
         return self._connection.rowcount > 0
 
+    @override
+    def criar_categorias_segredo(self, cs: list[CategoriaDeSegredo]) -> None:
+        if len(cs) == 0:
+            return
+        sql: str = f"INSERT INTO categoria_segredo (pfk_segredo, pfk_categoria) VALUES ({self._placeholder}, {self._placeholder})"
+        self._connection.executemany(sql, [[c.pk_segredo, c.pk_categoria] for c in cs])
+
+    @override
+    def deletar_categorias_segredo(self, cs: list[CategoriaDeSegredo]) -> None:
+        if len(cs) == 0:
+            return
+        sql: str = f"DELETE FROM categoria_segredo WHERE pfk_segredo = {self._placeholder} AND pfk_categoria = {self._placeholder}"
+        self._connection.executemany(sql, [[c.pk_segredo, c.pk_categoria] for c in cs])
+
     # Campos
 
     @override
@@ -109,11 +270,32 @@ class SegredoDAOImpl(SegredoDAO):
         self._connection.execute(sql, [campo.pfk_segredo, campo.pk_nome, campo.valor])
         return self._connection.rowcount > 0
 
+    @override
+    def criar_campos_segredo(self, campos: list[CampoDeSegredo]) -> None:
+        if len(campos) == 0:
+            return
+        sql: str = f"INSERT INTO campo_segredo (pfk_segredo, pk_nome, valor) VALUES ({self._placeholder}, {self._placeholder}, {self._placeholder})"
+        self._connection.executemany(sql, [[campo.pfk_segredo, campo.pk_nome, campo.valor] for campo in campos])
+
     @override
     def ler_campos_segredo(self, pk: SegredoPK) -> list[CampoDeSegredo]:
         sql: str = f"SELECT pfk_segredo, pk_nome, valor FROM campo_segredo WHERE pfk_segredo = {self._placeholder} ORDER BY pk_nome"
         return self._connection.execute(sql, [pk.pk_segredo]).fetchall_class(CampoDeSegredo)
 
+    @override
+    def alterar_campos_segredo(self, campos: list[CampoDeSegredo]) -> None:
+        if len(campos) == 0:
+            return
+        sql: str = f"UPDATE campo_segredo SET valor = {self._placeholder} WHERE pfk_segredo = {self._placeholder} AND pk_nome = {self._placeholder}"
+        self._connection.executemany(sql, [[campo.valor, campo.pfk_segredo, campo.pk_nome] for campo in campos])
+
+    @override
+    def deletar_campos_segredo(self, campos: list[CampoDeSegredo]) -> None:
+        if len(campos) == 0:
+            return
+        sql: str = f"DELETE FROM campo_segredo WHERE pfk_segredo = {self._placeholder} AND pk_nome = {self._placeholder}"
+        self._connection.executemany(sql, [[campo.pfk_segredo, campo.pk_nome] for campo in campos])
+
     # Permissões
 
     @override
@@ -122,6 +304,27 @@ class SegredoDAOImpl(SegredoDAO):
         self._connection.execute(sql, [permissao.pfk_usuario, permissao.pfk_segredo, permissao.fk_tipo_permissao])
         return self._connection.rowcount > 0
 
+    @override
+    def criar_permissoes(self, permissoes: list[PermissaoDeSegredo]) -> None:
+        if len(permissoes) == 0:
+            return
+        sql: str = f"INSERT INTO permissao (pfk_usuario, pfk_segredo, fk_tipo_permissao) VALUES ({self._placeholder}, {self._placeholder}, {self._placeholder})"
+        self._connection.executemany(sql, [[p.pfk_usuario, p.pfk_segredo, p.fk_tipo_permissao] for p in permissoes])
+
+    @override
+    def alterar_permissoes(self, permissoes: list[PermissaoDeSegredo]) -> None:
+        if len(permissoes) == 0:
+            return
+        sql: str = f"UPDATE permissao SET fk_tipo_permissao = {self._placeholder} WHERE pfk_usuario = {self._placeholder} AND pfk_segredo = {self._placeholder}"
+        self._connection.executemany(sql, [[p.fk_tipo_permissao, p.pfk_usuario, p.pfk_segredo] for p in permissoes])
+
+    @override
+    def deletar_permissoes(self, permissoes: list[PermissaoDeSegredo]) -> None:
+        if len(permissoes) == 0:
+            return
+        sql: str = f"DELETE FROM permissao WHERE pfk_usuario = {self._placeholder} AND pfk_segredo = {self._placeholder}"
+        self._connection.executemany(sql, [[p.pfk_usuario, p.pfk_segredo] for p in permissoes])
+
     @override
     def buscar_permissao(self, busca: BuscaPermissaoPorLogin) -> PermissaoDeSegredo | None:
         sql: str = " ".join([
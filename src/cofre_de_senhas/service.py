@@ -1,4 +1,4 @@
-from typing import TypeAlias
+from typing import Iterator, TypeAlias
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from validator import dataclass_validate
@@ -251,6 +251,7 @@ class CabecalhoSegredoComChave:
 @dataclass(frozen = True)
 class ResultadoPesquisaDeSegredos:
     segredos: list[CabecalhoSegredoComChave]
+    continuacao: str | None = None
 
 
 @dataclass_validate
@@ -264,12 +265,21 @@ class CategoriaComChave:
 @dataclass(frozen = True)
 class ResultadoListaDeCategorias:
     lista: list[CategoriaComChave]
+    continuacao: str | None = None
 
 
 @dataclass_validate
 @dataclass(frozen = True)
 class ResultadoListaDeUsuarios:
     lista: list[UsuarioComChave]
+    continuacao: str | None = None
+
+
+@dataclass_validate
+@dataclass(frozen = True)
+class Paginacao:
+    continuacao: str | None = None
+    limite: int = 100
 
 
 @dataclass_validate
@@ -277,6 +287,8 @@ class ResultadoListaDeUsuarios:
 class PesquisaSegredos:
     nome: str
     categorias: list[str]
+    continuacao: str | None = None
+    limite: int = 100
 
 
 class GerenciadorLogin(ABC):
@@ -348,6 +360,10 @@ class ServicoUsuario(ABC):
     def listar(self) -> ResultadoListaDeUsuarios | _UNLE | _UBE | _LEE:
         pass
 
+    @abstractmethod
+    def listar_pagina(self, pagina: Paginacao) -> ResultadoListaDeUsuarios | _UNLE | _UBE | _LEE | _VIE:
+        pass
+
 
 class ServicoSegredo(ABC):
 
@@ -367,12 +383,21 @@ class ServicoSegredo(ABC):
     def listar(self) -> ResultadoPesquisaDeSegredos | _UNLE | _UBE | _LEE:
         pass
 
+    @abstractmethod
+    def listar_pagina(self, pagina: Paginacao) -> ResultadoPesquisaDeSegredos | _UNLE | _UBE | _LEE | _VIE:
+        pass
+
+    # Os segredos são produzidos sob demanda. Por isso, os erros (_UNLE, _UBE e _LEE) são lançados ao iterar, ao invés de retornados.
+    @abstractmethod
+    def listar_fluxo(self) -> Iterator[CabecalhoSegredoComChave]:
+        pass
+
     @abstractmethod
     def buscar_por_chave(self, chave: ChaveSegredo) -> SegredoComChave | _UNLE | _UBE | _SNEE | _LEE:
         pass
 
     @abstractmethod
-    def pesquisar(self, dados: PesquisaSegredos) -> ResultadoPesquisaDeSegredos | _UNLE | _UBE | _SNEE | _LEE:
+    def pesquisar(self, dados: PesquisaSegredos) -> ResultadoPesquisaDeSegredos | _UNLE | _UBE | _SNEE | _LEE | _VIE:
         pass
 
 
@@ -402,6 +427,10 @@ class ServicoCategoria(ABC):
     def listar(self) -> ResultadoListaDeCategorias | _UNLE | _UBE | _LEE:
         pass
 
+    @abstractmethod
+    def listar_pagina(self, pagina: Paginacao) -> ResultadoListaDeCategorias | _UNLE | _UBE | _LEE | _VIE:
+        pass
+
 
 class Servicos(ABC):
 
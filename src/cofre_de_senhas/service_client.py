@@ -1,5 +1,6 @@
-from typing import Any, Literal, override, TypeAlias
+from typing import Any, Iterator, Literal, override, TypeAlias
 from typing import TypeVar  # Delete when PEP 695 is ready.
+from urllib.parse import urlencode
 from dacite import Config, from_dict
 from enum import Enum, IntEnum
 from validator import dataclass_validate
@@ -10,7 +11,8 @@ from .service import (
     UsuarioComChave, ChaveUsuario, LoginUsuario, LoginComSenha, ResultadoListaDeUsuarios,
     TrocaSenha, SenhaAlterada, UsuarioComNivel, UsuarioNovo, ResetLoginUsuario, RenomeUsuario,
     CategoriaComChave, ChaveCategoria, NomeCategoria, RenomeCategoria, ResultadoListaDeCategorias,
-    SegredoComChave, SegredoSemChave, ChaveSegredo, PesquisaSegredos, ResultadoPesquisaDeSegredos,
+    SegredoComChave, SegredoSemChave, ChaveSegredo, PesquisaSegredos, ResultadoPesquisaDeSegredos, CabecalhoSegredoComChave,
+    Paginacao
 )
 from .erro import (
     UsuarioNaoLogadoException, UsuarioBanidoException, PermissaoNegadaException, SenhaErradaException, LoginExpiradoException,
@@ -53,6 +55,9 @@ _exceptions: list[type[BaseException]] = [
 ]
 _exceptions_names: dict[str, type[BaseException]] = {x.__name__: x for x in _exceptions}
 
+# Tamanho das páginas pedidas pelos métodos listar, que juntam todas as páginas em um único resultado.
+_PAGINA_LISTAR: int = 500
+
 
 @dataclass_validate
 @dataclass(frozen = True)
@@ -85,6 +90,13 @@ def _result_maker(j: Any, t: type[_T]) -> _T:
     return from_dict(data_class = t, data = j["conteudo"], config = Config(cast = [Enum, IntEnum]))
 
 
+def _query_pagina(pagina: Paginacao) -> str:
+    qs: list[tuple[str, str | int]] = [("limite", pagina.limite)]
+    if pagina.continuacao is not None:
+        qs.append(("continuacao", pagina.continuacao))
+    return urlencode(qs)
+
+
 def _eval(error_type: str, error_message: str) -> Any:
     if error_type not in _exceptions_names:
         raise NameError(error_type)
@@ -201,7 +213,22 @@ class _ServicoUsuarioClient(ServicoUsuario):
 
     @override
     def listar(self) -> ResultadoListaDeUsuarios | _UNLE | _UBE | _LEE:
-        return self.__requester.get("/usuarios", ResultadoListaDeUsuarios, typed(_UNLE).join(_UBE).join(_LEE).end)
+        lista: list[UsuarioComChave] = []
+        continuacao: str | None = None
+        while True:
+            r: ResultadoListaDeUsuarios | _UNLE | _UBE | _LEE | _VIE = self.listar_pagina(Paginacao(continuacao, _PAGINA_LISTAR))
+            if isinstance(r, _VIE):
+                raise r  # A continuação veio do próprio servidor, então não deveria ser recusada.
+            if not isinstance(r, ResultadoListaDeUsuarios):
+                return r
+            lista.extend(r.lista)
+            continuacao = r.continuacao
+            if continuacao is None:
+                return ResultadoListaDeUsuarios(lista)
+
+    @override
+    def listar_pagina(self, pagina: Paginacao) -> ResultadoListaDeUsuarios | _UNLE | _UBE | _LEE | _VIE:
+        return self.__requester.get(f"/usuarios?{_query_pagina(pagina)}", ResultadoListaDeUsuarios, typed(_UNLE).join(_UBE).join(_LEE).join(_VIE).end)
 
 
 class _ServicoSegredoClient(ServicoSegredo):
@@ -230,13 +257,32 @@ class _ServicoSegredoClient(ServicoSegredo):
     def listar(self) -> ResultadoPesquisaDeSegredos | _UNLE | _UBE | _LEE:
         return self.__requester.get("/segredos", ResultadoPesquisaDeSegredos, typed(_UNLE).join(_UBE).join(_LEE).end)
 
+    @override
+    def listar_pagina(self, pagina: Paginacao) -> ResultadoPesquisaDeSegredos | _UNLE | _UBE | _LEE | _VIE:
+        return self.__requester.get(f"/segredos?{_query_pagina(pagina)}", ResultadoPesquisaDeSegredos, typed(_UNLE).join(_UBE).join(_LEE).join(_VIE).end)
+
+    @override
+    def listar_fluxo(self) -> Iterator[CabecalhoSegredoComChave]:
+        continuacao: str | None = None
+        while True:
+            r: ResultadoPesquisaDeSegredos | _UNLE | _UBE | _LEE | _VIE = self.listar_pagina(Paginacao(continuacao, _PAGINA_LISTAR))
+            if not isinstance(r, ResultadoPesquisaDeSegredos):
+                raise r
+            yield from r.segredos
+            continuacao = r.continuacao
+            if continuacao is None:
+                return
+
     @override
     def buscar_por_chave(self, chave: ChaveSegredo) -> SegredoComChave | _UNLE | _UBE | _SNEE | _LEE:
         return self.__requester.get(f"/segredos/chave/{chave.valor}", SegredoComChave, typed(_UNLE).join(_UBE).join(_SNEE).join(_LEE).end)
 
     @override
-    def pesquisar(self, dados: PesquisaSegredos) -> ResultadoPesquisaDeSegredos | _UNLE | _UBE | _SNEE:
-        raise NotImplementedError("Não implementado")
+    def pesquisar(self, dados: PesquisaSegredos) -> ResultadoPesquisaDeSegredos | _UNLE | _UBE | _LEE | _VIE:
+        qs: list[tuple[str, str | int]] = [("nome", dados.nome)] + [("categoria", c) for c in dados.categorias] + [("limite", dados.limite)]
+        if dados.continuacao is not None:
+            qs.append(("continuacao", dados.continuacao))
+        return self.__requester.get(f"/segredos/pesquisa?{urlencode(qs)}", ResultadoPesquisaDeSegredos, typed(_UNLE).join(_UBE).join(_LEE).join(_VIE).end)
 
 
 class _ServicoCategoriaClient(ServicoCategoria):
@@ -281,4 +327,19 @@ class _ServicoCategoriaClient(ServicoCategoria):
 
     @override
     def listar(self) -> ResultadoListaDeCategorias | _UNLE | _UBE | _LEE:
-        return self.__requester.get("/categorias", ResultadoListaDeCategorias, typed(_UNLE).join(_UBE).join(_LEE).end)
+        lista: list[CategoriaComChave] = []
+        continuacao: str | None = None
+        while True:
+            r: ResultadoListaDeCategorias | _UNLE | _UBE | _LEE | _VIE = self.listar_pagina(Paginacao(continuacao, _PAGINA_LISTAR))
+            if isinstance(r, _VIE):
+                raise r  # A continuação veio do próprio servidor, então não deveria ser recusada.
+            if not isinstance(r, ResultadoListaDeCategorias):
+                return r
+            lista.extend(r.lista)
+            continuacao = r.continuacao
+            if continuacao is None:
+                return ResultadoListaDeCategorias(lista)
+
+    @override
+    def listar_pagina(self, pagina: Paginacao) -> ResultadoListaDeCategorias | _UNLE | _UBE | _LEE | _VIE:
+        return self.__requester.get(f"/categorias?{_query_pagina(pagina)}", ResultadoListaDeCategorias, typed(_UNLE).join(_UBE).join(_LEE).join(_VIE).end)
@@ -1,12 +1,13 @@
-from typing import override, ParamSpec, TypeAlias, TypeVar
+from typing import Callable, Iterator, override, ParamSpec, TypeAlias, TypeVar
 from decorators.for_all import for_all_methods
-from connection.trans import TransactedConnection
+from connection.trans import read_only, TransactedConnection
 from .service import (
     GerenciadorLogin, ServicoBD, ServicoUsuario, ServicoCategoria, ServicoSegredo, Servicos,
     UsuarioComChave, ChaveUsuario, LoginUsuario, LoginComSenha, ResultadoListaDeUsuarios,
     TrocaSenha, SenhaAlterada, UsuarioComNivel, UsuarioNovo, ResetLoginUsuario, RenomeUsuario,
     CategoriaComChave, ChaveCategoria, NomeCategoria, RenomeCategoria, ResultadoListaDeCategorias,
-    SegredoComChave, SegredoSemChave, ChaveSegredo, PesquisaSegredos, ResultadoPesquisaDeSegredos,
+    SegredoComChave, SegredoSemChave, ChaveSegredo, PesquisaSegredos, ResultadoPesquisaDeSegredos, CabecalhoSegredoComChave,
+    Paginacao
 )
 from .erro import (
     UsuarioNaoLogadoException, UsuarioBanidoException, PermissaoNegadaException, SenhaErradaException, LoginExpiradoException,
@@ -18,7 +19,7 @@ from .erro import (
 from sucesso import ConteudoBloqueadoException
 from .dao import CofreDeSenhasDAO
 from .categoria.categoria import ServicosImpl as CategoriaServicoInternoImpl
-from .usuario.usuario import ServicosImpl as UsuarioServicoInternoImpl
+from .usuario.usuario import CacheIdentidade, ServicosImpl as UsuarioServicoInternoImpl
 from .segredo.segredo import ServicosImpl as SegredoServicoInternoImpl
 from decorators.tracer import Logger
 
@@ -44,7 +45,7 @@ _CBE: TypeAlias = ConteudoBloqueadoException
 
 class ServicosImpl(Servicos):
 
-    def __init__(self, gl: GerenciadorLogin, trans: TransactedConnection) -> None:
+    def __init__(self, gl: GerenciadorLogin, trans: TransactedConnection, cache: CacheIdentidade | None = None) -> None:
         from .categoria.categoria_dao_impl import CategoriaDAOImpl
         from .usuario.usuario_dao_impl import UsuarioDAOImpl
         from .segredo.segredo_dao_impl import SegredoDAOImpl
@@ -58,7 +59,7 @@ class ServicosImpl(Servicos):
         sdao: SegredoDAOImpl = SegredoDAOImpl(trans)
         bdao: CofreDeSenhasDAOImpl = CofreDeSenhasDAOImpl(trans)
 
-        us: UsuarioServicoInternoImpl = UsuarioServicoInternoImpl(udao)
+        us: UsuarioServicoInternoImpl = UsuarioServicoInternoImpl(udao, CacheIdentidade(trans) if cache is None else cache)
         cs: CategoriaServicoInternoImpl = CategoriaServicoInternoImpl(cdao, us)
         ss: SegredoServicoInternoImpl = SegredoServicoInternoImpl(sdao, us, cs)
 
@@ -80,7 +81,7 @@ class ServicosImpl(Servicos):
         @for_all_methods(self.__trans.transact)
         class Interna2(_ServicoUsuarioImpl):
             def __init__(self) -> None:
-                super().__init__(gl, us)
+                super().__init__(gl, us, trans)
 
         @for_all_methods(_log.trace)
         @for_all_methods(self.__trans.transact)
@@ -131,6 +132,7 @@ class _Secreta:
         self.__ss: SegredoServicoInternoImpl = ss
 
     @property
+    @read_only
     def chave_secreta(self) -> str | _CBE:
         key: str = "Chave da sessão"
         segredo_chave: SegredoComChave | _SNEE = self.__ss.buscar_por_chave_sem_logar(ChaveSegredo(-1))
@@ -160,13 +162,26 @@ class _ServicoBDImpl(ServicoBD):
 
 class _ServicoUsuarioImpl(ServicoUsuario):
 
-    def __init__(self, gl: GerenciadorLogin, us: UsuarioServicoInternoImpl) -> None:
+    def __init__(self, gl: GerenciadorLogin, us: UsuarioServicoInternoImpl, trans: TransactedConnection) -> None:
         self.__gl: GerenciadorLogin = gl
         self.__us: UsuarioServicoInternoImpl = us
+        self.__trans: TransactedConnection = trans
 
+    # A senha é conferida (o que é lento) numa transação só de leitura. Se o hash precisar ser refeito, ele é gravado depois dela,
+    # numa transação de escrita própria e curta. Assim, os logins não ficam enfileirados na escrita (como no group commit).
+    # Se o login fizer parte de uma transação maior, o hash é gravado nela mesma.
     @override
+    @read_only
     def login(self, quem_faz: LoginComSenha) -> UsuarioComChave | _UBE | _SEE:
-        u: UsuarioComChave | _UBE | _SEE = self.__us.login(quem_faz)
+        sozinho: bool = self.__trans.reenter_count == 1
+
+        def depois(gravar: Callable[[], None]) -> None:
+            if sozinho:
+                self.__trans.after_commit(self.__trans.transact(gravar))
+            else:
+                gravar()
+
+        u: UsuarioComChave | _UBE | _SEE = self.__us.login(quem_faz, depois)
         if isinstance(u, UsuarioComChave):
             self.__gl.login(u)
         return u
@@ -211,6 +226,7 @@ class _ServicoUsuarioImpl(ServicoUsuario):
         return self.__us.renomear(u, dados)
 
     @override
+    @read_only
     def buscar_por_login(self, dados: LoginUsuario) -> UsuarioComChave | _UNLE | _UBE | _UNEE | _LEE:
         u: ChaveUsuario | _UNLE = self.__gl.usuario_logado
         if isinstance(u, _UNLE):
@@ -218,6 +234,7 @@ class _ServicoUsuarioImpl(ServicoUsuario):
         return self.__us.buscar_por_login(u, dados)
 
     @override
+    @read_only
     def buscar_por_chave(self, chave: ChaveUsuario) -> UsuarioComChave | _UNLE | _UBE | _UNEE | _LEE:
         u: ChaveUsuario | _UNLE = self.__gl.usuario_logado
         if isinstance(u, _UNLE):
@@ -225,12 +242,21 @@ class _ServicoUsuarioImpl(ServicoUsuario):
         return self.__us.buscar_por_chave(u, chave)
 
     @override
+    @read_only
     def listar(self) -> ResultadoListaDeUsuarios | _UNLE | _UBE | _LEE:
         u: ChaveUsuario | _UNLE = self.__gl.usuario_logado
         if isinstance(u, _UNLE):
             return u
         return self.__us.listar(u)
 
+    @override
+    @read_only
+    def listar_pagina(self, pagina: Paginacao) -> ResultadoListaDeUsuarios | _UNLE | _UBE | _LEE | _VIE:
+        u: ChaveUsuario | _UNLE = self.__gl.usuario_logado
+        if isinstance(u, _UNLE):
+            return u
+        return self.__us.listar_pagina(u, pagina)
+
 
 class _ServicoSegredoImpl(ServicoSegredo):
 
@@ -260,6 +286,7 @@ class _ServicoSegredoImpl(ServicoSegredo):
         return self.__ss.excluir_por_chave(u, dados)
 
     @override
+    @read_only
     def listar(self) -> ResultadoPesquisaDeSegredos | _UNLE | _UBE | _LEE:
         u: ChaveUsuario | _UNLE = self.__gl.usuario_logado
         if isinstance(u, _UNLE):
@@ -267,6 +294,23 @@ class _ServicoSegredoImpl(ServicoSegredo):
         return self.__ss.listar(u)
 
     @override
+    @read_only
+    def listar_pagina(self, pagina: Paginacao) -> ResultadoPesquisaDeSegredos | _UNLE | _UBE | _LEE | _VIE:
+        u: ChaveUsuario | _UNLE = self.__gl.usuario_logado
+        if isinstance(u, _UNLE):
+            return u
+        return self.__ss.listar_pagina(u, pagina)
+
+    @override
+    @read_only
+    def listar_fluxo(self) -> Iterator[CabecalhoSegredoComChave]:
+        u: ChaveUsuario | _UNLE = self.__gl.usuario_logado
+        if isinstance(u, _UNLE):
+            raise u
+        yield from self.__ss.listar_fluxo(u)
+
+    @override
+    @read_only
     def buscar_por_chave(self, chave: ChaveSegredo) -> SegredoComChave | _UNLE | _UBE | _SNEE | _LEE:
         u: ChaveUsuario | _UNLE = self.__gl.usuario_logado
         if isinstance(u, _UNLE):
@@ -274,7 +318,8 @@ class _ServicoSegredoImpl(ServicoSegredo):
         return self.__ss.buscar(u, chave)
 
     @override
-    def pesquisar(self, dados: PesquisaSegredos) -> ResultadoPesquisaDeSegredos | _UNLE | _UBE | _SNEE | _LEE:
+    @read_only
+    def pesquisar(self, dados: PesquisaSegredos) -> ResultadoPesquisaDeSegredos | _UNLE | _UBE | _SNEE | _LEE | _VIE:
         u: ChaveUsuario | _UNLE = self.__gl.usuario_logado
         if isinstance(u, _UNLE):
             return u
@@ -288,6 +333,7 @@ class _ServicoCategoriaImpl(ServicoCategoria):
         self.__cs: CategoriaServicoInternoImpl = cs
 
     @override
+    @read_only
     def buscar_por_nome(self, dados: NomeCategoria) -> CategoriaComChave | _UNLE | _UBE | _CNEE | _LEE:
         u: ChaveUsuario | _UNLE = self.__gl.usuario_logado
         if isinstance(u, _UNLE):
@@ -295,6 +341,7 @@ class _ServicoCategoriaImpl(ServicoCategoria):
         return self.__cs.buscar_por_nome(u, dados)
 
     @override
+    @read_only
     def buscar_por_chave(self, chave: ChaveCategoria) -> CategoriaComChave | _UNLE | _UBE | _CNEE | _LEE:
         u: ChaveUsuario | _UNLE = self.__gl.usuario_logado
         if isinstance(u, _UNLE):
@@ -323,8 +370,17 @@ class _ServicoCategoriaImpl(ServicoCategoria):
         return self.__cs.excluir_por_nome(u, dados)
 
     @override
+    @read_only
     def listar(self) -> ResultadoListaDeCategorias | _UNLE | _UBE | _LEE:
         u: ChaveUsuario | _UNLE = self.__gl.usuario_logado
         if isinstance(u, _UNLE):
             return u
         return self.__cs.listar(u)
+
+    @override
+    @read_only
+    def listar_pagina(self, pagina: Paginacao) -> ResultadoListaDeCategorias | _UNLE | _UBE | _LEE | _VIE:
+        u: ChaveUsuario | _UNLE = self.__gl.usuario_logado
+        if isinstance(u, _UNLE):
+            return u
+        return self.__cs.listar_pagina(u, pagina)
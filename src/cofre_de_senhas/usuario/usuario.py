@@ -1,7 +1,10 @@
 import hasher
-from typing import Self, TypeAlias
+from typing import Callable, Self, TypeAlias
 from validator import dataclass_validate
 from dataclasses import dataclass, replace
+from threading import Lock
+from time import monotonic
+from connection.trans import TransactedConnection
 from ..erro import (
     SenhaErradaException, UsuarioBanidoException, LoginExpiradoException, PermissaoNegadaException,
     UsuarioNaoExisteException, UsuarioJaExisteException,
@@ -11,8 +14,10 @@ from ..dao import UsuarioDAO, UsuarioPK, DadosUsuario, DadosUsuarioComPermissao,
 from ..service import (
     TipoPermissao,
     UsuarioComChave, ChaveUsuario, NivelAcesso, UsuarioComNivel,
-    UsuarioNovo, RenomeUsuario, LoginComSenha, LoginUsuario, TrocaSenha, SenhaAlterada, ResetLoginUsuario, ResultadoListaDeUsuarios
+    UsuarioNovo, RenomeUsuario, LoginComSenha, LoginUsuario, TrocaSenha, SenhaAlterada, ResetLoginUsuario, ResultadoListaDeUsuarios,
+    Paginacao
 )
+from ..paginacao import paginar
 from typing import TYPE_CHECKING
 
 
@@ -97,11 +102,99 @@ class Permissao:
     usuario: Usuario
     tipo: TipoPermissao
 
+    # Exportado para a classe Segredo.
+    @staticmethod
+    def _promote(dados: DadosUsuarioComPermissao) -> "Permissao":
+        return Permissao(Usuario._promote(dados.sem_permissoes), TipoPermissao(dados.fk_tipo_permissao))
+
+    # Exportado para a classe Segredo.
+    @staticmethod
+    def _mapear_todos(dados: list[DadosUsuarioComPermissao]) -> dict[str, "Permissao"]:
+        return {p.login: Permissao._promote(p) for p in dados}
+
+
+# Evita buscar de novo no banco de dados o usuário que está fazendo a operação.
+# Dentro de uma transação, cada usuário é buscado no máximo uma vez. Com ttl > 0, os usuários encontrados também são lembrados
+# entre as transações por ttl segundos, a menos que sejam invalidados antes disso (o que ocorre sempre que forem alterados).
+# - Um usuário alterado numa transação só é esquecido pelas outras depois do commit. Antes disso, elas ainda podem ler (e lembrar)
+#   a versão antiga do banco de dados. A transação que o alterou deixa de usar o que foi lembrado pelas outras.
+# - Cada invalidação muda a geração. Um usuário buscado no banco antes de uma invalidação não é lembrado se ela terminar antes da busca.
+# - O que é lembrado fica na memória do processo. Com vários processos (--processos), uma alteração feita num deles não invalida
+#   o que os outros lembram, que podem continuar usando a versão antiga do usuário por até ttl segundos.
+class CacheIdentidade:
+
+    def __init__(self, conexao: TransactedConnection, ttl: float = 0.0, relogio: Callable[[], float] = monotonic) -> None:
+        self.__conexao: TransactedConnection = conexao
+        self.__ttl: float = ttl
+        self.__relogio: Callable[[], float] = relogio
+        self.__global: dict[ChaveUsuario, tuple[float, Usuario]] = {}
+        self.__geracao: int = 0
+        self.__lock: Lock = Lock()
+
+    @property
+    def __escopo(self) -> dict[object, object] | None:
+        if not self.__conexao.is_active:
+            return None
+        return self.__conexao.scope
+
+    def __buscar_global(self, chave: ChaveUsuario) -> Usuario | None:
+        if self.__ttl <= 0:
+            return None
+        with self.__lock:
+            encontrado: tuple[float, Usuario] | None = self.__global.get(chave)
+            if encontrado is None:
+                return None
+            if self.__relogio() >= encontrado[0]:
+                del self.__global[chave]
+                return None
+            return encontrado[1]
+
+    def __guardar_global(self, chave: ChaveUsuario, u1: Usuario, geracao: int) -> None:
+        if self.__ttl <= 0:
+            return
+        with self.__lock:
+            if geracao == self.__geracao:
+                self.__global[chave] = (self.__relogio() + self.__ttl, u1)
+
+    def __esquecer(self, chave: ChaveUsuario) -> None:
+        with self.__lock:
+            self.__global.pop(chave, None)
+            self.__geracao += 1
+
+    def buscar(self, chave: ChaveUsuario, carregar: Callable[[ChaveUsuario], Usuario | None]) -> Usuario | None:
+        escopo: dict[object, object] | None = self.__escopo
+        k: tuple[str, ChaveUsuario] = ("usuario", chave)
+        if escopo is not None and k in escopo:
+            x: object = escopo[k]
+            assert x is None or isinstance(x, Usuario)
+            return x
+        alterado: bool = escopo is not None and ("alterado", chave) in escopo
+        u1: Usuario | None = None if alterado else self.__buscar_global(chave)
+        if u1 is None:
+            geracao: int = self.__geracao
+            u1 = carregar(chave)
+            if u1 is not None and not alterado:
+                self.__guardar_global(chave, u1, geracao)
+        if escopo is not None:
+            escopo[k] = u1
+        return u1
+
+    def invalidar(self, chave: ChaveUsuario) -> None:
+        escopo: dict[object, object] | None = self.__escopo
+        if escopo is None:
+            self.__esquecer(chave)
+            return
+        escopo.pop(("usuario", chave), None)
+        if ("alterado", chave) not in escopo:
+            escopo[("alterado", chave)] = True
+            self.__conexao.after_commit(lambda: self.__esquecer(chave))
+
 
 class ServicosImpl:
 
-    def __init__(self, dao: UsuarioDAO) -> None:
+    def __init__(self, dao: UsuarioDAO, cache: CacheIdentidade) -> None:
         self.__dao: UsuarioDAO = dao
+        self.__cache: CacheIdentidade = cache
 
     def __redefinir_senha(self, u1: Usuario, nova_senha: str) -> Usuario:
         return self.__salvar(replace(u1, hash_com_sal = hasher.criar_hash(nova_senha)))
@@ -127,14 +220,18 @@ class ServicosImpl:
 
     def __salvar(self, u1: Usuario) -> Usuario:
         self.__dao.salvar_com_pk(u1._down)
+        self.__cache.invalidar(u1._chave)
         return u1
 
-    def __encontrar_por_chave(self, chave: ChaveUsuario) -> Usuario | None:
+    def __carregar_por_chave(self, chave: ChaveUsuario) -> Usuario | None:
         dados: DadosUsuario | None = self.__dao.buscar_por_pk(UsuarioPK(chave.valor))
         if dados is None:
             return None
         return Usuario._promote(dados)
 
+    def __encontrar_por_chave(self, chave: ChaveUsuario) -> Usuario | None:
+        return self.__cache.buscar(chave, self.__carregar_por_chave)
+
     def __encontrar_existente_por_chave(self, chave: ChaveUsuario) -> Usuario | _UNEE:
         encontrado: Usuario | None = self.__encontrar_por_chave(chave)
         if encontrado is None:
@@ -204,9 +301,7 @@ class ServicosImpl:
 
     # Exportado para a classe Segredo.
     def listar_por_permissao(self, segredo: "Segredo.Cabecalho") -> dict[str, Permissao]:
-        lista1: list[DadosUsuarioComPermissao] = self.__dao.listar_por_permissao(segredo.pk)
-        lista2: list[Permissao] = [Permissao(Usuario._promote(dados.sem_permissoes), TipoPermissao(dados.fk_tipo_permissao)) for dados in lista1]
-        return {permissao.usuario.login: permissao for permissao in lista2}
+        return Permissao._mapear_todos(self.__dao.listar_por_permissao(segredo.pk))
 
     def __trocar_senha_por_chave(self, quem_faz: ChaveUsuario, dados: TrocaSenha) -> None | _LEE | _UBE | _SEE:
         u1: Usuario | _LEE | _UBE = self.verificar_acesso(quem_faz)
@@ -243,7 +338,12 @@ class ServicosImpl:
         self.__renomear(u2, dados.novo)
         return None
 
-    def __login(self, quem_faz: LoginComSenha) -> UsuarioComChave | _UBE | _SEE:
+    # A troca só é feita se o hash ainda for o mesmo, para não desfazer uma troca de senha que tenha acontecido nesse meio tempo.
+    def __substituir_hash(self, u1: Usuario, novo_hash: str) -> None:
+        if self.__dao.substituir_hash(UsuarioPK(u1.pk_usuario), u1.hash_com_sal, novo_hash):
+            self.__cache.invalidar(u1._chave)
+
+    def __login(self, quem_faz: LoginComSenha, depois: Callable[[Callable[[], None]], None]) -> UsuarioComChave | _UBE | _SEE:
         dados: DadosUsuario | None = self.__dao.buscar_por_login(LoginUsuarioUK(quem_faz.login))
         if dados is None:
             return SenhaErradaException()
@@ -252,6 +352,12 @@ class ServicosImpl:
             return UsuarioBanidoException()
         if not cadastrado._validar_senha(quem_faz.senha):
             return SenhaErradaException()
+        # O login é a única ocasião em que a senha é conhecida, então é aqui que hashes antigos ou mais fracos são refeitos.
+        # O novo hash é calculado aqui, mas é gravado só depois, pela operação entregue a depois, numa transação de escrita própria.
+        if hasher.precisa_rehash(cadastrado.hash_com_sal):
+            u1: Usuario = cadastrado
+            novo_hash: str = hasher.criar_hash(quem_faz.senha)
+            depois(lambda: self.__substituir_hash(u1, novo_hash))
         return cadastrado._up
 
     def __buscar_por_chave(self, quem_faz: ChaveUsuario, chave: ChaveUsuario) -> UsuarioComChave | _UNEE | _UBE | _LEE:
@@ -297,6 +403,15 @@ class ServicosImpl:
             return u1
         return ResultadoListaDeUsuarios([x._up for x in self.__listar_interno()])
 
+    def __listar_pagina(self, quem_faz: ChaveUsuario, pagina: Paginacao) -> ResultadoListaDeUsuarios | _LEE | _UBE | _VIE:
+        u1: Usuario | _LEE | _UBE = self.verificar_acesso(quem_faz)
+        if not isinstance(u1, Usuario):
+            return u1
+        r: tuple[list[DadosUsuario], str | None] | _VIE = paginar("usuario", pagina, self.__dao.listar_pagina, lambda d: d.pk_usuario)
+        if isinstance(r, _VIE):
+            return r
+        return ResultadoListaDeUsuarios([Usuario._promote(d)._up for d in r[0]], r[1])
+
     def trocar_senha_por_chave(self, quem_faz: ChaveUsuario, dados: TrocaSenha) -> None | _LEE | _UBE | _SEE:
         return self.__trocar_senha_por_chave(quem_faz, dados)
 
@@ -306,8 +421,8 @@ class ServicosImpl:
     def alterar_nivel_por_login(self, quem_faz: ChaveUsuario, dados: UsuarioComNivel) -> None | _UNEE | _UBE | _PNE | _LEE:
         return self.__alterar_nivel_por_login(quem_faz, dados)
 
-    def login(self, quem_faz: LoginComSenha) -> UsuarioComChave | _UBE | _SEE:
-        return self.__login(quem_faz)
+    def login(self, quem_faz: LoginComSenha, depois: Callable[[Callable[[], None]], None]) -> UsuarioComChave | _UBE | _SEE:
+        return self.__login(quem_faz, depois)
 
     def buscar_por_chave(self, quem_faz: ChaveUsuario, chave: ChaveUsuario) -> UsuarioComChave | _UNEE | _UBE | _LEE:
         return self.__buscar_por_chave(quem_faz, chave)
@@ -326,3 +441,6 @@ class ServicosImpl:
 
     def listar(self, quem_faz: ChaveUsuario) -> ResultadoListaDeUsuarios | _LEE | _UBE:
         return self.__listar(quem_faz)
+
+    def listar_pagina(self, quem_faz: ChaveUsuario, pagina: Paginacao) -> ResultadoListaDeUsuarios | _LEE | _UBE | _VIE:
+        return self.__listar_pagina(quem_faz, pagina)
@@ -1,6 +1,6 @@
 from typing import override
 from connection.trans import TransactedConnection
-from ..dao import UsuarioDAO, UsuarioPK, DadosUsuario, DadosUsuarioSemPK, SegredoPK, DadosUsuarioComPermissao, LoginUsuarioUK
+from ..dao import UsuarioDAO, UsuarioPK, DadosUsuario, DadosUsuarioSemPK, SegredoPK, DadosUsuarioComPermissao, LoginUsuarioUK, BuscaPagina
 
 
 class UsuarioDAOImpl(UsuarioDAO):
@@ -26,6 +26,16 @@ class UsuarioDAOImpl(UsuarioDAO):
         sql: str = "SELECT pk_usuario, login, fk_nivel_acesso, hash_com_sal FROM usuario ORDER BY pk_usuario"
         return self._connection.execute(sql).fetchall_class(DadosUsuario)
 
+    @override
+    def listar_pagina(self, busca: BuscaPagina) -> list[DadosUsuario]:
+        depois: list[int] = [] if busca.depois is None else [busca.depois]
+        sql: str = " ".join([
+            "SELECT pk_usuario, login, fk_nivel_acesso, hash_com_sal FROM usuario",
+            "" if busca.depois is None else f"WHERE pk_usuario > {self._placeholder}",
+            f"ORDER BY pk_usuario LIMIT {self._placeholder}"
+        ])
+        return self._connection.execute(sql, depois + [busca.limite]).fetchall_class(DadosUsuario)
+
     @override
     def listar_por_logins(self, logins: list[LoginUsuarioUK]) -> list[DadosUsuario]:
         wildcards: str = ", ".join([self._placeholder for login in logins])
@@ -51,6 +61,15 @@ class UsuarioDAOImpl(UsuarioDAO):
         self._connection.execute(sql, [dados.pk_usuario, dados.login, dados.fk_nivel_acesso, dados.hash_com_sal, dados.pk_usuario])
         return self._connection.rowcount > 0
 
+    @override
+    def substituir_hash(self, pk_usuario: UsuarioPK, antigo: str, novo: str) -> bool:
+        sql: str = " ".join([
+            f"UPDATE usuario SET hash_com_sal = {self._placeholder}",
+            f"WHERE pk_usuario = {self._placeholder} AND hash_com_sal = {self._placeholder}"
+        ])
+        self._connection.execute(sql, [novo, pk_usuario.pk_usuario, antigo])
+        return self._connection.rowcount > 0
+
     @override
     def deletar_por_pk(self, pk: UsuarioPK) -> bool:
         sql: str = f"DELETE FROM usuario WHERE pk_usuario = {self._placeholder}"
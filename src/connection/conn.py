@@ -113,11 +113,11 @@ class ColumnSet:
     def __init__(self, items: list[ColumnDescriptor]) -> None:
         self.__items: list[ColumnDescriptor] = items[:]
 
-        x: list[str] = []
+        x: set[str] = set()
         for c in items:
             if c.name in x:
                 raise ValueError(f"Repeated column name {c.name}.")
-            x.append(c.name)
+            x.add(c.name)
 
     def __len__(self) -> int:
         return len(self.__items)
@@ -142,6 +142,9 @@ class Descriptor:
         return self.__column_names
 
 
+EMPTY_DESCRIPTOR = Descriptor([])
+
+
 class SimpleConnection(ABC, Iterator[tuple[RAW_DATA, ...]]):
 
     @abstractmethod
@@ -219,6 +222,19 @@ class SimpleConnection(ABC, Iterator[tuple[RAW_DATA, ...]]):
         t: Sequence[tuple[RAW_DATA, ...]] = self.fetchmany(size)
         return self.column_names.rows_to_classes_lambda(ctor, t)
 
+    @final
+    # def iter_class[T](self, klass: type[T], batch_size: int = 100) -> Iterator[T]: # PEP 695
+    def iter_class(self, klass: type[_T], batch_size: int = 100) -> Iterator[_T]:
+        # Reads the result of the last query in batches of batch_size rows, inflating them only when they are consumed.
+        # Pair it with execute_streaming so the connectors that would otherwise buffer the whole result don't.
+        t: Sequence[tuple[RAW_DATA, ...]] = self.fetchmany(batch_size)
+        if len(t) == 0:
+            return
+        names: ColumnNames = self.column_names
+        while len(t) > 0:
+            yield from names.rows_to_classes(klass, t)
+            t = self.fetchmany(batch_size)
+
     @abstractmethod
     def callproc(self, sql: str, parameters: Sequence[RAW_DATA] = ...) -> Self:
         pass
@@ -231,6 +247,11 @@ class SimpleConnection(ABC, Iterator[tuple[RAW_DATA, ...]]):
     def executemany(self, sql: str, parameters: Sequence[Sequence[RAW_DATA]] = ...) -> Self:
         pass
 
+    # Like execute, but the rows are left on the server to be read through fetchmany or iter_class.
+    # Cursors that already read the rows lazily (SQLite) don't need to override this.
+    def execute_streaming(self, sql: str, parameters: Sequence[RAW_DATA] = ()) -> Self:
+        return self.execute(sql, parameters)
+
     @abstractmethod
     def executescript(self, sql: str) -> Self:
         pass
@@ -316,3 +337,8 @@ class TransactionNotActiveException(Exception):
 class BadDatabaseConfigException(Exception):
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         super().__init__(*args, **kwargs)
+
+
+class PoolExhaustedException(Exception):
+    def __init__(self, message: str) -> None:
+        super().__init__(message)
@@ -0,0 +1,202 @@
+from typing import Any, Callable, Iterator, override, ParamSpec, Self
+from typing import TypeVar  # Delete when PEP 695 is ready.
+from concurrent.futures import Future
+from contextvars import Context, copy_context
+from dataclasses import dataclass
+from functools import partial, wraps
+from inspect import isgeneratorfunction
+from queue import Empty, SimpleQueue
+from sqlite3 import complete_statement
+from threading import Lock, Thread
+from time import monotonic
+from validator import dataclass_validate
+from .conn import BadDatabaseConfigException, SimpleConnection, UnsupportedOperationError
+from .pool import ConnectionPool, PooledTransactedConnection
+from .trans import is_read_only
+
+_P = ParamSpec("_P")
+_R = TypeVar("_R")  # Delete when PEP 695 is ready.
+
+
+@dataclass_validate
+@dataclass(frozen = True)
+class GroupCommitConfig:
+    max_batch: int = 32
+    max_delay: float = 0.0
+
+    def __post_type_validate__(self) -> None:
+        if self.max_batch < 1 or self.max_delay < 0:
+            raise BadDatabaseConfigException(f"Bad group commit settings: max_batch = {self.max_batch}, max_delay = {self.max_delay}")
+
+
+# Splits a script into its statements. A ";" only ends a statement where SQLite says so, so the ones in strings or triggers are kept.
+def _statements(script: str) -> Iterator[str]:
+    part: str = ""
+    for piece in script.split(";"):
+        part += piece + ";"
+        if complete_statement(part):
+            if part.strip(" \t\r\n;") != "":
+                yield part
+            part = ""
+
+
+class _Job:
+
+    def __init__(self, operation: Callable[[], Any]) -> None:
+        self.operation: Callable[[], Any] = operation
+        self.context: Context = copy_context()
+        self.future: Future[Any] = Future()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+# Only one connection at a time may write to an SQLite database, so concurrent write transactions just queue for the lock
+# (or fail with "database is locked"), and each one pays for its own commit, which is the expensive part.
+# Here, the write transactions (everything run through transact, except what is marked with read_only) are handed to a
+# single writer thread. It runs them one after the other in a single database transaction, each one inside a savepoint,
+# and commits them together:
+# - A batch takes the transactions that queued up while the previous one was committing, up to max_batch.
+#   With a max_delay, it also waits up to that many seconds (since its start) for more transactions to arrive. That only pays off
+#   when commits are slow and callers are few, since the writer sits idle while waiting.
+# - A transaction that fails is rolled back to its savepoint and its caller gets the exception. The others are not affected.
+# - A failure of the commit itself fails the whole batch.
+# - Callers only get their results after the commit, so a result that was returned is durable. The after_commit callbacks run then,
+#   in the thread of the caller.
+# The operation runs in a copy of the context of the caller, so context variables (such as those of Flask) still work.
+# Read-only transactions, and plain "with" blocks, use the read-only connections of the pool, and run in parallel with the writer.
+class GroupCommitConnection(PooledTransactedConnection):
+
+    def __init__(
+            self,
+            readers: ConnectionPool,
+            writer: Callable[[], SimpleConnection],
+            config: GroupCommitConfig,
+            placeholder: str,
+            database_type: str,
+            database_name: str
+    ) -> None:
+        super().__init__(readers, placeholder, database_type, database_name)
+        self.__writer: Callable[[], SimpleConnection] = writer
+        self.__config: GroupCommitConfig = config
+        self.__queue: SimpleQueue[_Job | None] = SimpleQueue()
+        self.__lock: Lock = Lock()
+        self.__thread: Thread | None = None
+        self.__stopping: bool = False
+        self.__batches: int = 0
+        self.__commits: int = 0
+
+    @property
+    def config(self) -> GroupCommitConfig:
+        return self.__config
+
+    # How many batches were committed (or failed), and how many transactions they had.
+    @property
+    def commit_statistics(self) -> tuple[int, int]:
+        return self.__batches, self.__commits
+
+    # def transact[**P, R](self, operation: Callable[P, R]) -> Callable[P, R]: # PEP 695
+    @override
+    def transact(self, operation: Callable[_P, _R]) -> Callable[_P, _R]:
+        if is_read_only(operation):
+            return self.transact_read_only(operation)
+        if isgeneratorfunction(operation):
+            raise UnsupportedOperationError(f"{operation.__qualname__} is a generator, so it can only be transacted if it is read_only.")
+
+        @wraps(operation)
+        def transacted_operation(*args: _P.args, **kwargs: _P.kwargs) -> _R:
+            # Nested transactions are part of the one that is already active, be it in the writer or not.
+            if self.is_active:
+                return operation(*args, **kwargs)
+            return self.__submit(partial(operation, *args, **kwargs))
+        return transacted_operation
+
+    # sqlite3 commits whatever is pending before running a script, which would break the batch.
+    # So, the statements of the script are run one by one, inside the transaction.
+    @override
+    def executescript(self, sql: str) -> Self:
+        for statement in _statements(sql):
+            self.execute(statement)
+        return self
+
+    # The writer thread is only started when the first write arrives. Processes that only read never open the writer connection.
+    def __submit(self, operation: Callable[[], _R]) -> _R:
+        job: _Job = _Job(operation)
+        with self.__lock:
+            if self.__thread is None:
+                self.__thread = Thread(target = self.__run, name = "group-commit", daemon = True)
+                self.__thread.start()
+        self.__queue.put(job)
+        done: tuple[_R, list[Callable[[], None]]] = job.future.result()
+        for c in done[1]:
+            c()
+        return done[0]
+
+    def stop(self) -> None:
+        with self.__lock:
+            t: Thread | None = self.__thread
+            self.__thread = None
+        if t is not None:
+            self.__queue.put(None)
+            t.join()
+
+    # The next transaction of the batch, or None if the batch is over.
+    def __next(self, deadline: float) -> _Job | None:
+        try:
+            remaining: float = deadline - monotonic()
+            job: _Job | None = self.__queue.get_nowait() if remaining <= 0 else self.__queue.get(timeout = remaining)
+        except Empty:
+            return None
+        if job is None:
+            self.__stopping = True
+        return job
+
+    def __apply(self, conn: SimpleConnection, job: _Job) -> None:
+        conn.execute("SAVEPOINT group_commit")
+        try:
+            job.result = job.context.run(self._join, conn, job.operation)
+        except BaseException as x:
+            job.error = x
+            conn.execute("ROLLBACK TO SAVEPOINT group_commit")
+        conn.execute("RELEASE SAVEPOINT group_commit")
+
+    def __run(self) -> None:
+        conn: SimpleConnection | None = None
+        self.__stopping = False
+        try:
+            while not self.__stopping:
+                job: _Job | None = self.__queue.get()
+                if job is None:
+                    return
+                batch: list[_Job] = []
+                try:
+                    if conn is None:
+                        conn = self.__writer()
+                    conn.execute("BEGIN IMMEDIATE")
+                    deadline: float = monotonic() + self.__config.max_delay
+                    while job is not None:
+                        batch.append(job)
+                        self.__apply(conn, job)
+                        if len(batch) >= self.__config.max_batch:
+                            break
+                        job = self.__next(deadline)
+                    conn.commit()
+                except BaseException as x:
+                    if job is not None and job not in batch:
+                        batch.append(job)
+                    try:
+                        if conn is not None:
+                            conn.rollback()
+                    except BaseException:
+                        pass
+                    for j in batch:
+                        j.error = x
+                self.__batches += 1
+                self.__commits += len(batch)
+                for j in batch:
+                    if j.error is None:
+                        j.future.set_result(j.result)
+                    else:
+                        j.future.set_exception(j.error)
+        finally:
+            if conn is not None:
+                conn.close()
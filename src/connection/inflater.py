@@ -1,21 +1,165 @@
-from typing import Any, Callable, Sequence
+from typing import Any, Callable, cast, get_args, get_type_hints, Sequence, Union
 from typing import TypeVar  # Delete when PEP 695 is ready.
+from types import NoneType, UnionType
 from enum import Enum, IntEnum
+from functools import partial
+from dataclasses import fields, is_dataclass, MISSING
 from dacite import Config, from_dict
+from dacite.exceptions import MissingValueError, UnexpectedDataError, WrongTypeError
 
 _T = TypeVar("_T")  # Delete when PEP 695 is ready.
 _U = TypeVar("_U")  # Delete when PEP 695 is ready.
 
+_CONFIG: Config = Config(cast = [Enum, IntEnum], strict = True)
+
+_Inflater = Callable[[tuple[Any, ...]], Any]
+_Step = Callable[[tuple[Any, ...]], Any]
+
+
+def _by_dacite(klass: type[_T], names: tuple[str, ...]) -> Callable[[tuple[Any, ...]], _T]:
+    def inflate(row: tuple[Any, ...]) -> _T:
+        return from_dict(data_class = klass, data = dict(zip(names, row)), config = _CONFIG)
+    return inflate
+
+
+def _raiser(error: Callable[[], Exception]) -> _Step:
+    def inflate(row: tuple[Any, ...]) -> Any:
+        raise error()
+    return inflate
+
+
+def _constant(value: Any) -> _Step:
+    return lambda row: value
+
+
+def _factory(make: Callable[[], Any]) -> _Step:
+    return lambda row: make()
+
+
+def _column(i: int, c: Callable[[Any], Any]) -> _Step:
+    return lambda row: c(row[i])
+
+
+def _simple_type(t: Any) -> bool:
+    return isinstance(t, type) and not is_dataclass(t) and len(get_args(t)) == 0
+
+
+def _union(t: Any) -> bool:
+    return type(t) is UnionType or getattr(t, "__origin__", None) is Union
+
+
+# Like dacite, a missing Optional field without a default is None.
+def _optional(t: Any) -> bool:
+    return _union(t) and NoneType in get_args(t)
+
+
+# As in PEP 484 (the numeric tower), and in dacite, an int is accepted where a float or a complex is expected.
+_NUMERIC_TOWER: dict[type[Any], tuple[type[Any], ...]] = {float: (int, float), complex: (int, float, complex)}
+
+
+# Mimics what dacite does for a single value of a simple type, without going through a dict.
+def _compile_value(name: str, t: Any) -> Callable[[Any], Any] | None:
+    if t is Any:
+        return lambda v: v
+
+    declared: Any = t
+    optional: bool = False
+    if _union(t):
+        args: tuple[Any, ...] = get_args(t)
+        if len(args) != 2 or NoneType not in args:
+            return None
+        t = args[0] if args[1] is NoneType else args[1]
+        optional = True
+        if not _simple_type(t) or issubclass(t, Enum):
+            return None
+    elif not _simple_type(t):
+        return None
+
+    def wrong(v: Any) -> Any:
+        raise WrongTypeError(field_path = name, field_type = declared, value = v)
+
+    if issubclass(t, Enum):
+        return cast(Callable[[Any], Any], t)
+
+    accepted: type[Any] | tuple[type[Any], ...] = _NUMERIC_TOWER.get(t, t)
+
+    if optional:
+        return lambda v: v if v is None or isinstance(v, accepted) else wrong(v)
+
+    return lambda v: v if isinstance(v, accepted) else wrong(v)
+
+
+def _compile_row_to_class(klass: type[_T], names: tuple[str, ...]) -> Callable[[tuple[Any, ...]], _T]:
+    if not is_dataclass(klass):
+        return _by_dacite(klass, names)
+    try:
+        hints: dict[str, Any] = get_type_hints(klass)
+    except NameError:
+        return _by_dacite(klass, names)
+
+    all_fields = fields(klass)
+    extra: set[str] = set(names) - {f.name for f in all_fields}
+    if len(extra) > 0:
+        return _raiser(lambda: UnexpectedDataError(keys = extra))
+
+    position: dict[str, int] = {n: i for i, n in enumerate(names)}
+    steps: list[_Step] = []
+    order: list[tuple[int, Callable[[Any], Any]]] = []
+    for f in all_fields:
+        if not f.init or f.kw_only:
+            return _by_dacite(klass, names)
+        i: int | None = position.get(f.name)
+        if i is None:
+            if f.default is not MISSING:
+                steps.append(_constant(f.default))
+            elif f.default_factory is not MISSING:
+                steps.append(_factory(f.default_factory))
+            elif _optional(hints[f.name]):
+                steps.append(_constant(None))
+            else:
+                steps.append(_raiser(partial(MissingValueError, f.name)))
+            continue
+        c: Callable[[Any], Any] | None = _compile_value(f.name, hints[f.name])
+        if c is None:
+            return _by_dacite(klass, names)
+        steps.append(_column(i, c))
+        order.append((i, c))
+
+    ctor: Callable[..., _T] = cast(Callable[..., _T], klass)
+
+    if len(order) == len(steps):
+        def inflate_all(row: tuple[Any, ...]) -> _T:
+            return ctor(*[c(row[i]) for i, c in order])
+        return inflate_all
+
+    def inflate_some(row: tuple[Any, ...]) -> _T:
+        return ctor(*[step(row) for step in steps])
+    return inflate_some
+
+
+# The row -> object mapping depends only on the column names and on the class, so it is compiled once for each pair and reused.
+_compiled: dict[tuple[type[Any], tuple[str, ...]], _Inflater] = {}
+
+
+def _inflater_for(klass: type[_T], names: tuple[str, ...]) -> Callable[[tuple[Any, ...]], _T]:
+    key: tuple[type[Any], tuple[str, ...]] = (klass, names)
+    inflate: _Inflater | None = _compiled.get(key)
+    if inflate is None:
+        inflate = _compile_row_to_class(klass, names)
+        _compiled[key] = inflate
+    return cast(Callable[[tuple[Any, ...]], _T], inflate)
+
 
 class ColumnNames:
     def __init__(self, items: list[str]) -> None:
         self.__items: list[str] = items[:]
+        self.__key: tuple[str, ...] = tuple(items)
 
-        x: list[str] = []
+        x: set[str] = set()
         for c in items:
             if c in x:
                 raise ValueError(f"Repeated column name {c}.")
-            x.append(c)
+            x.add(c)
 
     def __len__(self) -> int:
         return len(self.__items)
@@ -51,7 +195,9 @@ class ColumnNames:
 
     # def row_to_class[T](self, klass: type[T], row: tuple[Any, ...]) -> T: # PEP 695
     def row_to_class(self, klass: type[_T], row: tuple[Any, ...]) -> _T:
-        return self.row_to_class_lambda(lambda d: from_dict(data_class = klass, data = d, config = Config(cast = [Enum, IntEnum], strict = True)), row)
+        if len(self) != len(row):
+            raise ValueError("Column descriptions and rows do not have the same length.")
+        return _inflater_for(klass, self.__key)(row)
 
     # def row_to_class_lambda_opt[U, T](self, ctor: Callable[[dict[str, U]], T], row: tuple[U, ...] | None) -> T | None: # PEP 695
     def row_to_class_lambda_opt(self, ctor: Callable[[dict[str, _U]], _T], row: tuple[_U, ...] | None) -> _T | None:
@@ -74,7 +220,11 @@ class ColumnNames:
 
     # def rows_to_classes[U, T](self, klass: type[T], rows: Sequence[tuple[U, ...]]) -> list[T]: # PEP 695
     def rows_to_classes(self, klass: type[_T], rows: Sequence[tuple[_U, ...]]) -> list[_T]:
+        inflate: Callable[[tuple[Any, ...]], _T] = _inflater_for(klass, self.__key)
+        size: int = len(self)
         result = []
         for row in rows:
-            result.append(self.row_to_class(klass, row))
+            if size != len(row):
+                raise ValueError("Column descriptions and rows do not have the same length.")
+            result.append(inflate(row))
         return result
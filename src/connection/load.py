@@ -8,6 +8,8 @@ from .mariadbconn import MariadbConnectionData
 from .mysqlconn import MysqlConnectionData
 from .conn import BadDatabaseConfigException
 from .trans import ConnectionData, TransactedConnection
+from .pool import PoolConfig, PooledConnectionData
+from .routing import RoutingConnectionData
 
 
 def _raise_it(database_name: str) -> ConnectionData:
@@ -25,11 +27,13 @@ def _read_all(fn: str) -> str:
 class DatabaseConfig:
     flavor: str
     properties: dict[str, Any]
+    pool: dict[str, Any] | None = None
+    routing: dict[str, Any] | None = None
 
-    def connect(self) -> TransactedConnection:
-        a: Callable[[], ConnectionData] = lambda: SqliteConnectionData .create(**self.properties)
-        b: Callable[[], ConnectionData] = lambda: MariadbConnectionData.create(**self.properties)
-        c: Callable[[], ConnectionData] = lambda: MysqlConnectionData  .create(**self.properties)
+    def __data(self, properties: dict[str, Any]) -> ConnectionData:
+        a: Callable[[], ConnectionData] = lambda: SqliteConnectionData .create(**properties)
+        b: Callable[[], ConnectionData] = lambda: MariadbConnectionData.create(**properties)
+        c: Callable[[], ConnectionData] = lambda: MysqlConnectionData  .create(**properties)
         x: Callable[[], ConnectionData] = lambda: _raise_it(self.flavor)
         d: dict[str, Callable[[], ConnectionData]] = {
             "sqlite" : a,  # noqa: E203
@@ -37,11 +41,32 @@ class DatabaseConfig:
             "mysql"  : c   # noqa: E203
         }
 
-        cd: ConnectionData
         try:
-            cd = d.get(self.flavor, x)()
+            return d.get(self.flavor, x)()
         except TypeError:
             raise BadDatabaseConfigException("Bad properties for " + self.flavor)
+
+    # The properties of each replica are merged over those of the primary, so usually only the host differs.
+    def __routing(self, primary: ConnectionData, routing: dict[str, Any]) -> RoutingConnectionData:
+        props: dict[str, Any] = dict(routing)
+        replicas: Any = props.pop("replicas", None)
+        if not isinstance(replicas, list) or not all(isinstance(r, dict) for r in replicas):
+            raise BadDatabaseConfigException("Bad replicas for " + self.flavor)
+        pool: PoolConfig | None = None if self.pool is None else PoolConfig.create(**self.pool)
+        try:
+            return RoutingConnectionData.create(primary = primary, replicas = [self.__data(self.properties | r) for r in replicas], pool = pool, **props)
+        except TypeError:
+            raise BadDatabaseConfigException("Bad routing properties")
+
+    def connect(self) -> TransactedConnection:
+        cd: ConnectionData = self.__data(self.properties)
+        if self.routing is not None:
+            return self.__routing(cd, self.routing).connect()
+        if self.pool is not None:
+            # With group commit, the pool is only used by the reads.
+            if isinstance(cd, SqliteConnectionData) and cd.group_commit:
+                return cd.connect_group_commit(PoolConfig.create(**self.pool))
+            cd = PooledConnectionData.create(inner = cd, config = PoolConfig.create(**self.pool))
         return cd.connect()
 
     @staticmethod
@@ -1,9 +1,8 @@
 from typing import Any, Callable, cast, override, Self, Sequence
 from typing import TypeVar  # Delete when PEP 695 is ready.
-from decorators.for_all import for_all_methods
-from functools import wraps
+from functools import lru_cache, wraps
 from .conn import (
-    BadDatabaseConfigException, ColumnDescriptor, Descriptor, FieldFlags, IntegrityViolationException,
+    BadDatabaseConfigException, ColumnDescriptor, Descriptor, EMPTY_DESCRIPTOR, FieldFlags, IntegrityViolationException,
     MisplacedOperationError, NullStatus, RAW_DATA, SimpleConnection, TypeCode, UnsupportedOperationError
 )
 from .trans import ConnectionData, TransactedConnection
@@ -95,20 +94,34 @@ class MariadbConnectionData(ConnectionData):
     ) -> "MariadbConnectionData":
         return MariadbConnectionData(user, password, host, port, database, connect_timeout)
 
-    def connect(self) -> TransactedConnection:
-        def make_connection() -> _MariaDBConnectionWrapper:
-            try:
-                return _MariaDBConnectionWrapper(db_connect(
-                    user = self.user,
-                    password = self.password,
-                    host = self.host,
-                    port = self.port,
-                    database = self.database,
-                    connect_timeout = self.connect_timeout
-                ), self.database)
-            except BaseException as x:
-                raise BadDatabaseConfigException(x)
-        return TransactedConnection(make_connection, "%s", "MariaDB", self.database)
+    @override
+    def make_connection(self) -> SimpleConnection:
+        try:
+            return _MariaDBConnectionWrapper(db_connect(
+                user = self.user,
+                password = self.password,
+                host = self.host,
+                port = self.port,
+                database = self.database,
+                connect_timeout = self.connect_timeout
+            ), self.database)
+        except BaseException as x:
+            raise BadDatabaseConfigException(x)
+
+    @property
+    @override
+    def placeholder(self) -> str:
+        return "%s"
+
+    @property
+    @override
+    def database_type(self) -> str:
+        return "MariaDB"
+
+    @property
+    @override
+    def database_name(self) -> str:
+        return self.database
 
 
 def _find_code(code: int) -> _InternalCode:
@@ -187,6 +200,7 @@ __flags: list[_Flag] = [
 ]
 
 
+@lru_cache(maxsize = 256)
 def _find_flags(code: int) -> FieldFlags:
     result: list[str] = []
     for f in __flags:
@@ -195,6 +209,33 @@ def _find_flags(code: int) -> FieldFlags:
     return FieldFlags(code, frozenset(result))
 
 
+_RawColumn = tuple[str, int, int, int, int, int, int, int, str, str, str]
+
+
+def _make_column(k: _RawColumn) -> ColumnDescriptor:
+    code: _InternalCode = _find_code(k[1])
+    return ColumnDescriptor.create(
+        name                 = k[0],                                            # noqa: E221
+        type_code            = code.type,                                       # noqa: E221
+        column_type_name     = code.name,                                       # noqa: E221
+        display_size         = k[2],                                            # noqa: E221
+        internal_size        = k[3],                                            # noqa: E221
+        precision            = k[4],                                            # noqa: E221
+        scale                = k[5],                                            # noqa: E221
+        null_ok              = NullStatus.YES if k[6] != 0 else NullStatus.NO,  # noqa: E221
+        field_flags          = _find_flags(k[7]),                               # noqa: E221
+        table_name           = k[8],                                            # noqa: E221
+        original_column_name = k[9],                                            # noqa: E221
+        original_table_name  = k[10]                                            # noqa: E221
+    )
+
+
+# Equal cursor descriptions always give equal descriptors, and those are immutable, so statements that select the same columns share one.
+@lru_cache(maxsize = 256)
+def _make_descriptor(raw: tuple[_RawColumn, ...]) -> Descriptor:
+    return Descriptor([_make_column(k) for k in raw])
+
+
 _TRANS = TypeVar("_TRANS", bound = Callable[..., Any])  # Delete when PEP 695 is ready.
 
 
@@ -213,17 +254,19 @@ def _wrap_exceptions(operation: _TRANS) -> _TRANS:
     return cast(_TRANS, inner)
 
 
-@for_all_methods(_wrap_exceptions, even_privates = False)
 class _MariaDBConnectionWrapper(SimpleConnection):
 
     def __init__(self, conn: MariaDBConnection, database_name: str) -> None:
         self.__conn: MariaDBConnection = conn
         self.__curr: MariaDBCursor = conn.cursor()
+        self.__streaming: bool = False
         self.__database_name: str = database_name
         self.__fetched: bool = False
         self.__executed: bool = False
+        self.__descriptor: Descriptor | None = None
 
     @override
+    @_wrap_exceptions
     def commit(self) -> None:
         self.__conn.commit()
 
@@ -237,6 +280,7 @@ class _MariaDBConnectionWrapper(SimpleConnection):
         self.__conn.close()
         self.__fetched = False
         self.__executed = False
+        self.__descriptor = None
 
     @override
     def fetchone(self) -> tuple[Any, ...] | None:
@@ -253,31 +297,56 @@ class _MariaDBConnectionWrapper(SimpleConnection):
         self.__fetched = True
         return self.__curr.fetchmany(size)
 
+    # The default cursor is buffered. An unbuffered one is only used by execute_streaming and is discarded (along with the rows
+    # not read yet) as soon as another statement is executed.
+    def __cursor(self, buffered: bool) -> MariaDBCursor:
+        if self.__streaming or not buffered:
+            self.__curr.close()
+            self.__curr = self.__conn.cursor(buffered = buffered)
+            self.__streaming = not buffered
+        return self.__curr
+
     @override
+    @_wrap_exceptions
     def callproc(self, sql: str, parameters: Sequence[RAW_DATA] = ()) -> Self:
         self.__fetched = False
         self.__executed = True
-        self.__curr.callproc(sql, parameters)
+        self.__descriptor = None
+        self.__cursor(True).callproc(sql, parameters)
         return self
 
     @override
+    @_wrap_exceptions
     def execute(self, sql: str, parameters: Sequence[RAW_DATA] = ()) -> Self:
         self.__fetched = False
         self.__executed = True
-        self.__curr.execute(sql, parameters)
+        self.__descriptor = None
+        self.__cursor(True).execute(sql, parameters)
         return self
 
     @override
+    @_wrap_exceptions
     def executemany(self, sql: str, parameters: Sequence[Sequence[RAW_DATA]] = ()) -> Self:
         self.__fetched = False
         self.__executed = True
-        self.__curr.executemany(sql, parameters)
+        self.__descriptor = None
+        self.__cursor(True).executemany(sql, parameters)
+        return self
+
+    @override
+    @_wrap_exceptions
+    def execute_streaming(self, sql: str, parameters: Sequence[RAW_DATA] = ()) -> Self:
+        self.__fetched = False
+        self.__executed = True
+        self.__descriptor = None
+        self.__cursor(False).execute(sql, parameters)
         return self
 
     @override
     def executescript(self, sql: str) -> Self:
         self.__fetched = False
         self.__executed = False
+        self.__descriptor = None
         raise UnsupportedOperationError("Sorry. The executescript method was not implemented yet.")
         # x: Generator[MySQLCursor, None, None] | None = self.__curr.execute(sql, multi = True)
         # if x is not None:
@@ -292,31 +361,18 @@ class _MariaDBConnectionWrapper(SimpleConnection):
             raise MisplacedOperationError("rowcount shouldn't be used before execute, executemany, executescript or callproc")
         return self.__curr.rowcount
 
-    def __make_descriptor(self, k: tuple[str, int, int, int, int, int, int, int, str, str, str]) -> ColumnDescriptor:
-        code: _InternalCode = _find_code(k[1])
-        return ColumnDescriptor.create(
-            name                 = k[0],                                            # noqa: E221
-            type_code            = code.type,                                       # noqa: E221
-            column_type_name     = code.name,                                       # noqa: E221
-            display_size         = k[2],                                            # noqa: E221
-            internal_size        = k[3],                                            # noqa: E221
-            precision            = k[4],                                            # noqa: E221
-            scale                = k[5],                                            # noqa: E221
-            null_ok              = NullStatus.YES if k[6] != 0 else NullStatus.NO,  # noqa: E221
-            field_flags          = _find_flags(k[7]),                               # noqa: E221
-            table_name           = k[8],                                            # noqa: E221
-            original_column_name = k[9],                                            # noqa: E221
-            original_table_name  = k[10]                                            # noqa: E221
-        )
-
+    # Built once per statement, on the first call, and kept until the next statement.
     @property
     @override
     def description(self) -> Descriptor:
         if not self.__fetched:
             raise MisplacedOperationError("description shouldn't be used before a fetcher method")
-        if self.__curr.description is None:
-            return Descriptor([])
-        return Descriptor([self.__make_descriptor(k) for k in self.__curr.description])
+        d: Descriptor | None = self.__descriptor
+        if d is None:
+            raw: Sequence[_RawColumn] | None = self.__curr.description
+            d = EMPTY_DESCRIPTOR if raw is None else _make_descriptor(tuple(raw))
+            self.__descriptor = d
+        return d
 
     @property
     @override
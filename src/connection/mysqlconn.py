@@ -1,9 +1,8 @@
 from typing import Any, Callable, cast, Generator, override, Self, Sequence
 from typing import TypeVar  # Delete when PEP 695 is ready.
-from decorators.for_all import for_all_methods
-from functools import wraps
+from functools import lru_cache, wraps
 from .conn import (
-    BadDatabaseConfigException, ColumnDescriptor, Descriptor,
+    BadDatabaseConfigException, ColumnDescriptor, Descriptor, EMPTY_DESCRIPTOR,
     IntegrityViolationException, NullStatus, RAW_DATA, SimpleConnection, TypeCode, MisplacedOperationError
 )
 from .trans import ConnectionData, TransactedConnection
@@ -93,19 +92,33 @@ class MysqlConnectionData(ConnectionData):
     ) -> "MysqlConnectionData":
         return MysqlConnectionData(user, password, host, port, database)
 
-    def connect(self) -> TransactedConnection:
-        def make_connection() -> _MySQLConnectionWrapper:
-            try:
-                return _MySQLConnectionWrapper(cast(CMySQLConnection, db_connect(
-                    user = self.user,
-                    password = self.password,
-                    host = self.host,
-                    port = self.port,
-                    database = self.database
-                )), self.database)
-            except BaseException as x:
-                raise BadDatabaseConfigException(x)
-        return TransactedConnection(make_connection, "%s", "MySQL", self.database)
+    @override
+    def make_connection(self) -> SimpleConnection:
+        try:
+            return _MySQLConnectionWrapper(cast(CMySQLConnection, db_connect(
+                user = self.user,
+                password = self.password,
+                host = self.host,
+                port = self.port,
+                database = self.database
+            )), self.database)
+        except BaseException as x:
+            raise BadDatabaseConfigException(x)
+
+    @property
+    @override
+    def placeholder(self) -> str:
+        return "%s"
+
+    @property
+    @override
+    def database_type(self) -> str:
+        return "MySQL"
+
+    @property
+    @override
+    def database_name(self) -> str:
+        return self.database
 
 
 def _find_code(code: int) -> _InternalCode:
@@ -123,6 +136,25 @@ def connect(
     return MysqlConnectionData.create(user = user, password = password, host = host, port = port, database = database).connect()
 
 
+_RawColumn = tuple[str, int, None, None, None, None, bool | int, int, int]
+
+
+def _make_column(k: _RawColumn) -> ColumnDescriptor:
+    code: _InternalCode = _find_code(k[1])
+    return ColumnDescriptor.create(
+        name = k[0],
+        type_code = code.type,
+        column_type_name = code.name,
+        null_ok = NullStatus.YES if k[6] not in [False, 0] else NullStatus.NO
+    )
+
+
+# Equal cursor descriptions always give equal descriptors, and those are immutable, so statements that select the same columns share one.
+@lru_cache(maxsize = 256)
+def _make_descriptor(raw: tuple[_RawColumn, ...]) -> Descriptor:
+    return Descriptor([_make_column(k) for k in raw])
+
+
 _TRANS = TypeVar("_TRANS", bound = Callable[..., Any])  # Delete when PEP 695 is ready.
 
 
@@ -156,17 +188,19 @@ class _PatchMySQLCursor(CMySQLCursor):
         self._last_insert_id: int = None  # type: ignore
 
 
-@for_all_methods(_wrap_exceptions, even_privates = False)
 class _MySQLConnectionWrapper(SimpleConnection):
 
     def __init__(self, conn: CMySQLConnection, database_name: str) -> None:
         self.__conn: CMySQLConnection = conn
         self.__curr: CMySQLCursor = conn.cursor(cursor_class = _PatchMySQLCursor)
+        self.__streaming: bool = False
         self.__database_name: str = database_name
         self.__fetched: bool = False
         self.__executed: bool = False
+        self.__descriptor: Descriptor | None = None
 
     @override
+    @_wrap_exceptions
     def commit(self) -> None:
         self.__conn.commit()
 
@@ -180,6 +214,7 @@ class _MySQLConnectionWrapper(SimpleConnection):
         self.__conn.close()
         self.__fetched = False
         self.__executed = False
+        self.__descriptor = None
 
     @override
     def fetchone(self) -> tuple[Any, ...] | None:
@@ -196,32 +231,57 @@ class _MySQLConnectionWrapper(SimpleConnection):
         self.__fetched = True
         return self.__curr.fetchmany(size)
 
+    # The C extension cursor is already unbuffered, so streaming only needs to throw away the rows of an abandoned stream
+    # before the next statement, which would otherwise fail with "Unread result found".
+    def __cursor(self, streaming: bool) -> CMySQLCursor:
+        if self.__streaming and self.__conn.unread_result:
+            self.__conn.consume_results()
+        self.__streaming = streaming
+        return self.__curr
+
     @override
+    @_wrap_exceptions
     def callproc(self, sql: str, parameters: Sequence[RAW_DATA] = ()) -> Self:
         self.__fetched = False
         self.__executed = True
-        self.__curr.callproc(sql, parameters)
+        self.__descriptor = None
+        self.__cursor(False).callproc(sql, parameters)
         return self
 
     @override
+    @_wrap_exceptions
     def execute(self, sql: str, parameters: Sequence[RAW_DATA] = ()) -> Self:
         self.__fetched = False
         self.__executed = True
-        self.__curr.execute(sql, parameters)
+        self.__descriptor = None
+        self.__cursor(False).execute(sql, parameters)
         return self
 
     @override
+    @_wrap_exceptions
     def executemany(self, sql: str, parameters: Sequence[Sequence[RAW_DATA]] = ()) -> Self:
         self.__fetched = False
         self.__executed = True
-        self.__curr.executemany(sql, parameters)
+        self.__descriptor = None
+        self.__cursor(False).executemany(sql, parameters)
         return self
 
     @override
+    @_wrap_exceptions
+    def execute_streaming(self, sql: str, parameters: Sequence[RAW_DATA] = ()) -> Self:
+        self.__fetched = False
+        self.__executed = True
+        self.__descriptor = None
+        self.__cursor(True).execute(sql, parameters)
+        return self
+
+    @override
+    @_wrap_exceptions
     def executescript(self, sql: str) -> Self:
         self.__fetched = False
         self.__executed = True
-        x: Generator[CMySQLCursor, None, None] | None = self.__curr.execute(sql, multi = True)
+        self.__descriptor = None
+        x: Generator[CMySQLCursor, None, None] | None = self.__cursor(False).execute(sql, multi = True)
         if x is not None:
             for i in x:
                 pass
@@ -234,23 +294,18 @@ class _MySQLConnectionWrapper(SimpleConnection):
             raise MisplacedOperationError("rowcount shouldn't be used before execute, executemany, executescript or callproc")
         return self.__curr.rowcount
 
-    def __make_descriptor(self, k: tuple[str, int, None, None, None, None, bool | int, int, int]) -> ColumnDescriptor:
-        code: _InternalCode = _find_code(k[1])
-        return ColumnDescriptor.create(
-            name = k[0],
-            type_code = code.type,
-            column_type_name = code.name,
-            null_ok = NullStatus.YES if k[6] not in [False, 0] else NullStatus.NO
-        )
-
+    # Built once per statement, on the first call, and kept until the next statement.
     @property
     @override
     def description(self) -> Descriptor:
         if not self.__fetched:
             raise MisplacedOperationError("description shouldn't be used before a fetcher method")
-        if self.__curr.description is None:
-            return Descriptor([])
-        return Descriptor([self.__make_descriptor(k) for k in self.__curr.description])
+        d: Descriptor | None = self.__descriptor
+        if d is None:
+            raw: list[_RawColumn] | None = self.__curr.description
+            d = EMPTY_DESCRIPTOR if raw is None else _make_descriptor(tuple(raw))
+            self.__descriptor = d
+        return d
 
     @property
     @override
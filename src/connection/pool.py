@@ -0,0 +1,381 @@
+from typing import Any, Callable, override, Self, Sequence
+from dataclasses import dataclass
+from threading import Condition
+from time import monotonic
+from validator import dataclass_validate
+from .conn import BadDatabaseConfigException, Descriptor, PoolExhaustedException, RAW_DATA, SimpleConnection
+from .trans import ConnectionData, TransactedConnection
+
+
+_FLOAT_PROPERTIES: frozenset[str] = frozenset(["idle_timeout", "max_lifetime", "acquire_timeout"])
+
+
+@dataclass_validate
+@dataclass(frozen = True)
+class PoolConfig:
+    min_size: int = 0
+    max_size: int = 10
+    idle_timeout: float = 300.0
+    max_lifetime: float = 3600.0
+    acquire_timeout: float = 30.0
+    health_check: bool = True
+
+    def __post_type_validate__(self) -> None:
+        if self.min_size < 0 or self.max_size < 1 or self.min_size > self.max_size:
+            raise BadDatabaseConfigException(f"Bad pool sizes: min_size = {self.min_size}, max_size = {self.max_size}")
+        if self.idle_timeout <= 0 or self.max_lifetime <= 0 or self.acquire_timeout < 0:
+            raise BadDatabaseConfigException("Pool timeouts should be positive")
+
+    @staticmethod
+    def create(**props: Any) -> "PoolConfig":
+        try:
+            values: dict[str, Any] = {k: float(v) if k in _FLOAT_PROPERTIES and isinstance(v, int) else v for k, v in props.items()}
+            return PoolConfig(**values)
+        except TypeError:
+            raise BadDatabaseConfigException("Bad properties for the connection pool")
+
+
+@dataclass_validate
+@dataclass(frozen = True)
+class PoolStatistics:
+    borrowed: int
+    idle: int
+    created: int
+    discarded: int
+    waits: int
+    timeouts: int
+    total_wait_time: float
+    max_wait_time: float
+
+
+class _PoolEntry:
+
+    def __init__(self, conn: SimpleConnection, now: float) -> None:
+        self.conn: SimpleConnection = conn
+        self.created: float = now
+        self.last_used: float = now
+
+
+class ConnectionPool:
+
+    def __init__(self, factory: Callable[[], SimpleConnection], config: PoolConfig, clock: Callable[[], float] = monotonic) -> None:
+        self.__factory: Callable[[], SimpleConnection] = factory
+        self.__config: PoolConfig = config
+        self.__clock: Callable[[], float] = clock
+        self.__cond: Condition = Condition()
+        self.__idle: list[_PoolEntry] = []
+        self.__open: int = 0
+        self.__borrowed: int = 0
+        self.__created: int = 0
+        self.__discarded: int = 0
+        self.__waits: int = 0
+        self.__timeouts: int = 0
+        self.__total_wait_time: float = 0.0
+        self.__max_wait_time: float = 0.0
+        self.__closed: bool = False
+        self.__fill()
+
+    @property
+    def config(self) -> PoolConfig:
+        return self.__config
+
+    @property
+    def statistics(self) -> PoolStatistics:
+        with self.__cond:
+            return PoolStatistics(
+                self.__borrowed,
+                len(self.__idle),
+                self.__created,
+                self.__discarded,
+                self.__waits,
+                self.__timeouts,
+                self.__total_wait_time,
+                self.__max_wait_time
+            )
+
+    def __fill(self) -> None:
+        while True:
+            with self.__cond:
+                if self.__open >= self.__config.min_size:
+                    return
+                self.__open += 1
+            entry: _PoolEntry = self.__create()
+            with self.__cond:
+                self.__idle.append(entry)
+                self.__cond.notify()
+
+    def __create(self) -> _PoolEntry:
+        try:
+            conn: SimpleConnection = self.__factory()
+        except BaseException:
+            with self.__cond:
+                self.__open -= 1
+                self.__cond.notify()
+            raise
+        with self.__cond:
+            self.__created += 1
+        return _PoolEntry(conn, self.__clock())
+
+    def __discard(self, entry: _PoolEntry) -> None:
+        with self.__cond:
+            self.__open -= 1
+            self.__discarded += 1
+            self.__cond.notify()
+        try:
+            entry.conn.close()
+        except BaseException:
+            pass
+
+    def __expired(self, entry: _PoolEntry, now: float) -> bool:
+        return now - entry.created >= self.__config.max_lifetime
+
+    # Must be called with the lock held. Returns the entries that should be discarded.
+    def __reap(self, now: float) -> list[_PoolEntry]:
+        keep: list[_PoolEntry] = []
+        dead: list[_PoolEntry] = []
+        removable: int = self.__open - self.__config.min_size
+        for entry in self.__idle:
+            if self.__expired(entry, now) or (removable > 0 and now - entry.last_used >= self.__config.idle_timeout):
+                dead.append(entry)
+                removable -= 1
+            else:
+                keep.append(entry)
+        self.__idle = keep
+        return dead
+
+    def __healthy(self, entry: _PoolEntry) -> bool:
+        if not self.__config.health_check:
+            return True
+        try:
+            entry.conn.execute("SELECT 1").fetchall()
+            entry.conn.rollback()
+            return True
+        except BaseException:
+            return False
+
+    def __take(self) -> _PoolEntry | None:
+        start: float = self.__clock()
+        deadline: float = start + self.__config.acquire_timeout
+        waited: bool = False
+        dead: list[_PoolEntry] = []
+        try:
+            with self.__cond:
+                while True:
+                    if self.__closed:
+                        raise PoolExhaustedException("The connection pool is closed")
+                    dead.extend(self.__reap(self.__clock()))
+                    found: _PoolEntry | None = self.__idle.pop() if len(self.__idle) > 0 else None
+                    if found is not None or self.__open - len(dead) < self.__config.max_size:
+                        if found is None:
+                            self.__open += 1
+                        self.__borrowed += 1
+                        if waited:
+                            elapsed: float = self.__clock() - start
+                            self.__total_wait_time += elapsed
+                            self.__max_wait_time = max(self.__max_wait_time, elapsed)
+                        return found
+                    remaining: float = deadline - self.__clock()
+                    if remaining <= 0:
+                        self.__timeouts += 1
+                        raise PoolExhaustedException(f"No connection available after {self.__config.acquire_timeout} seconds")
+                    if not waited:
+                        self.__waits += 1
+                        waited = True
+                    self.__cond.wait(remaining)
+        finally:
+            for entry in dead:
+                self.__discard(entry)
+
+    def borrow(self) -> SimpleConnection:
+        while True:
+            entry: _PoolEntry | None = self.__take()
+            if entry is None:
+                try:
+                    entry = self.__create()
+                except BaseException:
+                    with self.__cond:
+                        self.__borrowed -= 1
+                    raise
+                return _PooledConnection(self, entry)
+            if self.__healthy(entry):
+                return _PooledConnection(self, entry)
+            with self.__cond:
+                self.__borrowed -= 1
+            self.__discard(entry)
+
+    def _give_back(self, entry: _PoolEntry) -> None:
+        now: float = self.__clock()
+        with self.__cond:
+            self.__borrowed -= 1
+            closed: bool = self.__closed
+        if closed or self.__expired(entry, now):
+            self.__discard(entry)
+            return
+        try:
+            entry.conn.rollback()
+        except BaseException:
+            self.__discard(entry)
+            return
+        entry.last_used = now
+        with self.__cond:
+            self.__idle.append(entry)
+            self.__cond.notify()
+
+    def close(self) -> None:
+        with self.__cond:
+            self.__closed = True
+            idle: list[_PoolEntry] = self.__idle
+            self.__idle = []
+            self.__cond.notify_all()
+        for entry in idle:
+            self.__discard(entry)
+
+
+class _PooledConnection(SimpleConnection):
+
+    def __init__(self, pool: ConnectionPool, entry: _PoolEntry) -> None:
+        self.__pool: ConnectionPool = pool
+        self.__entry: _PoolEntry | None = entry
+        self.__conn: SimpleConnection = entry.conn
+
+    @override
+    def close(self) -> None:
+        entry: _PoolEntry | None = self.__entry
+        if entry is not None:
+            self.__entry = None
+            self.__pool._give_back(entry)
+
+    @override
+    def commit(self) -> None:
+        self.__conn.commit()
+
+    @override
+    def rollback(self) -> None:
+        self.__conn.rollback()
+
+    @override
+    def fetchone(self) -> tuple[Any, ...] | None:
+        return self.__conn.fetchone()
+
+    @override
+    def fetchall(self) -> Sequence[tuple[Any, ...]]:
+        return self.__conn.fetchall()
+
+    @override
+    def fetchmany(self, size: int = 0) -> Sequence[tuple[Any, ...]]:
+        return self.__conn.fetchmany(size)
+
+    @override
+    def callproc(self, sql: str, parameters: Sequence[RAW_DATA] = ()) -> Self:
+        self.__conn.callproc(sql, parameters)
+        return self
+
+    @override
+    def execute(self, sql: str, parameters: Sequence[RAW_DATA] = ()) -> Self:
+        self.__conn.execute(sql, parameters)
+        return self
+
+    @override
+    def executemany(self, sql: str, parameters: Sequence[Sequence[RAW_DATA]] = ()) -> Self:
+        self.__conn.executemany(sql, parameters)
+        return self
+
+    @override
+    def execute_streaming(self, sql: str, parameters: Sequence[RAW_DATA] = ()) -> Self:
+        self.__conn.execute_streaming(sql, parameters)
+        return self
+
+    @override
+    def executescript(self, sql: str) -> Self:
+        self.__conn.executescript(sql)
+        return self
+
+    @property
+    @override
+    def rowcount(self) -> int:
+        return self.__conn.rowcount
+
+    @property
+    @override
+    def description(self) -> Descriptor:
+        return self.__conn.description
+
+    @property
+    @override
+    def lastrowid(self) -> int | None:
+        return self.__conn.lastrowid
+
+    @property
+    @override
+    def raw_connection(self) -> object:
+        return self.__conn.raw_connection
+
+    @property
+    @override
+    def raw_cursor(self) -> object:
+        return self.__conn.raw_cursor
+
+    @property
+    @override
+    def placeholder(self) -> str:
+        return self.__conn.placeholder
+
+    @property
+    @override
+    def database_type(self) -> str:
+        return self.__conn.database_type
+
+    @property
+    @override
+    def database_name(self) -> str:
+        return self.__conn.database_name
+
+
+class PooledTransactedConnection(TransactedConnection):
+
+    def __init__(self, pool: ConnectionPool, placeholder: str, database_type: str, database_name: str) -> None:
+        super().__init__(pool.borrow, placeholder, database_type, database_name)
+        self.__pool: ConnectionPool = pool
+
+    @property
+    def pool(self) -> ConnectionPool:
+        return self.__pool
+
+    @property
+    def statistics(self) -> PoolStatistics:
+        return self.__pool.statistics
+
+
+@dataclass_validate
+@dataclass(frozen = True)
+class PooledConnectionData(ConnectionData):
+    inner: ConnectionData
+    config: PoolConfig
+
+    @staticmethod
+    def create(*, inner: ConnectionData, config: PoolConfig) -> "PooledConnectionData":
+        return PooledConnectionData(inner, config)
+
+    @override
+    def make_connection(self) -> SimpleConnection:
+        return self.inner.make_connection()
+
+    @property
+    @override
+    def placeholder(self) -> str:
+        return self.inner.placeholder
+
+    @property
+    @override
+    def database_type(self) -> str:
+        return self.inner.database_type
+
+    @property
+    @override
+    def database_name(self) -> str:
+        return self.inner.database_name
+
+    @override
+    def connect(self) -> PooledTransactedConnection:
+        pool: ConnectionPool = ConnectionPool(self.inner.make_connection, self.config)
+        return PooledTransactedConnection(pool, self.placeholder, self.database_type, self.database_name)
@@ -0,0 +1,276 @@
+from typing import Any, Callable, Hashable, Mapping, override, ParamSpec
+from typing import TypeVar  # Delete when PEP 695 is ready.
+from abc import ABC, abstractmethod
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import wraps
+from inspect import isgeneratorfunction
+from threading import Lock
+from time import monotonic
+from weakref import WeakKeyDictionary
+from validator import dataclass_validate
+from .conn import BadDatabaseConfigException, SimpleConnection
+from .pool import ConnectionPool, PoolConfig
+from .trans import ConnectionData, TransactedConnection
+
+_P = ParamSpec("_P")
+_R = TypeVar("_R")  # Delete when PEP 695 is ready.
+
+# Above this many sessions, the ones that are no longer sticky are forgotten.
+_MAX_SESSIONS: int = 1024
+
+
+@dataclass_validate
+@dataclass(frozen = True)
+class RoutingStatistics:
+    reads_on_primary: int
+    reads_on_replicas: list[int]
+    outstanding: list[int]
+
+
+# Keeps when the current session last committed a write in the primary, somewhere other than the memory of the process.
+# With several processes serving the same clients (pre-fork), the next request of a session may land in another process, so the time
+# of the last write has to travel with the session (for instance, in its cookie) for the session to read its own writes.
+class WriteTracker(ABC):
+
+    # Records that the current session has just committed a write in the primary.
+    @abstractmethod
+    def wrote(self) -> None:
+        pass
+
+    # Tells whether the current session committed a write in the primary less than seconds ago.
+    @abstractmethod
+    def wrote_within(self, seconds: float) -> bool:
+        pass
+
+
+class _Node:
+
+    def __init__(self, factory: Callable[[], SimpleConnection]) -> None:
+        self.factory: Callable[[], SimpleConnection] = factory
+        self.outstanding: int = 0
+        self.reads: int = 0
+
+
+# The replica chosen for the read-only transaction running in the current context, and when the current context last committed a write,
+# per connection. As with the transactions, there is a single ContextVar for all the connections and the mappings are replaced, never
+# changed in place. The times of the last writes are kept after the transactions end, so their keys are weak.
+_routes: ContextVar[Mapping["RoutingTransactedConnection", _Node]] = ContextVar("routes", default = {})
+_last_writes: ContextVar[Mapping["RoutingTransactedConnection", float]] = ContextVar("last_writes", default = {})
+
+
+# Sends the read-only transactions (the operations marked with read_only) to the replicas, and everything else to the primary.
+# - Each read-only transaction goes to the replica with the fewest read-only transactions running on it at the moment.
+# - Replicas lag behind the primary. So, for stickiness seconds after a session commits something in the primary, its reads also go
+#   to the primary, and it always reads what it wrote.
+# - The session is given by session_key. When it returns None (the default), the session is the current context: the thread, or the
+#   asyncio task.
+# - That is kept in the memory of the process, so a session whose next request lands in another process (pre-fork) may not read
+#   what it wrote. A write_tracker, when given, keeps it instead, and session_key is not used.
+# - Transactions nested into an active one stay where the outer one is, and plain "with" blocks go to the primary.
+class RoutingTransactedConnection(TransactedConnection):
+
+    def __init__(
+            self,
+            primary: Callable[[], SimpleConnection],
+            replicas: list[Callable[[], SimpleConnection]],
+            stickiness: float,
+            pools: list[ConnectionPool],
+            placeholder: str,
+            database_type: str,
+            database_name: str
+    ) -> None:
+        super().__init__(self.__activate, placeholder, database_type, database_name)
+        self.__primary: _Node = _Node(primary)
+        self.__replicas: list[_Node] = [_Node(r) for r in replicas]
+        self.__stickiness: float = stickiness
+        self.__pools: list[ConnectionPool] = pools
+        self.__lock: Lock = Lock()
+        self.__writes: dict[Hashable, float] = {}
+        self.__session_key: Callable[[], Hashable | None] = lambda: None
+        self.__write_tracker: WriteTracker | None = None
+
+    @property
+    def session_key(self) -> Callable[[], Hashable | None]:
+        return self.__session_key
+
+    @session_key.setter
+    def session_key(self, key: Callable[[], Hashable | None]) -> None:
+        self.__session_key = key
+
+    @property
+    def write_tracker(self) -> WriteTracker | None:
+        return self.__write_tracker
+
+    @write_tracker.setter
+    def write_tracker(self, tracker: WriteTracker | None) -> None:
+        self.__write_tracker = tracker
+
+    # The pools of the primary and of the replicas, first to last. Empty if there is no pooling.
+    @property
+    def pools(self) -> list[ConnectionPool]:
+        return self.__pools
+
+    @property
+    def statistics(self) -> RoutingStatistics:
+        with self.__lock:
+            return RoutingStatistics(self.__primary.reads, [r.reads for r in self.__replicas], [r.outstanding for r in self.__replicas])
+
+    @property
+    def __route(self) -> _Node | None:
+        return _routes.get().get(self)
+
+    def __set_route(self, node: _Node | None) -> None:
+        routes: dict[RoutingTransactedConnection, _Node] = dict(_routes.get())
+        if node is None:
+            routes.pop(self, None)
+        else:
+            routes[self] = node
+        _routes.set(routes)
+
+    def __activate(self) -> SimpleConnection:
+        node: _Node | None = self.__route
+        return (self.__primary if node is None else node).factory()
+
+    def __wrote_recently(self) -> bool:
+        tracker: WriteTracker | None = self.__write_tracker
+        if tracker is not None:
+            return tracker.wrote_within(self.__stickiness)
+        key: Hashable | None = self.__session_key()
+        if key is None:
+            last: float | None = _last_writes.get().get(self)
+        else:
+            with self.__lock:
+                last = self.__writes.get(key)
+        return last is not None and monotonic() - last < self.__stickiness
+
+    def __pick(self) -> _Node:
+        primary: bool = self.__wrote_recently()
+        with self.__lock:
+            node: _Node = self.__primary if primary else min(self.__replicas, key = lambda r: (r.outstanding, r.reads))
+            node.outstanding += 1
+            node.reads += 1
+            return node
+
+    def __done(self, node: _Node, before: _Node | None) -> None:
+        with self.__lock:
+            node.outstanding -= 1
+        self.__set_route(before)
+
+    def __wrote(self) -> None:
+        tracker: WriteTracker | None = self.__write_tracker
+        if tracker is not None:
+            tracker.wrote()
+            return
+        key: Hashable | None = self.__session_key()
+        now: float = monotonic()
+        if key is None:
+            last_writes: WeakKeyDictionary[RoutingTransactedConnection, float] = WeakKeyDictionary(_last_writes.get())
+            last_writes[self] = now
+            _last_writes.set(last_writes)
+            return
+        with self.__lock:
+            self.__writes[key] = now
+            if len(self.__writes) > _MAX_SESSIONS:
+                self.__writes = {k: t for k, t in self.__writes.items() if now - t < self.__stickiness}
+
+    # def transact_read_only[**P, R](self, operation: Callable[P, R]) -> Callable[P, R]: # PEP 695
+    @override
+    def transact_read_only(self, operation: Callable[_P, _R]) -> Callable[_P, _R]:
+        transacted: Callable[_P, _R] = super().transact_read_only(operation)
+
+        if isgeneratorfunction(operation):
+            @wraps(operation)
+            def routed_generator(*args: _P.args, **kwargs: _P.kwargs) -> Any:
+                if self.is_active:
+                    yield from transacted(*args, **kwargs)  # type: ignore[misc]
+                    return
+                node: _Node = self.__pick()
+                before: _Node | None = self.__route
+                self.__set_route(node)
+                try:
+                    yield from transacted(*args, **kwargs)  # type: ignore[misc]
+                finally:
+                    self.__done(node, before)
+            return routed_generator
+
+        @wraps(operation)
+        def routed_operation(*args: _P.args, **kwargs: _P.kwargs) -> Any:
+            if self.is_active:
+                return transacted(*args, **kwargs)
+            node: _Node = self.__pick()
+            before: _Node | None = self.__route
+            self.__set_route(node)
+            try:
+                return transacted(*args, **kwargs)
+            finally:
+                self.__done(node, before)
+        return routed_operation
+
+    @override
+    def commit(self) -> None:
+        super().commit()
+        if self.__route is None:
+            self.__wrote()
+
+
+@dataclass_validate
+@dataclass(frozen = True)
+class RoutingConnectionData(ConnectionData):
+    primary: ConnectionData
+    replicas: list[ConnectionData]
+    stickiness: float = 5.0
+    pool: PoolConfig | None = None
+
+    def __post_type_validate__(self) -> None:
+        if len(self.replicas) == 0:
+            raise BadDatabaseConfigException("At least one replica is needed")
+        if self.stickiness < 0:
+            raise BadDatabaseConfigException("stickiness can't be negative")
+        for r in self.replicas:
+            if r.database_type != self.primary.database_type or r.placeholder != self.primary.placeholder:
+                raise BadDatabaseConfigException("The replicas should be of the same type of database of the primary")
+
+    @staticmethod
+    def create(
+            *,
+            primary: ConnectionData,
+            replicas: list[ConnectionData],
+            stickiness: float | int = 5.0,
+            pool: PoolConfig | None = None
+    ) -> "RoutingConnectionData":
+        return RoutingConnectionData(primary, replicas, float(stickiness), pool)
+
+    @override
+    def make_connection(self) -> SimpleConnection:
+        return self.primary.make_connection()
+
+    @property
+    @override
+    def placeholder(self) -> str:
+        return self.primary.placeholder
+
+    @property
+    @override
+    def database_type(self) -> str:
+        return self.primary.database_type
+
+    @property
+    @override
+    def database_name(self) -> str:
+        return self.primary.database_name
+
+    @override
+    def connect(self) -> RoutingTransactedConnection:
+        nodes: list[ConnectionData] = [self.primary] + self.replicas
+        pools: list[ConnectionPool] = [] if self.pool is None else [ConnectionPool(n.make_connection, self.pool) for n in nodes]
+        factories: list[Callable[[], SimpleConnection]] = [n.make_connection for n in nodes] if self.pool is None else [p.borrow for p in pools]
+        return RoutingTransactedConnection(
+            factories[0],
+            factories[1:],
+            self.stickiness,
+            pools,
+            self.placeholder,
+            self.database_type,
+            self.database_name
+        )
@@ -1,45 +1,201 @@
 from typing import Any, Callable, cast, override, Self, Sequence
 from typing import TypeVar  # Delete when PEP 695 is ready.
-from decorators.for_all import for_all_methods
-from functools import wraps
+from functools import lru_cache, wraps
 from .conn import (
-    BadDatabaseConfigException, ColumnDescriptor, Descriptor,
+    BadDatabaseConfigException, ColumnDescriptor, Descriptor, EMPTY_DESCRIPTOR,
     IntegrityViolationException, RAW_DATA, SimpleConnection, MisplacedOperationError
 )
 from .trans import ConnectionData, TransactedConnection
+from .pool import ConnectionPool, PoolConfig
+from .groupcommit import GroupCommitConfig, GroupCommitConnection
 from sqlite3 import Connection, connect as db_connect, Cursor, IntegrityError
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
+from urllib.parse import quote
 from validator import dataclass_validate
 
 
+_JOURNAL_MODES: frozenset[str] = frozenset(["DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"])
+_SYNCHRONOUS: frozenset[str] = frozenset(["OFF", "NORMAL", "FULL", "EXTRA"])
+_TEMP_STORES: frozenset[str] = frozenset(["DEFAULT", "FILE", "MEMORY"])
+
+# Profiles are sets of defaults for the options that were not given explicitly.
+# "server" is meant for a database shared by the threads or processes of a server:
+# - With WAL, readers don't block the writer and the writer doesn't block readers.
+# - synchronous = NORMAL is safe with WAL. A power loss may lose the last commits, but it never corrupts the database.
+# - The schema and the hot pages stay in memory (mmap and a 64 MiB cache), and temporary tables never touch the disk.
+# - Writers wait for each other for up to 5 seconds instead of failing with "database is locked".
+_PROFILES: dict[str, dict[str, Any]] = {
+    "default": {},
+    "server": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": 256 * 1024 * 1024,
+        "cache_size": -64 * 1024,
+        "busy_timeout": 5000,
+        "temp_store": "MEMORY",
+        "cached_statements": 256
+    }
+}
+
+
 @dataclass_validate
 @dataclass(frozen = True)
 class SqliteConnectionData(ConnectionData):
     file_name: str
+    journal_mode: str | None = None
+    synchronous: str | None = None
+    mmap_size: int | None = None
+    cache_size: int | None = None
+    busy_timeout: int | None = None
+    temp_store: str | None = None
+    cached_statements: int = 128
+    uri: bool = False
+    read_only: bool = False
+    group_commit: bool = False
+    group_commit_size: int = 32
+    group_commit_delay: int = 0
+
+    def __post_type_validate__(self) -> None:
+        if self.journal_mode is not None and self.journal_mode not in _JOURNAL_MODES:
+            raise BadDatabaseConfigException(f"Bad journal_mode {self.journal_mode}")
+        if self.synchronous is not None and self.synchronous not in _SYNCHRONOUS:
+            raise BadDatabaseConfigException(f"Bad synchronous {self.synchronous}")
+        if self.temp_store is not None and self.temp_store not in _TEMP_STORES:
+            raise BadDatabaseConfigException(f"Bad temp_store {self.temp_store}")
+        for name, value in [("mmap_size", self.mmap_size), ("busy_timeout", self.busy_timeout), ("cached_statements", self.cached_statements)]:
+            if value is not None and value < 0:
+                raise BadDatabaseConfigException(f"{name} can't be negative")
+        if self.group_commit and self.read_only:
+            raise BadDatabaseConfigException("A read-only database can't have group commit")
 
     @staticmethod
     def create(
             *,
             file_name: str,
+            profile: str = "default",
+            journal_mode: str | None = None,
+            synchronous: str | None = None,
+            mmap_size: int | None = None,
+            cache_size: int | None = None,
+            busy_timeout: int | None = None,
+            temp_store: str | None = None,
+            cached_statements: int | None = None,
+            uri: bool = False,
+            read_only: bool = False,
+            group_commit: bool = False,
+            group_commit_size: int = 32,
+            group_commit_delay: int = 0
     ) -> "SqliteConnectionData":
-        return SqliteConnectionData(file_name)
+        if profile not in _PROFILES:
+            raise BadDatabaseConfigException(f"Unknown SQLite profile {profile}")
+        given: dict[str, Any] = {
+            "journal_mode": journal_mode,
+            "synchronous": synchronous,
+            "mmap_size": mmap_size,
+            "cache_size": cache_size,
+            "busy_timeout": busy_timeout,
+            "temp_store": temp_store,
+            "cached_statements": cached_statements
+        }
+        options: dict[str, Any] = _PROFILES[profile] | {k: v for k, v in given.items() if v is not None}
+        return SqliteConnectionData(
+            file_name,
+            uri = uri,
+            read_only = read_only,
+            group_commit = group_commit,
+            group_commit_size = group_commit_size,
+            group_commit_delay = group_commit_delay,
+            **options
+        )
+
+    # Applied once for each physical connection, right after it is opened.
+    @property
+    def pragmas(self) -> list[str]:
+        p: list[str] = ["PRAGMA foreign_keys = ON;"]
+        if self.busy_timeout is not None:
+            p.append(f"PRAGMA busy_timeout = {self.busy_timeout};")
+        if self.journal_mode is not None and not self.read_only:
+            p.append(f"PRAGMA journal_mode = {self.journal_mode};")
+        if self.synchronous is not None:
+            p.append(f"PRAGMA synchronous = {self.synchronous};")
+        if self.mmap_size is not None:
+            p.append(f"PRAGMA mmap_size = {self.mmap_size};")
+        if self.cache_size is not None:
+            p.append(f"PRAGMA cache_size = {self.cache_size};")
+        if self.temp_store is not None:
+            p.append(f"PRAGMA temp_store = {self.temp_store};")
+        return p
+
+    def __target(self) -> str:
+        if not self.read_only:
+            return self.file_name
+        if not self.uri:
+            return f"file:{quote(self.file_name)}?mode=ro"
+        return f"{self.file_name}{'&' if '?' in self.file_name else '?'}mode=ro"
+
+    @override
+    def make_connection(self) -> SimpleConnection:
+        try:
+            # The connection may be handed to other threads by a pool, but it is never used by two threads at once.
+            raw: Connection = db_connect(
+                self.__target(),
+                check_same_thread = False,
+                cached_statements = self.cached_statements,
+                uri = self.uri or self.read_only
+            )
+            return _Sqlite3ConnectionWrapper(raw, self.file_name, self.pragmas)
+        except BaseException as x:
+            raise BadDatabaseConfigException(x)
+
+    @property
+    @override
+    def placeholder(self) -> str:
+        return "?"
 
+    @property
+    @override
+    def database_type(self) -> str:
+        return "Sqlite"
+
+    @property
+    @override
+    def database_name(self) -> str:
+        return self.file_name
+
+    @override
     def connect(self) -> TransactedConnection:
-        def make_connection() -> _Sqlite3ConnectionWrapper:
-            try:
-                return _Sqlite3ConnectionWrapper(db_connect(self.file_name), self.file_name)
-            except BaseException as x:
-                raise BadDatabaseConfigException(x)
-        return TransactedConnection(make_connection, "?", "Sqlite", self.file_name)
+        if self.group_commit:
+            return self.connect_group_commit(PoolConfig())
+        return super().connect()
+
+    # The writes go to a single writer connection, with group commit (see GroupCommitConnection).
+    # The reads go to a pool of read-only connections, configured by readers.
+    def connect_group_commit(self, readers: PoolConfig) -> GroupCommitConnection:
+        reader: SqliteConnectionData = replace(self, read_only = True, group_commit = False)
+        writer: SqliteConnectionData = replace(self, group_commit = False)
+        config: GroupCommitConfig = GroupCommitConfig(self.group_commit_size, self.group_commit_delay / 1000)
+        pool: ConnectionPool = ConnectionPool(reader.make_connection, readers)
+        return GroupCommitConnection(pool, writer.make_connection, config, self.placeholder, self.database_type, self.database_name)
 
 
 def connect(file: str) -> TransactedConnection:
     return SqliteConnectionData.create(file_name = file).connect()
 
 
+_RawColumn = tuple[str, None, None, None, None, None, None]
+
+
+# Equal cursor descriptions always give equal descriptors, and those are immutable, so statements that select the same columns share one.
+@lru_cache(maxsize = 256)
+def _make_descriptor(raw: tuple[_RawColumn, ...]) -> Descriptor:
+    return Descriptor([ColumnDescriptor.create(name = k[0]) for k in raw])
+
+
 _TRANS = TypeVar("_TRANS", bound = Callable[..., Any])  # Delete when PEP 695 is ready.
 
 
+# Only statements and commits (because of deferred constraints) can violate constraints, so only those methods are wrapped.
+# The fetchers and the properties, called once per row, are left direct.
 # def _wrap_exceptions[T: Callable[..., Any]](operation: T) -> T: # PEP 695
 def _wrap_exceptions(operation: _TRANS) -> _TRANS:
 
@@ -53,18 +209,20 @@ def _wrap_exceptions(operation: _TRANS) -> _TRANS:
     return cast(_TRANS, inner)
 
 
-@for_all_methods(_wrap_exceptions, even_privates = False)
 class _Sqlite3ConnectionWrapper(SimpleConnection):
 
-    def __init__(self, conn: Connection, file_name: str) -> None:
+    def __init__(self, conn: Connection, file_name: str, pragmas: Sequence[str] = ("PRAGMA foreign_keys = ON;", )) -> None:
         self.__conn: Connection = conn
         self.__curr: Cursor = conn.cursor()
         self.__file_name: str = file_name
-        self.execute("PRAGMA foreign_keys = ON;")
+        self.__descriptor: Descriptor | None = None
+        for pragma in pragmas:
+            self.execute(pragma)
         self.__fetched: bool = False
         self.__executed: bool = False
 
     @override
+    @_wrap_exceptions
     def commit(self) -> None:
         self.__conn.commit()
 
@@ -78,6 +236,7 @@ class _Sqlite3ConnectionWrapper(SimpleConnection):
         self.__conn.close()
         self.__fetched = False
         self.__executed = False
+        self.__descriptor = None
 
     @override
     def fetchone(self) -> tuple[Any, ...] | None:
@@ -99,23 +258,29 @@ class _Sqlite3ConnectionWrapper(SimpleConnection):
         raise NotImplementedError("Sorry. The callproc method was not implemented yet.")
 
     @override
+    @_wrap_exceptions
     def execute(self, sql: str, parameters: Sequence[RAW_DATA] = ()) -> Self:
         self.__fetched = False
         self.__executed = True
+        self.__descriptor = None
         self.__curr.execute(sql, parameters)
         return self
 
     @override
+    @_wrap_exceptions
     def executemany(self, sql: str, parameters: Sequence[Sequence[RAW_DATA]] = ()) -> Self:
         self.__fetched = False
         self.__executed = True
+        self.__descriptor = None
         self.__curr.executemany(sql, parameters)
         return self
 
     @override
+    @_wrap_exceptions
     def executescript(self, sql: str) -> Self:
         self.__fetched = False
         self.__executed = True
+        self.__descriptor = None
         self.__curr.executescript(sql)
         return self
 
@@ -126,17 +291,18 @@ class _Sqlite3ConnectionWrapper(SimpleConnection):
             raise MisplacedOperationError("rowcount shouldn't be used before execute, executemany, executescript or callproc")
         return self.__curr.rowcount
 
-    def __make_descriptor(self, k: tuple[str, None, None, None, None, None, None]) -> ColumnDescriptor:
-        return ColumnDescriptor.create(name = k[0])
-
+    # Built once per statement, on the first call, and kept until the next statement.
     @property
     @override
     def description(self) -> Descriptor:
         if not self.__fetched:
             raise MisplacedOperationError("description shouldn't be used before a fetcher method")
-        if self.__curr.description is None:
-            return Descriptor([])
-        return Descriptor([self.__make_descriptor(k) for k in self.__curr.description])
+        d: Descriptor | None = self.__descriptor
+        if d is None:
+            raw: tuple[_RawColumn, ...] | None = self.__curr.description
+            d = EMPTY_DESCRIPTOR if raw is None else _make_descriptor(raw)
+            self.__descriptor = d
+        return d
 
     @property
     @override
@@ -1,10 +1,11 @@
-from typing import Any, Callable, Literal, override, ParamSpec, Self, Sequence
+from typing import Any, Callable, final, Literal, Mapping, override, ParamSpec, Self, Sequence, TypeAlias
 from typing import TypeVar  # Delete when PEP 695 is ready.
 from abc import ABC, abstractmethod
+from contextvars import ContextVar
 from .conn import Descriptor, RAW_DATA, SimpleConnection, TransactionNotActiveException
 from types import TracebackType
 from functools import wraps
-from threadlocal import ThreadLocal
+from inspect import isgeneratorfunction
 
 _T = TypeVar("_T")  # Delete when PEP 695 is ready.
 _TRANS = TypeVar("_TRANS", bound = Callable[..., Any])  # Delete when PEP 695 is ready.
@@ -12,48 +13,130 @@ _P = ParamSpec("_P")
 _R = TypeVar("_R")
 
 
+@final
+class _TransactionScope:
+
+    def __init__(self, conn: SimpleConnection) -> None:
+        self.conn: SimpleConnection = conn
+        self.count: int = 0
+        self.values: dict[Any, Any] = {}
+        self.after_commit: list[Callable[[], None]] = []
+
+
+# The transactions active in the current context (the thread, or the asyncio task), one per connection. There is a single ContextVar
+# for all the connections, so creating connections does not create ContextVars, which are never freed. The mapping is never changed
+# in place, but replaced, so the contexts copied from this one do not see the changes made here, and vice-versa. A connection is
+# removed from it as soon as its transaction ends.
+_Scopes: TypeAlias = "Mapping[TransactedConnection, _TransactionScope]"
+_scopes: ContextVar[_Scopes] = ContextVar("transaction_scopes", default = {})
+
+
+# Marks an operation that only reads. Connections that send reads and writes to different places (such as GroupCommitConnection)
+# run it in a read-only transaction. For the others, it makes no difference.
+# def read_only[T: Callable[..., Any]](operation: T) -> T: # PEP 695
+def read_only(operation: _TRANS) -> _TRANS:
+    setattr(operation, "__read_only__", True)
+    return operation
+
+
+def is_read_only(operation: Callable[..., Any]) -> bool:
+    return getattr(operation, "__read_only__", False) is True
+
+
+# The active transaction is kept in a ContextVar, so it belongs to the thread that started it, or to the asyncio task.
+# The whole state of the transaction is a single object, found with a single lookup, and it is dropped when the
+# outermost transaction ends.
 class TransactedConnection(SimpleConnection):
 
     def __init__(self, activate: Callable[[], SimpleConnection], placeholder: str, database_type: str, database_name: str) -> None:
         self.__activate: Callable[[], SimpleConnection] = activate
-        self.__conn: ThreadLocal[SimpleConnection | None] = ThreadLocal(None)
-        self.__count: ThreadLocal[int] = ThreadLocal(0)
         self.__placeholder: str = placeholder
         self.__database_type: str = database_type
         self.__database_name: str = database_name
 
+    @property
+    def __scope(self) -> _TransactionScope | None:
+        return _scopes.get().get(self)
+
+    def __set_scope(self, s: _TransactionScope | None) -> None:
+        scopes: dict[TransactedConnection, _TransactionScope] = dict(_scopes.get())
+        if s is None:
+            scopes.pop(self, None)
+        else:
+            scopes[self] = s
+        _scopes.set(scopes)
+
     @property
     def reenter_count(self) -> int:
-        return self.__count.value
+        s: _TransactionScope | None = self.__scope
+        return 0 if s is None else s.count
 
     @property
     def is_active(self) -> bool:
-        return self.reenter_count > 0
+        return self.__scope is not None
+
+    # Values cached while the outermost transaction is active. They are discarded when that transaction ends.
+    @property
+    def scope(self) -> dict[Any, Any]:
+        return self.__active.values
+
+    # Runs the callback right after the outermost transaction is committed, outside of it. If it is rolled back, the callback is discarded.
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        self.__active.after_commit.append(callback)
+
+    @property
+    def __active(self) -> _TransactionScope:
+        s: _TransactionScope | None = self.__scope
+        if s is None:
+            raise TransactionNotActiveException()
+        return s
 
     @property
     def __wrapped_or_none(self) -> SimpleConnection | None:
-        return self.__conn.value
+        s: _TransactionScope | None = self.__scope
+        return None if s is None else s.conn
 
     @property
     def __wrapped(self) -> SimpleConnection:
-        x: SimpleConnection | None = self.__wrapped_or_none
-        if x is None:
+        s: _TransactionScope | None = self.__scope
+        if s is None:
             raise TransactionNotActiveException()
-        return x
+        return s.conn
 
     def __enter__(self) -> Self:
-        if self.__count.value == 0:
-            self.__conn.value = self.__activate()
-        self.__count.value += 1
+        s: _TransactionScope | None = self.__scope
+        if s is None:
+            s = _TransactionScope(self.__activate())
+            self.__set_scope(s)
+        s.count += 1
         return self
 
     @override
     def close(self) -> None:
-        if self.__count.value > 0:
-            self.__count.value -= 1
-            if self.__count.value == 0:
-                self.__wrapped.close()
-                self.__conn.value = None
+        s: _TransactionScope | None = self.__scope
+        if s is None:
+            return
+        s.count -= 1
+        if s.count == 0:
+            self.__set_scope(None)
+            s.conn.close()
+
+    # Threads and executor tasks run in contexts of their own, where the transaction of the caller is not active.
+    # The operation returned by propagate runs inside the transaction that is active now, wherever it is called.
+    # The connection is still not thread-safe, so the caller must not use the transaction until the propagated operation is done.
+    # def propagate[**P, R](self, operation: Callable[P, R]) -> Callable[P, R]: # PEP 695
+    def propagate(self, operation: Callable[_P, _R]) -> Callable[_P, _R]:
+        s: _TransactionScope = self.__active
+
+        @wraps(operation)
+        def propagated(*args: _P.args, **kwargs: _P.kwargs) -> _R:
+            before: _TransactionScope | None = self.__scope
+            self.__set_scope(s)
+            try:
+                return operation(*args, **kwargs)
+            finally:
+                self.__set_scope(before)
+        return propagated
 
     def __exit__(
             self,
@@ -61,16 +144,56 @@ class TransactedConnection(SimpleConnection):
             exc_val : BaseException       | None,  # noqa: E203,E221
             exc_tb  : TracebackType       | None   # noqa: E203,E221
     ) -> Literal[False]:
-        if self.__count.value == 1:
-            if exc_type is None:
-                self.commit()
-            else:
-                self.rollback()
-        self.close()
+        # The transaction is closed (and its connection released) even if the commit or the rollback fails.
+        # The after_commit callbacks only run if the commit succeeded.
+        callbacks: list[Callable[[], None]] = []
+        try:
+            if self.reenter_count == 1:
+                if exc_type is None:
+                    self.commit()
+                    callbacks = self.__active.after_commit
+                else:
+                    self.rollback()
+        finally:
+            self.close()
+        for c in callbacks:
+            c()
         return False
 
-    # def transact[T: Callable[..., Any]](self, operation: T) -> T: # PEP 695
+    # Runs the operation inside a transaction that is managed elsewhere, on the given connection.
+    # Transactions opened by the operation are nested into that one, so nothing is committed or rolled back here.
+    # The after_commit callbacks are returned with the result, to be run by whoever commits that transaction.
+    # def _join[R](self, conn: SimpleConnection, operation: Callable[[], R]) -> tuple[R, list[Callable[[], None]]]: # PEP 695
+    def _join(self, conn: SimpleConnection, operation: Callable[[], _R]) -> tuple[_R, list[Callable[[], None]]]:
+        s: _TransactionScope = _TransactionScope(conn)
+        s.count = 1
+        before: _TransactionScope | None = self.__scope
+        self.__set_scope(s)
+        try:
+            return operation(), s.after_commit
+        finally:
+            self.__set_scope(before)
+
+    # def transact[**P, R](self, operation: Callable[P, R]) -> Callable[P, R]: # PEP 695
     def transact(self, operation: Callable[_P, _R]) -> Callable[_P, _R]:
+        if is_read_only(operation):
+            return self.transact_read_only(operation)
+        return self.__transacted(operation)
+
+    # def transact_read_only[**P, R](self, operation: Callable[P, R]) -> Callable[P, R]: # PEP 695
+    def transact_read_only(self, operation: Callable[_P, _R]) -> Callable[_P, _R]:
+        return self.__transacted(operation)
+
+    # def __transacted[**P, R](self, operation: Callable[P, R]) -> Callable[P, R]: # PEP 695
+    def __transacted(self, operation: Callable[_P, _R]) -> Callable[_P, _R]:
+        # Generators only run when iterated, so the transaction must be kept open during the iteration instead of during the call.
+        if isgeneratorfunction(operation):
+            @wraps(operation)
+            def transacted_generator(*args: _P.args, **kwargs: _P.kwargs) -> Any:
+                with self:
+                    yield from operation(*args, **kwargs)
+            return transacted_generator
+
         @wraps(operation)
         def transacted_operation(*args: _P.args, **kwargs: _P.kwargs) -> Any:
             with self:
@@ -115,6 +238,11 @@ class TransactedConnection(SimpleConnection):
         self.__wrapped.executemany(sql, parameters)
         return self
 
+    @override
+    def execute_streaming(self, sql: str, parameters: Sequence[RAW_DATA] = ()) -> Self:
+        self.__wrapped.execute_streaming(sql, parameters)
+        return self
+
     @override
     def executescript(self, sql: str) -> Self:
         self.__wrapped.executescript(sql)
@@ -175,6 +303,25 @@ class TransactedConnection(SimpleConnection):
 
 
 class ConnectionData(ABC):
+
     @abstractmethod
-    def connect(self) -> TransactedConnection:
+    def make_connection(self) -> SimpleConnection:
+        pass
+
+    @property
+    @abstractmethod
+    def placeholder(self) -> str:
+        pass
+
+    @property
+    @abstractmethod
+    def database_type(self) -> str:
         pass
+
+    @property
+    @abstractmethod
+    def database_name(self) -> str:
+        pass
+
+    def connect(self) -> TransactedConnection:
+        return TransactedConnection(self.make_connection, self.placeholder, self.database_type, self.database_name)
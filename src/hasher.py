@@ -1,18 +1,173 @@
+from typing import override
+from abc import ABC, abstractmethod
+from base64 import urlsafe_b64encode
+from dataclasses import dataclass
+from hmac import compare_digest
+from threading import BoundedSemaphore
+from validator import dataclass_validate
 import hashlib
+import os
+import secrets
+import string
+
+# Todos os hashes têm 144 caracteres, que é o tamanho que as tabelas exigem.
+_TAMANHO: int = 144
+_TAMANHO_HASH: int = 43  # 32 bytes em base64 sem o preenchimento.
+_SAL_MINIMO: int = 16
+_ALFABETO_SAL: str = string.ascii_letters + string.digits + "-_"
 
 
 def string_random(size: int) -> str:
-    import random
-    import string
     letters: str = string.ascii_letters
-    return "".join(random.choice(letters) for i in range(size))
+    return "".join(secrets.choice(letters) for i in range(size))
+
+
+class AlgoritmoHash(ABC):
+
+    @property
+    @abstractmethod
+    def nome(self) -> str:
+        pass
+
+    @property
+    @abstractmethod
+    def parametros(self) -> str:
+        pass
+
+    @abstractmethod
+    def derivar(self, senha: bytes, sal: bytes) -> bytes:
+        pass
+
+    @property
+    def cabecalho(self) -> str:
+        return f"${self.nome}${self.parametros}$"
+
+
+@dataclass_validate
+@dataclass(frozen = True)
+class Scrypt(AlgoritmoHash):
+    n: int = 2 ** 14
+    r: int = 8
+    p: int = 1
+
+    def __post_type_validate__(self) -> None:
+        if self.n < 2 or self.n & (self.n - 1) != 0 or self.r < 1 or self.p < 1:
+            raise ValueError(f"Parâmetros inválidos para o scrypt: {self}")
+
+    @property
+    @override
+    def nome(self) -> str:
+        return "scrypt"
+
+    @property
+    @override
+    def parametros(self) -> str:
+        return f"n={self.n},r={self.r},p={self.p}"
+
+    @override
+    def derivar(self, senha: bytes, sal: bytes) -> bytes:
+        return hashlib.scrypt(senha, salt = sal, n = self.n, r = self.r, p = self.p, maxmem = 256 * self.n * self.r + (1 << 20), dklen = 32)
+
+    @staticmethod
+    def _ler(p: dict[str, str]) -> "Scrypt":
+        return Scrypt(int(p["n"]), int(p["r"]), int(p["p"]))
+
+
+@dataclass_validate
+@dataclass(frozen = True)
+class Pbkdf2(AlgoritmoHash):
+    iteracoes: int = 600_000
+    digest: str = "sha256"
+
+    def __post_type_validate__(self) -> None:
+        if self.iteracoes < 1 or self.digest not in hashlib.algorithms_guaranteed:
+            raise ValueError(f"Parâmetros inválidos para o PBKDF2: {self}")
+
+    @property
+    @override
+    def nome(self) -> str:
+        return f"pbkdf2-{self.digest}"
+
+    @property
+    @override
+    def parametros(self) -> str:
+        return f"i={self.iteracoes}"
 
+    @override
+    def derivar(self, senha: bytes, sal: bytes) -> bytes:
+        return hashlib.pbkdf2_hmac(self.digest, senha, sal, self.iteracoes, dklen = 32)
 
+    @staticmethod
+    def _ler(digest: str, p: dict[str, str]) -> "Pbkdf2":
+        return Pbkdf2(int(p["i"]), digest)
+
+
+def _ler_algoritmo(nome: str, parametros: str) -> AlgoritmoHash:
+    p: dict[str, str] = dict(x.split("=", 1) for x in parametros.split(","))
+    if nome == "scrypt":
+        return Scrypt._ler(p)
+    if nome.startswith("pbkdf2-"):
+        return Pbkdf2._ler(nome[7:], p)
+    raise ValueError(f"Algoritmo de hash desconhecido: {nome}")
+
+
+# Os hashes são calculados fora do GIL pelo hashlib, então várias threads podem calculá-los ao mesmo tempo sem atrasar as demais.
+# Mas cada um gasta bastante CPU (e, no caso do scrypt, memória), então o número de hashes calculados ao mesmo tempo é limitado.
+_algoritmo: AlgoritmoHash = Scrypt()
+_limite: BoundedSemaphore = BoundedSemaphore(os.cpu_count() or 1)
+
+
+def configurar_hash(algoritmo: AlgoritmoHash, paralelismo: int | None = None) -> None:
+    global _algoritmo, _limite
+    _algoritmo = algoritmo
+    if paralelismo is not None:
+        if paralelismo < 1:
+            raise ValueError(f"Paralelismo inválido: {paralelismo}")
+        _limite = BoundedSemaphore(paralelismo)
+
+
+def _calcular(algoritmo: AlgoritmoHash, sal: str, senha: str) -> str:
+    with _limite:
+        chave: bytes = algoritmo.derivar(senha.encode("utf-8"), sal.encode("ascii"))
+    return urlsafe_b64encode(chave).decode("ascii").rstrip("=")
+
+
+def _montar(algoritmo: AlgoritmoHash, sal: str, senha: str) -> str:
+    return f"{algoritmo.cabecalho}{sal}${_calcular(algoritmo, sal, senha)}"
+
+
+# Formato: $nome$parâmetros$sal$hash. O sal tem o tamanho que faltar para completar os 144 caracteres.
 def criar_hash(senha: str) -> str:
-    sal: str = string_random(16)
-    return sal + hashlib.sha3_512((sal + senha).encode("utf-8")).hexdigest()
+    algoritmo: AlgoritmoHash = _algoritmo
+    tamanho_sal: int = _TAMANHO - len(algoritmo.cabecalho) - 1 - _TAMANHO_HASH
+    if tamanho_sal < _SAL_MINIMO:
+        raise ValueError(f"Os parâmetros de {algoritmo} não deixam espaço para o sal.")
+    sal: str = "".join(secrets.choice(_ALFABETO_SAL) for i in range(tamanho_sal))
+    return _montar(algoritmo, sal, senha)
 
 
-def comparar_hash(hash_com_sal: str, senha: str) -> bool:
+# Os hashes antigos são o sal de 16 letras seguido do SHA3-512 do sal com a senha. Eles nunca começam com $.
+def _comparar_antigo(hash_com_sal: str, senha: str) -> bool:
     sal: str = hash_com_sal[0:16]
-    return sal + hashlib.sha3_512((sal + senha).encode("utf-8")).hexdigest() == hash_com_sal
+    calculado: str = sal + hashlib.sha3_512((sal + senha).encode("utf-8")).hexdigest()
+    return compare_digest(calculado.encode("utf-8"), hash_com_sal.encode("utf-8"))
+
+
+def comparar_hash(hash_com_sal: str, senha: str) -> bool:
+    if not hash_com_sal.startswith("$"):
+        return _comparar_antigo(hash_com_sal, senha)
+    partes: list[str] = hash_com_sal.split("$")
+    if len(partes) != 5 or not hash_com_sal.isascii():  # Um hash no formato novo só tem caracteres ASCII.
+        return False
+    _, nome, parametros, sal, _ = partes
+    try:
+        algoritmo: AlgoritmoHash = _ler_algoritmo(nome, parametros)
+    except (ValueError, KeyError):
+        return False
+    return compare_digest(_montar(algoritmo, sal, senha).encode("ascii"), hash_com_sal.encode("ascii"))
+
+
+# Diz se o hash foi feito de um jeito diferente do atual (no formato antigo, com outro algoritmo ou com outros parâmetros).
+# Nesse caso, convém refazê-lo assim que a senha for conhecida, ou seja, no login.
+def precisa_rehash(hash_com_sal: str) -> bool:
+    return not hash_com_sal.startswith(_algoritmo.cabecalho)
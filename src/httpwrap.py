@@ -1,12 +1,18 @@
-from typing import Any, Callable
+from typing import Any, Callable, cast, get_args, get_origin, get_type_hints, Iterator, Union
 from typing import ParamSpec, TypeVar  # Delete when PEP 695 is ready.
-from flask import jsonify, make_response, request
+from types import NoneType, UnionType
+from collections.abc import Generator, Mapping
+from flask import current_app, has_app_context, make_response, request, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from werkzeug import Response
-from functools import wraps
+from functools import partial, wraps
+from importlib import import_module
 from dacite import Config, from_dict
+from dacite.exceptions import MissingValueError, WrongTypeError
 from enum import Enum, IntEnum
-from validator import dataclass_validate
-from dataclasses import dataclass
+from validator import dataclass_validate, validation_boundary
+from dataclasses import dataclass, fields, is_dataclass, MISSING
+import json
 from sucesso import Erro, Sucesso, RequisicaoMalFormadaException, ConteudoNaoReconhecidoException
 
 
@@ -14,6 +20,128 @@ _P = ParamSpec("_P")
 _R = TypeVar("_R")
 _T = TypeVar("_T")  # Delete when PEP 696 is ready.
 _RI = tuple[Response, int]
+_FIM: object = object()
+_TAMANHO_PEDACO: int = 16384
+
+try:
+    _orjson: Any = import_module("orjson")
+except ImportError:
+    _orjson = None
+
+_Codificador = Callable[[Any], Any]
+_PRIMITIVOS: frozenset[type[Any]] = frozenset([str, int, float, bool, NoneType])
+_codificadores: dict[type[Any], _Codificador] = {}
+
+
+def _identidade(valor: Any) -> Any:
+    return valor
+
+
+def _enum(valor: Enum) -> Any:
+    return valor.value
+
+
+def _lista(valor: list[Any] | tuple[Any, ...]) -> list[Any]:
+    return [_codificar(v) for v in valor]
+
+
+def _dicionario(valor: dict[Any, Any]) -> dict[Any, Any]:
+    return {k: _codificar(v) for k, v in valor.items()}
+
+
+# Os tipos que não são conhecidos aqui (date, Decimal, UUID, etc) são convertidos pelo default do provedor de JSON da aplicação,
+# como o jsonify faria. O que ele produzir é codificado de novo, e o que ele não souber converter resulta num TypeError.
+def _pelo_app(valor: Any) -> Any:
+    provedor: Any = current_app.json if has_app_context() else None
+    padrao: Callable[[Any], Any] = getattr(provedor, "default", DefaultJSONProvider.default)
+    return _codificar(padrao(valor))
+
+
+def _codificar(valor: Any) -> Any:
+    tipo: type[Any] = type(valor)
+    codificador: _Codificador | None = _codificadores.get(tipo)
+    if codificador is None:
+        codificador = _compilar(tipo)
+        _codificadores[tipo] = codificador
+    return codificador(valor)
+
+
+# Diz se um valor do tipo declarado já está pronto para ir ao JSON sem conversão alguma.
+def _pronto(tipo: Any) -> bool:
+    if tipo in _PRIMITIVOS:
+        return True
+    origem: Any = get_origin(tipo)
+    if origem in (UnionType, Union, list, dict):
+        return all(_pronto(t) for t in get_args(tipo))
+    return False
+
+
+# O conversor de cada campo é escolhido pelo tipo declarado: os que já estão prontos são copiados diretamente, enums viram
+# o seu valor e o resto (dataclasses aninhadas, listas delas, Any, etc) é resolvido pelo tipo do valor em tempo de execução.
+def _conversor_de_campo(tipo: Any) -> _Codificador | None:
+    if _pronto(tipo):
+        return None
+    if isinstance(tipo, type) and issubclass(tipo, Enum):
+        return _enum
+    return _codificar
+
+
+def _compilar_dataclass(tipo: type[Any]) -> _Codificador:
+    try:
+        dicas: dict[str, Any] = get_type_hints(tipo)
+    except (NameError, TypeError):
+        dicas = {}
+    campos: list[tuple[str, _Codificador | None]] = [
+        (f.name, _conversor_de_campo(dicas[f.name]) if f.name in dicas else _codificar) for f in sorted(fields(tipo), key = lambda c: c.name)
+    ]
+
+    def codificar(valor: Any) -> dict[str, Any]:
+        saida: dict[str, Any] = {}
+        for nome, conversor in campos:
+            v: Any = getattr(valor, nome)
+            saida[nome] = v if conversor is None else conversor(v)
+        return saida
+
+    return codificar
+
+
+def _compilar(tipo: type[Any]) -> _Codificador:
+    if tipo in _PRIMITIVOS:
+        return _identidade
+    if issubclass(tipo, Enum):
+        return _enum
+    if is_dataclass(tipo):
+        return _compilar_dataclass(tipo)
+    if issubclass(tipo, (list, tuple)):
+        return _lista
+    if issubclass(tipo, dict):
+        return _dicionario
+    if issubclass(tipo, (str, int, float)):
+        return _identidade
+    return _pelo_app
+
+
+def para_json(valor: Any) -> str:
+    """
+    Serializa um valor para JSON com as chaves ordenadas e sem espaços, no mesmo formato que o jsonify do Flask produziria.
+    Dataclasses são convertidas por funções montadas uma única vez para cada tipo e guardadas em cache.
+    O orjson é usado quando estiver instalado.
+
+    Parameters:
+        valor (Any): O valor a ser serializado. Pode conter dataclasses, enums, listas, tuplas, dicionários e tipos primitivos.
+        Os demais valores (datas, Decimal, UUID, etc) são convertidos pelo default do provedor de JSON da aplicação, como no jsonify.
+
+    Returns:
+        str: O JSON correspondente.
+    """
+    if _orjson is not None:
+        texto: bytes = _orjson.dumps(_codificar(valor), option = _orjson.OPT_SORT_KEYS | _orjson.OPT_NON_STR_KEYS)
+        return texto.decode("utf-8")
+    return json.dumps(_codificar(valor), sort_keys = True, separators = (",", ":"))
+
+
+def _responder(valor: Any) -> Response:
+    return Response(para_json(valor) + "\n", mimetype = "application/json")
 
 
 def handler(decorate: Callable[_P, str] | Callable[_P, Response] | Callable[_P, tuple[str, int]] | Callable[_P, _RI]) -> Callable[_P, _RI]:
@@ -32,19 +160,64 @@ def handler(decorate: Callable[_P, str] | Callable[_P, Response] | Callable[_P,
             return f
         except BaseException as e:
             erro: Erro = Erro.criar(e)
-            return jsonify(erro), erro.status
+            return _responder(erro), erro.status
     return decorator
 
 
+class Fluxo:
+    """
+    Resultado que um handler decorado com jsoner pode produzir para que a resposta seja enviada aos poucos.
+    O conteúdo da resposta é um objeto com um único campo cujo valor é a lista dos itens, que é serializada conforme o iterador é consumido,
+    sem que a lista ou o JSON completo fiquem inteiros na memória.
+    """
+
+    def __init__(self, campo: str, itens: Iterator[Any]) -> None:
+        self.campo: str = campo
+        self.itens: Iterator[Any] = itens
+
+
+def _emitir(fluxo: Fluxo, primeiro: Any) -> Iterator[str]:
+    pedaco: list[str] = ['{"sucesso": true, "conteudo": {', para_json(fluxo.campo), ": ["]
+    tamanho: int = 0
+    separador: str = ""
+    item: Any = primeiro
+    try:
+        while item is not _FIM:
+            texto: str = para_json(item)
+            pedaco.append(separador)
+            pedaco.append(texto)
+            separador = ", "
+            tamanho += len(texto)
+            if tamanho >= _TAMANHO_PEDACO:
+                yield "".join(pedaco)
+                pedaco = []
+                tamanho = 0
+            item = next(fluxo.itens, _FIM)
+        pedaco.append(']}, "status": 200}')
+        yield "".join(pedaco)
+    finally:
+        if isinstance(fluxo.itens, Generator):
+            fluxo.itens.close()
+
+
 def jsoner(decorate: Callable[_P, Any]) -> Callable[_P, _RI]:
+    """
+    Decorador de handlers cujo resultado é enviado como JSON dentro de um Sucesso, ou de um Erro caso uma exceção seja lançada.
+    Se o resultado for um Fluxo, o primeiro item é obtido antes de a resposta começar. Assim, os erros que ocorram ao iniciar a iteração
+    (por exemplo, falta de permissão) ainda produzem a resposta de erro usual. Um erro no meio da iteração interrompe a resposta,
+    que fica com um JSON incompleto.
+    """
     @wraps(decorate)
     def decorator(*args: _P.args, **kwargs: _P.kwargs) -> _RI:
         try:
             output: Any = decorate(*args, **kwargs)
-            return jsonify(Sucesso.criar(output)), 200
+            if not isinstance(output, Fluxo):
+                return _responder(Sucesso.criar(output)), 200
+            primeiro: Any = next(output.itens, _FIM)
         except BaseException as e:
             erro: Erro = Erro.criar(e)
-            return jsonify(erro), erro.status
+            return _responder(erro), erro.status
+        return Response(stream_with_context(_emitir(output, primeiro)), mimetype = "application/json"), 200
     return decorator
 
 
@@ -53,10 +226,10 @@ def empty_json(decorate: Callable[_P, None]) -> Callable[_P, _RI]:
     def decorator(*args: _P.args, **kwargs: _P.kwargs) -> _RI:
         try:
             decorate(*args, **kwargs)
-            return jsonify(Sucesso.ok()), 200
+            return _responder(Sucesso.ok()), 200
         except BaseException as e:
             erro: Erro = Erro.criar(e)
-            return jsonify(erro), erro.status
+            return _responder(erro), erro.status
     return decorator
 
 
@@ -83,6 +256,174 @@ def _get_body(content_type: str | None, json: bool, urlencoded: bool, multipart:
     raise ConteudoNaoReconhecidoException()
 
 
+_Decodificador = Callable[[Any], Any]
+_DACITE: Config = Config(cast = [IntEnum, Enum])
+_decodificadores: dict[type[Any], _Decodificador] = {}
+
+
+def _por_dacite(tipo: type[Any]) -> _Decodificador:
+    def decodificar(dados: Any) -> Any:
+        return from_dict(data_class = tipo, data = dados, config = _DACITE)
+    return decodificar
+
+
+# Como no dacite (e na PEP 484), um int é aceito onde se espera um float ou um complex.
+_TORRE_NUMERICA: dict[type[Any], tuple[type[Any], ...]] = {float: (int, float), complex: (int, float, complex)}
+
+
+def _verificado(caminho: str, tipo: type[Any]) -> _Decodificador:
+    aceitos: type[Any] | tuple[type[Any], ...] = _TORRE_NUMERICA.get(tipo, tipo)
+
+    def decodificar(valor: Any) -> Any:
+        if not isinstance(valor, aceitos):
+            raise WrongTypeError(field_path = caminho, field_type = tipo, value = valor)
+        return valor
+    return decodificar
+
+
+def _opcional(interno: _Decodificador) -> _Decodificador:
+    return lambda valor: None if valor is None else interno(valor)
+
+
+def _lista_de(caminho: str, declarado: Any, item: _Decodificador) -> _Decodificador:
+    def decodificar(valor: Any) -> Any:
+        if not isinstance(valor, list):
+            raise WrongTypeError(field_path = caminho, field_type = declarado, value = valor)
+        return [item(v) for v in valor]
+    return decodificar
+
+
+def _dicionario_de(caminho: str, declarado: Any, chave: _Decodificador, item: _Decodificador) -> _Decodificador:
+    def decodificar(valor: Any) -> Any:
+        if not isinstance(valor, dict):
+            raise WrongTypeError(field_path = caminho, field_type = declarado, value = valor)
+        return {chave(k): item(v) for k, v in valor.items()}
+    return decodificar
+
+
+def _aninhada(caminho: str, tipo: type[Any]) -> _Decodificador:
+    def decodificar(valor: Any) -> Any:
+        if not isinstance(valor, Mapping):
+            raise WrongTypeError(field_path = caminho, field_type = tipo, value = valor)
+        return _decodificador_de_classe(tipo)(valor)
+    return decodificar
+
+
+def _faltando(nome: str) -> Any:
+    raise MissingValueError(nome)
+
+
+# Como no dacite, um campo Optional sem valor padrão que não veio fica None.
+def _aceita_none(tipo: Any) -> bool:
+    return get_origin(tipo) in (UnionType, Union) and NoneType in get_args(tipo)
+
+
+# Faz o mesmo que o dacite faria com um valor do tipo declarado, mas decidindo o que fazer uma única vez.
+# Os tipos que não são suportados aqui resultam em None e fazem a classe inteira ser lida pelo dacite.
+def _decodificador_de_valor(caminho: str, tipo: Any) -> _Decodificador | None:
+    if tipo is Any:
+        return _identidade
+
+    origem: Any = get_origin(tipo)
+    args: tuple[Any, ...] = get_args(tipo)
+
+    if origem in (UnionType, Union):
+        if len(args) != 2 or NoneType not in args:
+            return None
+        interno: _Decodificador | None = _decodificador_de_valor(caminho, args[0] if args[1] is NoneType else args[1])
+        return None if interno is None else _opcional(interno)
+
+    if origem is list and len(args) == 1:
+        item: _Decodificador | None = _decodificador_de_valor(caminho, args[0])
+        return None if item is None else _lista_de(caminho, tipo, item)
+
+    if origem is dict and len(args) == 2:
+        k: _Decodificador | None = _decodificador_de_valor(caminho, args[0])
+        v: _Decodificador | None = _decodificador_de_valor(caminho, args[1])
+        return None if k is None or v is None else _dicionario_de(caminho, tipo, k, v)
+
+    if origem is not None or not isinstance(tipo, type):
+        return None
+
+    if issubclass(tipo, Enum):
+        return cast(_Decodificador, tipo)
+
+    if is_dataclass(tipo):
+        return _aninhada(caminho, tipo)
+
+    return _verificado(caminho, tipo)
+
+
+def _compilar_decodificador(tipo: type[Any]) -> _Decodificador:
+    if not is_dataclass(tipo):
+        return _por_dacite(tipo)
+    try:
+        dicas: dict[str, Any] = get_type_hints(tipo)
+    except NameError:
+        return _por_dacite(tipo)
+
+    passos: list[tuple[str, _Decodificador, Callable[[], Any]]] = []
+    for f in fields(tipo):
+        if not f.init or f.kw_only:
+            return _por_dacite(tipo)
+        d: _Decodificador | None = _decodificador_de_valor(f.name, dicas[f.name])
+        if d is None:
+            return _por_dacite(tipo)
+        if f.default is not MISSING:
+            padrao: Callable[[], Any] = partial(_identidade, f.default)
+        elif f.default_factory is not MISSING:
+            padrao = f.default_factory
+        elif _aceita_none(dicas[f.name]):
+            padrao = partial(_identidade, None)
+        else:
+            padrao = partial(_faltando, f.name)
+        passos.append((f.name, d, padrao))
+
+    ctor: Callable[..., Any] = cast(Callable[..., Any], tipo)
+
+    def decodificar(dados: Any) -> Any:
+        if not isinstance(dados, Mapping):
+            raise RequisicaoMalFormadaException()
+        return ctor(*[d(dados[nome]) if nome in dados else padrao() for nome, d, padrao in passos])
+
+    return decodificar
+
+
+def _decodificador_de_classe(tipo: type[Any]) -> _Decodificador:
+    decodificar: _Decodificador | None = _decodificadores.get(tipo)
+    if decodificar is None:
+        decodificar = _compilar_decodificador(tipo)
+        _decodificadores[tipo] = decodificar
+    return decodificar
+
+
+# def body_reader[T](target: type[T], *, json: bool = True, urlencoded: bool = True, multipart: bool = True) -> Callable[[], T]: # PEP 695
+def body_reader(target: type[_T], *, json: bool = True, urlencoded: bool = True, multipart: bool = True) -> Callable[[], _T]:
+    """
+    Prepara a leitura do corpo das requisições para uma dataclass, da mesma forma que o read_body faz.
+    A maneira de converter cada campo é decidida uma única vez, aqui, e não a cada requisição. O valor de cada campo é convertido
+    e verificado numa única passagem, de forma que a validação feita na construção da dataclass só confirma tipos já corretos.
+
+    Parameters:
+        target (type[_T]): O tipo de objeto que deve ser lido a partir do corpo da requisição. Deve ser uma dataclass.
+        json (bool): O mesmo que no read_body.
+        urlencoded (bool): O mesmo que no read_body.
+        multipart (bool): O mesmo que no read_body.
+
+    Returns:
+        Callable[[], _T]: Função que lê o corpo da requisição corrente e monta a instância do tipo especificado no parâmetro target.
+    """
+    decodificar: _Decodificador = _decodificador_de_classe(target)
+
+    def ler() -> _T:
+        content_type: str | None = request.headers.get("Content-Type")
+        body: Any = _get_body(content_type, json, urlencoded, multipart)
+        with validation_boundary():
+            return cast(_T, decodificar(body))
+
+    return ler
+
+
 # def read_body[T](target: type[T], *, json: bool = True, urlencoded: bool = True, multipart: bool = True) -> T: # PEP 695
 def read_body(target: type[_T], *, json: bool = True, urlencoded: bool = True, multipart: bool = True) -> _T:
     """
@@ -103,11 +444,7 @@ def read_body(target: type[_T], *, json: bool = True, urlencoded: bool = True, m
         _T: Uma instância dataclass do tipo especificado no parâmetro target a ser montada a partir do corpo da requisição.
     """
 
-    content_type: str | None = request.headers.get("Content-Type")
-
-    body: Any = _get_body(content_type, json, urlencoded, multipart)
-
-    return from_dict(data_class = target, data = body, config = Config(cast = [IntEnum, Enum]))
+    return body_reader(target, json = json, urlencoded = urlencoded, multipart = multipart)()
 
 
 def bodyless() -> None:
@@ -131,7 +468,8 @@ def dummy_body() -> None:
     if content_type is not None:
         body: Any = _get_body(content_type, True, True, True)
         try:
-            from_dict(data_class = _Empty, data = body, config = Config(cast = [IntEnum, Enum]))
+            with validation_boundary():
+                _decodificador_de_classe(_Empty)(body)
         except BaseException:
             raise RequisicaoMalFormadaException()
 
@@ -0,0 +1,194 @@
+from typing import Any, Callable, NoReturn
+from dataclasses import dataclass
+from socket import create_server, socket
+from time import monotonic, sleep
+from validator import dataclass_validate
+from connection.load import DatabaseConfig
+import os
+import signal
+import sys
+import traceback
+
+
+@dataclass_validate
+@dataclass(frozen = True)
+class ConfiguracaoPrefork:
+    processos: int
+    intervalo_reinicio: float = 1.0  # Tempo mínimo entre duas recriações de trabalhadores que morreram.
+    espera_encerramento: float = 5.0  # Tempo dado aos trabalhadores, além da drenagem, para saírem antes de serem mortos.
+
+    def __post_type_validate__(self) -> None:
+        if self.processos < 1 or self.intervalo_reinicio < 0 or self.espera_encerramento < 0:
+            raise ValueError(f"Configuração de pré-fork inválida: {self}")
+
+
+@dataclass_validate
+@dataclass(frozen = True)
+class _Geracao:
+    numero: int
+    config: DatabaseConfig
+    chave_secreta: str | None
+
+
+def _aviso(mensagem: str) -> None:
+    print(f"[{os.getpid()}] {mensagem}", file = sys.stderr, flush = True)
+
+
+# O processo mestre abre o socket de escuta, lê a configuração do banco de dados e a chave da sessão uma vez só e cria os
+# trabalhadores com fork. Cada trabalhador herda o socket e a chave e abre as suas próprias conexões com o banco de dados,
+# de forma que a validação, o dacite e os hashes rodem em paralelo em vários processos em vez de disputarem o GIL de um só.
+#
+# O mestre não atende requisições. Ele só supervisiona os trabalhadores:
+# - Um trabalhador que morre sem ter sido mandado embora é substituído, respeitando o intervalo mínimo entre recriações.
+# - SIGHUP relê a configuração e a chave e cria uma nova geração de trabalhadores. Só depois disso a geração antiga recebe SIGTERM,
+#   então sempre há alguém aceitando conexões no socket.
+# - SIGTERM ou SIGINT encerram todos os trabalhadores e o mestre.
+#
+# Um trabalhador que recebe SIGTERM para de aceitar conexões, termina as requisições que já aceitou e sai.
+class Mestre:
+
+    def __init__(
+            self,
+            porta: int,
+            carregar: Callable[[], DatabaseConfig],
+            ler_chave: Callable[[DatabaseConfig], str | None],
+            servir: Callable[[DatabaseConfig, str | None, int], Callable[[], None]],
+            config: ConfiguracaoPrefork,
+            drenagem: float
+    ) -> None:
+        self.__carregar: Callable[[], DatabaseConfig] = carregar
+        self.__ler_chave: Callable[[DatabaseConfig], str | None] = ler_chave
+        self.__servir: Callable[[DatabaseConfig, str | None, int], Callable[[], None]] = servir
+        self.__config: ConfiguracaoPrefork = config
+        self.__drenagem: float = drenagem
+        self.__socket: socket = create_server(("0.0.0.0", porta), backlog = 128)
+        self.__socket.set_inheritable(True)
+        self.__trabalhadores: dict[int, int] = {}
+        self.__geracao: _Geracao = self.__nova_geracao(1)
+        self.__proximo_reinicio: float = 0.0
+        self.__recarregar: bool = False
+        self.__encerrar: bool = False
+
+    @property
+    def porta(self) -> int:
+        return int(self.__socket.getsockname()[1])
+
+    @property
+    def trabalhadores(self) -> dict[int, int]:
+        return dict(self.__trabalhadores)
+
+    def __nova_geracao(self, numero: int) -> _Geracao:
+        config: DatabaseConfig = self.__carregar()
+        return _Geracao(numero, config, self.__ler_chave(config))
+
+    def executar(self) -> None:
+        signal.signal(signal.SIGHUP, self.__pedir_recarga)
+        signal.signal(signal.SIGTERM, self.__pedir_encerramento)
+        signal.signal(signal.SIGINT, self.__pedir_encerramento)
+        try:
+            while not self.__encerrar:
+                if self.__recarregar:
+                    self.__recarregar = False
+                    self.__recarregar_agora()
+                self.__colher()
+                self.__completar()
+                sleep(0.1)
+        finally:
+            self.__encerrar_todos()
+            self.__socket.close()
+
+    def __pedir_recarga(self, signum: int, frame: Any) -> None:
+        self.__recarregar = True
+
+    def __pedir_encerramento(self, signum: int, frame: Any) -> None:
+        self.__encerrar = True
+
+    def __recarregar_agora(self) -> None:
+        try:
+            geracao: _Geracao = self.__nova_geracao(self.__geracao.numero + 1)
+        except Exception:
+            _aviso("Falha ao recarregar a configuração. Os trabalhadores atuais continuam servindo.")
+            traceback.print_exc()
+            return
+        antigos: list[int] = list(self.__trabalhadores.keys())
+        self.__geracao = geracao
+        self.__completar(forcar = True)
+        for pid in antigos:
+            self.__sinalizar(pid, signal.SIGTERM)
+        _aviso(f"Geração {geracao.numero} iniciada.")
+
+    def __colher(self) -> None:
+        while self.__trabalhadores:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                self.__trabalhadores.clear()
+                return
+            if pid == 0:
+                return
+            geracao: int | None = self.__trabalhadores.pop(pid, None)
+            if geracao == self.__geracao.numero and not self.__encerrar:
+                _aviso(f"Trabalhador {pid} morreu inesperadamente (status {status}).")
+                self.__proximo_reinicio = monotonic() + self.__config.intervalo_reinicio
+
+    def __completar(self, forcar: bool = False) -> None:
+        if not forcar and monotonic() < self.__proximo_reinicio:
+            return
+        atuais: int = sum(1 for g in self.__trabalhadores.values() if g == self.__geracao.numero)
+        for _ in range(self.__config.processos - atuais):
+            self.__criar()
+
+    def __criar(self) -> None:
+        geracao: _Geracao = self.__geracao
+        pid: int = os.fork()
+        if pid == 0:
+            self.__trabalhar(geracao)
+        self.__trabalhadores[pid] = geracao.numero
+
+    # Como no mestre, o tratador do SIGTERM só liga uma flag, que é verificada periodicamente. Ele roda na thread principal, entre
+    # duas instruções quaisquer, e um Event.set ali poderia travar na trava do próprio Event, se ela estivesse com o Event.wait.
+    def __trabalhar(self, geracao: _Geracao) -> NoReturn:
+        codigo: int = 1
+        try:
+            parar: bool = False
+
+            def pedir_parada(signum: int, frame: Any) -> None:
+                nonlocal parar
+                parar = True
+
+            signal.signal(signal.SIGHUP, signal.SIG_IGN)
+            signal.signal(signal.SIGINT, signal.SIG_IGN)
+            signal.signal(signal.SIGTERM, pedir_parada)
+            encerrar: Callable[[], None] = self.__servir(geracao.config, geracao.chave_secreta, self.__socket.fileno())
+            while not parar:
+                sleep(0.1)
+            encerrar()
+            codigo = 0
+        except BaseException:
+            traceback.print_exc()
+        finally:
+            sys.stderr.flush()
+            os._exit(codigo)
+
+    @staticmethod
+    def __sinalizar(pid: int, sinal: signal.Signals) -> None:
+        try:
+            os.kill(pid, sinal)
+        except ProcessLookupError:
+            pass
+
+    def __encerrar_todos(self) -> None:
+        for pid in self.__trabalhadores:
+            self.__sinalizar(pid, signal.SIGTERM)
+        limite: float = monotonic() + self.__drenagem + self.__config.espera_encerramento
+        while self.__trabalhadores and monotonic() < limite:
+            self.__colher()
+            sleep(0.05)
+        for pid in self.__trabalhadores:
+            self.__sinalizar(pid, signal.SIGKILL)
+        for pid in self.__trabalhadores:
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+        self.__trabalhadores.clear()
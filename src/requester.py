@@ -1,5 +1,5 @@
 import requests
-from validator import dataclass_validate
+from validator import dataclass_validate, validation_boundary
 from dataclasses import asdict, dataclass
 from requests.models import Response
 from typing import Any, Callable, TypeVar, TYPE_CHECKING
@@ -127,7 +127,8 @@ class Requester:
         if self.__strategy.success(j):
             return None
         try:
-            return self.__strategy.error_maker(j)  # from_dict(data_class = _ErroRemoto, data = j, config = Config(cast = [Enum, IntEnum]))
+            with validation_boundary():
+                return self.__strategy.error_maker(j)  # from_dict(data_class = _ErroRemoto, data = j, config = Config(cast = [Enum, IntEnum]))
         except BaseException:
             raise UnknownRemoteError(rt)
 
@@ -144,7 +145,8 @@ class Requester:
         erro: ErrorData | None = self.__json_validate(j, r.text)
         if erro is not None:
             return erro.raise_it(x, self.__strategy.evaller)
-        if t is type(None):
-            self.__strategy.result_maker(j, self.__strategy.none_replacer)
-            return None  # type: ignore
-        return self.__strategy.result_maker(j, t)
+        with validation_boundary():
+            if t is type(None):
+                self.__strategy.result_maker(j, self.__strategy.none_replacer)
+                return None  # type: ignore
+            return self.__strategy.result_maker(j, t)
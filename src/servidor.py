@@ -0,0 +1,195 @@
+from typing import Any, cast, override
+from dataclasses import dataclass
+from queue import Full, Queue
+from socket import socket, SHUT_RDWR
+from threading import Lock, Thread
+from time import monotonic
+from werkzeug.serving import BaseWSGIServer, make_server, WSGIRequestHandler
+from wsgiref.types import WSGIApplication
+from validator import dataclass_validate
+from httpwrap import para_json
+from sucesso import Erro, ServicoIndisponivelException
+
+
+@dataclass_validate
+@dataclass(frozen = True)
+class ConfiguracaoServidor:
+    trabalhadores: int = 16  # Zero significa uma thread nova por conexão, sem limite algum.
+    fila: int = 64
+    keep_alive: float = 5.0  # Zero desliga o keep-alive.
+    drenagem: float = 30.0
+
+    def __post_type_validate__(self) -> None:
+        if self.trabalhadores < 0 or self.fila < 1 or self.keep_alive < 0 or self.drenagem < 0:
+            raise ValueError(f"Configuração de servidor inválida: {self}")
+
+
+def _resposta_indisponivel() -> bytes:
+    corpo: bytes = para_json(Erro.criar(ServicoIndisponivelException("Servidor sobrecarregado."))).encode("utf-8")
+    cabecalho: str = "\r\n".join([
+        "HTTP/1.1 503 Service Unavailable",
+        "Content-Type: application/json",
+        f"Content-Length: {len(corpo)}",
+        "Retry-After: 1",
+        "Connection: close",
+        "",
+        ""
+    ])
+    return cabecalho.encode("ascii") + corpo
+
+
+# Entre uma requisição e outra da mesma conexão (keep-alive), a conexão fica marcada como ociosa no servidor, que pode fechá-la
+# para liberar o trabalhador ou durante o shutdown, sem esperar pelo fim do keep-alive. A primeira requisição de cada conexão nunca é
+# considerada ociosa.
+class _Manipulador(WSGIRequestHandler):
+
+    @override
+    def setup(self) -> None:
+        super().setup()
+        self.__primeira: bool = True
+
+    @property
+    def __servidor(self) -> "ServidorComPool":
+        return cast(ServidorComPool, self.server)
+
+    @override
+    def handle_one_request(self) -> None:
+        if not self.__primeira and not self.__servidor._ocioso(self.connection):
+            self.close_connection = True
+            return
+        self.__primeira = False
+        try:
+            super().handle_one_request()
+        finally:
+            self.__servidor._ocupado(self.connection)
+
+    @override
+    def parse_request(self) -> bool:
+        self.__servidor._ocupado(self.connection)
+        return super().parse_request()
+
+
+def _manipulador(keep_alive: float) -> type[_Manipulador]:
+    class Manipulador(_Manipulador):
+        protocol_version = "HTTP/1.1" if keep_alive > 0 else "HTTP/1.0"
+        timeout = keep_alive if keep_alive > 0 else None
+    return Manipulador
+
+
+# As conexões aceitas vão para uma fila de tamanho fixo, que é consumida por um número fixo de threads. Assim, o número de requisições
+# (e de conexões com o banco de dados) simultâneas fica limitado. Quando a fila está cheia, a conexão é respondida na hora com 503.
+# O shutdown para de aceitar conexões, fecha as que estão ociosas e espera (até o tempo de drenagem) que as requisições já aceitas
+# sejam respondidas.
+# Uma conexão ociosa (keep-alive) ocupa um trabalhador enquanto espera pela próxima requisição. Para que clientes ociosos não deixem
+# as conexões novas na fila (ou com 503), elas cedem o trabalhador: quando uma conexão nova chega e todos os trabalhadores estão
+# ocupados, a conexão ociosa mais antiga é fechada, e um trabalhador que termina uma requisição fecha a conexão em vez de esperar por
+# outra se há conexões na fila. Isso é permitido pelo HTTP, e os clientes abrem uma conexão nova. O keep-alive, portanto, só poupa
+# conexões enquanto sobram trabalhadores.
+class ServidorComPool(BaseWSGIServer):
+    multithread = True
+
+    def __init__(self, host: str, porta: int, app: WSGIApplication, config: ConfiguracaoServidor, fd: int | None = None) -> None:
+        super().__init__(host, porta, app, _manipulador(config.keep_alive), fd = fd)
+        self.__config: ConfiguracaoServidor = config
+        self.__fila: Queue[tuple[Any, Any] | None] = Queue(config.fila)
+        self.__indisponivel: bytes = _resposta_indisponivel()
+        self.__trava: Lock = Lock()
+        self.__ociosas: dict[socket, None] = {}  # Da mais antiga para a mais nova.
+        self.__ocupados: int = 0
+        self.__encerrando: bool = False
+        self.__trabalhadores: list[Thread] = [
+            Thread(target = self.__trabalhar, name = f"trabalhador-{i}", daemon = True) for i in range(config.trabalhadores)
+        ]
+        for t in self.__trabalhadores:
+            t.start()
+
+    def _ocioso(self, conexao: socket) -> bool:
+        with self.__trava:
+            if self.__encerrando or not self.__fila.empty():
+                return False
+            self.__ociosas[conexao] = None
+            return True
+
+    def _ocupado(self, conexao: socket) -> None:
+        with self.__trava:
+            self.__ociosas.pop(conexao, None)
+
+    @override
+    def process_request(self, request: Any, client_address: Any) -> None:
+        try:
+            self.__fila.put_nowait((request, client_address))
+        except Full:
+            self.__recusar(request)
+            return
+        self.__liberar_ociosa()
+
+    def __liberar_ociosa(self) -> None:
+        with self.__trava:
+            if self.__ocupados < len(self.__trabalhadores) or len(self.__ociosas) == 0:
+                return
+            conexao: socket = next(iter(self.__ociosas))
+            del self.__ociosas[conexao]
+        self.__fechar(conexao)
+
+    @staticmethod
+    def __fechar(conexao: socket) -> None:
+        try:
+            conexao.shutdown(SHUT_RDWR)
+        except OSError:
+            pass
+
+    def __recusar(self, request: socket) -> None:
+        try:
+            request.sendall(self.__indisponivel)
+        except OSError:
+            pass
+        self.shutdown_request(request)
+
+    def __trabalhar(self) -> None:
+        while True:
+            item: tuple[Any, Any] | None = self.__fila.get()
+            if item is None:
+                return
+            request, client_address = item
+            with self.__trava:
+                self.__ocupados += 1
+            try:
+                self.finish_request(request, client_address)
+            except Exception:
+                self.handle_error(request, client_address)
+            finally:
+                self.shutdown_request(request)
+                with self.__trava:
+                    self.__ocupados -= 1
+
+    @override
+    def shutdown(self) -> None:
+        super().shutdown()
+        with self.__trava:
+            self.__encerrando = True
+            ociosas: list[socket] = list(self.__ociosas)
+        for conexao in ociosas:
+            self.__fechar(conexao)
+        # A fila pode estar cheia com todos os trabalhadores ocupados. Nesse caso, os avisos de parada também esperam no máximo até o limite.
+        limite: float = monotonic() + self.__config.drenagem
+        for _ in self.__trabalhadores:
+            try:
+                self.__fila.put(None, timeout = max(0.0, limite - monotonic()))
+            except Full:
+                break
+        for t in self.__trabalhadores:
+            t.join(max(0.0, limite - monotonic()))
+
+
+# Com fd, o servidor usa um socket de escuta já aberto (herdado do processo mestre do modo pré-fork) em vez de abrir um novo.
+# Como esse socket é compartilhado por vários processos, ele fica não-bloqueante: quem perder a disputa por uma conexão
+# recebe um erro no accept (que o socketserver ignora) em vez de ficar travado nele.
+def criar_servidor(host: str, porta: int, app: WSGIApplication, config: ConfiguracaoServidor, fd: int | None = None) -> BaseWSGIServer:
+    servidor: BaseWSGIServer
+    if config.trabalhadores == 0:
+        servidor = make_server(host, porta, app, True, fd = fd)
+    else:
+        servidor = ServidorComPool(host, porta, app, config, fd)
+    if fd is not None:
+        servidor.socket.setblocking(False)
+    return servidor
@@ -80,6 +80,8 @@ CREATE TABLE IF NOT EXISTS categoria_segredo (
     FOREIGN KEY (pfk_categoria) REFERENCES categoria (pk_categoria) ON DELETE RESTRICT ON UPDATE CASCADE
 ) STRICT, WITHOUT ROWID;
 
+CREATE INDEX IF NOT EXISTS ix_categoria_segredo_categoria ON categoria_segredo (pfk_categoria, pfk_segredo);
+
 CREATE TABLE IF NOT EXISTS permissao (
     pfk_usuario       INTEGER NOT NULL,
     pfk_segredo       INTEGER NOT NULL,
@@ -63,6 +63,13 @@ class PrecondicaoFalhouException(Exception, Status):
         return 412
 
 
+class ConteudoMuitoGrandeException(Exception, Status):
+    @override
+    @property
+    def status(self) -> int:
+        return 413
+
+
 class ConteudoNaoReconhecidoException(Exception, Status):
     @override
     @property
@@ -82,3 +89,10 @@ class ConteudoBloqueadoException(Exception, Status):
     @property
     def status(self) -> int:
         return 423
+
+
+class ServicoIndisponivelException(Exception, Status):
+    @override
+    @property
+    def status(self) -> int:
+        return 503
@@ -7,6 +7,15 @@ from .validator import (
     NS_T
 )
 
+from .mode import (
+    ValidationMode,
+    set_validation_mode,
+    get_validation_mode,
+    validation_boundary,
+    validation_count,
+    reset_validation_count
+)
+
 from .errorset import make_error, ErrorSet, SignalingErrorSet
 
 __all__: tuple[str, ...] = (
@@ -16,6 +25,12 @@ __all__: tuple[str, ...] = (
     "dataclass_type_validator_with_values",
     "TypeValidationError",
     "NS_T",
+    "ValidationMode",
+    "set_validation_mode",
+    "get_validation_mode",
+    "validation_boundary",
+    "validation_count",
+    "reset_validation_count",
     "make_error",
     "ErrorSet",
     "SignalingErrorSet"
@@ -0,0 +1,56 @@
+from typing import Iterator
+from contextlib import contextmanager
+from enum import Enum
+from threadlocal import ThreadLocal
+
+
+class ValidationMode(Enum):
+    """How much runtime validation is performed by the @dataclass_validate decorated classes.
+
+    FULL: Every instance is validated when constructed. This is the default.
+    BOUNDARY: Only instances constructed inside a validation_boundary() block are validated, i.e., the ones that are
+    built from untrusted data, such as HTTP request bodies or responses received from a remote server.
+    OFF: No instance is ever validated at runtime. The classes are still checked when they are decorated.
+    In every mode, __post_type_validate__ is still called, so the invariants of the classes are always checked.
+    """
+    FULL = "full"
+    BOUNDARY = "boundary"
+    OFF = "off"
+
+
+_mode: list[ValidationMode] = [ValidationMode.FULL]
+_depth: ThreadLocal[int] = ThreadLocal(0)
+_count: ThreadLocal[int] = ThreadLocal(0)
+
+
+def set_validation_mode(mode: ValidationMode) -> None:
+    _mode[0] = mode
+
+
+def get_validation_mode() -> ValidationMode:
+    return _mode[0]
+
+
+@contextmanager
+def validation_boundary() -> Iterator[None]:
+    _depth.value = _depth.value + 1
+    try:
+        yield
+    finally:
+        _depth.value = _depth.value - 1
+
+
+def validation_count() -> int:
+    return _count.value
+
+
+def reset_validation_count() -> None:
+    _count.value = 0
+
+
+def _must_validate() -> bool:
+    mode: ValidationMode = _mode[0]
+    if mode is ValidationMode.OFF or (mode is ValidationMode.BOUNDARY and _depth.value == 0):
+        return False
+    _count.value = _count.value + 1
+    return True
@@ -9,6 +9,7 @@ from .typezoo import (
     GenericAlias, EllipsisType, CallableTypeFormal, TypedDictType,
     CallableTypeRealUserDefined, CallableTypeRealBuiltIn
 )
+from .mode import _must_validate
 from .errorset import ErrorSet, SignalingErrorSet, make_error, make_errors, no_error, bad_ellipsis, to_error, split_errors, split_valids
 from typing import (
     Any, Callable, cast, ForwardRef, get_type_hints, Iterable,
@@ -441,6 +442,9 @@ class _TypeMapper:
         w: CallWrapper[Any] = self.__mappeds.get(type(key), _default_wrapper)
         return w.with_values(key, value, globalns)
 
+    def is_simple(self, key: TT2) -> bool:
+        return type(key) not in self.__mappeds
+
 
 _TM = _TypeMapper()
 _TM.put(TypedDictType     , _validate_typing_typed_dict_with_values, _validate_typing_typed_dict_without_values)  # noqa: E202,E203
@@ -530,8 +534,18 @@ def _reduce_alias(alias: GenericAlias, globalns: NS_T) -> SignalingErrorSet | ty
 
     ok_found: list[Any] = split_valids(found)
 
-    names: str = ",".join(x.__name__ for x in ok_found)
-    new_name: str = full_name + "[" + names + "]"
+    # Arguments that aren't visible by their names in the namespace (i.e. declared in some other module) are bound to temporary names.
+    names: list[str] = []
+    for x in ok_found:
+        if x.__module__ == "builtins" or new_globalns.get(x.__name__) is x:
+            names.append(x.__name__)
+        else:
+            if new_globalns is globalns:
+                new_globalns = globalns.copy()
+            var_name: str = _temp_name(new_globalns)
+            new_globalns[var_name] = x
+            names.append(var_name)
+    new_name: str = full_name + "[" + ",".join(names) + "]"
     return _evaluate_forward_reference(ForwardRef(new_name), new_globalns)
 
 
@@ -570,6 +584,101 @@ def _evaluate_forward_reference(ref_type: ForwardRef | str, globalns: NS_T) -> S
         return make_error(f'Could not evaluate "{ref_type}" as a valid type')
 
 
+_FastCheck = Callable[[Any], bool]
+
+
+def _always(value: Any) -> bool:
+    return True
+
+
+def _fast_simple(expected_type: type[Any]) -> _FastCheck:
+    return lambda value: isinstance(value, expected_type)
+
+
+def _fast_union(checks: list[_FastCheck]) -> _FastCheck:
+    return lambda value: any(c(value) for c in checks)
+
+
+def _fast_iterable(origin: type[Any], item: _FastCheck) -> _FastCheck:
+    return lambda value: isinstance(value, origin) and all(item(v) for v in value)
+
+
+def _fast_dict(key: _FastCheck, item: _FastCheck) -> _FastCheck:
+    return lambda value: isinstance(value, dict) and all(key(k) and item(v) for k, v in value.items())
+
+
+def _fast_literal(options: tuple[Any, ...]) -> _FastCheck:
+    return lambda value: value in options
+
+
+# Fast checks are compiled once from the resolved types. They are allowed to reject values that the full validator
+# would accept (in that case the full validator is called and it has the final say), but never the opposite.
+# Types that do not have a fast check simply return None and are always validated the full way.
+def _compile_fast_check(expected_type: TT1 | TT2, globalns: NS_T) -> _FastCheck | None:
+    resolved: SignalingErrorSet | TT2 = _type_resolve(expected_type, globalns)
+
+    if isinstance(resolved, SignalingErrorSet) or resolved is EllipsisType:
+        return None
+
+    if resolved is Any:
+        return _always
+
+    if isinstance(resolved, type) and _TM.is_simple(resolved):
+        return _fast_simple(resolved)
+
+    if isinstance(resolved, UnionType) or isinstance(resolved, OptionalType):
+        members: list[_FastCheck | None] = [_compile_fast_check(t, globalns) for t in resolved.__args__]
+        if any(m is None for m in members):
+            return None
+        return _fast_union([m for m in members if m is not None])
+
+    if isinstance(resolved, LiteralType):
+        return _fast_literal(tuple(resolved.__args__))
+
+    if isinstance(resolved, GenericType) and resolved.__origin__ in (list, set, frozenset) and len(resolved.__args__) == 1:
+        item: _FastCheck | None = _compile_fast_check(resolved.__args__[0], globalns)
+        if item is None:
+            return None
+        return _fast_iterable(resolved.__origin__, item)
+
+    if isinstance(resolved, GenericType) and resolved.__origin__ is dict and len(resolved.__args__) == 2:
+        k: _FastCheck | None = _compile_fast_check(resolved.__args__[0], globalns)
+        v: _FastCheck | None = _compile_fast_check(resolved.__args__[1], globalns)
+        if k is None or v is None:
+            return None
+        return _fast_dict(k, v)
+
+    return None
+
+
+class _ValidationPlan:
+    """Validation of a dataclass instance compiled at decoration time.
+    Each field gets a fast check when its type allows it. Only fields without a fast check, or whose fast check
+    failed, go through the full validator, which is also the one responsible for producing the error messages.
+    """
+
+    def __init__(self, cls: type[_D], localns: NS_T) -> None:
+        globalns: NS_T = sys.modules[cls.__module__].__dict__.copy()
+        globalns.update(localns)
+        self.__module: str = cls.__module__
+        self.__localns: NS_T = localns
+        self.__fields: list[tuple[str, Any, _FastCheck | None]] = [
+            (field.name, field.type, _compile_fast_check(field.type, globalns)) for field in dataclasses.fields(cls)
+        ]
+
+    def validate(self, target: _D) -> None:
+        globalns: NS_T | None = None
+        for name, expected_type, fast in self.__fields:
+            value: Any = getattr(target, name)
+            if fast is not None and fast(value):
+                continue
+            if globalns is None:
+                globalns = sys.modules[self.__module].__dict__.copy()
+                globalns.update(self.__localns)
+            if isinstance(_validate_types_with_values(expected_type, value, globalns), SignalingErrorSet):
+                dataclass_type_validator_with_values(target, self.__localns)
+
+
 # def dataclass_type_validator_without_values[D: DataclassInstance](target: type[D], localns: NS_T) -> None: # PEP 695
 def dataclass_type_validator_without_values(target: type[_D], localns: NS_T) -> None:
     fields: tuple[dataclasses.Field[Any], ...] = dataclasses.fields(target)
@@ -641,12 +750,18 @@ def _dataclass_full_validate(cls: type[_D], localns: NS_T) -> type[_D]:
     call_post_type_validate = hasattr(cls, "__post_type_validate__")
 
     orig_method = getattr(cls, wrapped_method_name)
+    plan: _ValidationPlan | None = None
 
     # Normal case - call validator at the end of __init__ or __post_init__.
     @functools.wraps(orig_method)
     def method_wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
         x = orig_method(self, *args, **kwargs)
-        dataclass_type_validator_with_values(self, localns)
+        # The mode only skips the type checks. The invariants of the class are always checked.
+        if _must_validate():
+            if plan is None:
+                dataclass_type_validator_with_values(self, localns)
+            else:
+                plan.validate(self)
         if call_post_type_validate:
             self.__post_type_validate__()
         return x
@@ -654,5 +769,6 @@ def _dataclass_full_validate(cls: type[_D], localns: NS_T) -> type[_D]:
     setattr(cls, wrapped_method_name, method_wrapper)
 
     dataclass_type_validator_without_values(cls, localns)
+    plan = _ValidationPlan(cls, localns)
 
     return cls
@@ -1,4 +1,7 @@
+from .asgi import AsgiAdapter
+from .dispatcher import RadixRouter, WsgiDispatcher
 from .webrpc import (
+    DEFAULT_MAX_BODY_LENGTH,
     WebMethod,
     WebParam,
     WebSuite,
@@ -6,12 +9,15 @@ from .webrpc import (
     from_path,
     from_path_int,
     from_path_float,
+    from_query_string,
+    from_query_string_multi,
     identity,
     parse_int,
     parse_float
 )
 
 __all__: tuple[str, ...] = (
+    "DEFAULT_MAX_BODY_LENGTH",
     "WebMethod",
     "WebParam",
     "WebSuite",
@@ -19,7 +25,12 @@ __all__: tuple[str, ...] = (
     "from_path",
     "from_path_int",
     "from_path_float",
+    "from_query_string",
+    "from_query_string_multi",
     "identity",
     "parse_int",
-    "parse_float"
+    "parse_float",
+    "RadixRouter",
+    "WsgiDispatcher",
+    "AsgiAdapter"
 )
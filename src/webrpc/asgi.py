@@ -0,0 +1,212 @@
+from typing import Any, Awaitable, Callable, Iterable, MutableMapping
+from asyncio import AbstractEventLoop, Future, get_running_loop, Queue, run_coroutine_threadsafe
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from threading import Event
+from types import TracebackType
+from wsgiref.types import WSGIApplication, WSGIEnvironment
+from httpwrap import para_json
+from sucesso import ConteudoMuitoGrandeException, Erro
+from .webrpc import DEFAULT_MAX_BODY_LENGTH
+import sys
+
+Scope = MutableMapping[str, Any]
+Message = MutableMapping[str, Any]
+Receive = Callable[[], Awaitable[Message]]
+Send = Callable[[Message], Awaitable[None]]
+
+_ExcInfo = tuple[type[BaseException], BaseException, TracebackType] | tuple[None, None, None]
+_Start = tuple[int, list[tuple[bytes, bytes]]]
+_Item = _Start | bytes | BaseException | None
+
+
+class _Abandoned(Exception):
+    pass
+
+
+def _environ(scope: Scope, body: bytes) -> WSGIEnvironment:
+    server: tuple[str, int] | None = scope.get("server")
+    client: tuple[str, int] | None = scope.get("client")
+    environ: WSGIEnvironment = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": scope.get("root_path", "").encode("utf-8").decode("latin-1"),
+        "PATH_INFO": scope["path"].encode("utf-8").decode("latin-1"),
+        "QUERY_STRING": scope.get("query_string", b"").decode("latin-1"),
+        "SERVER_NAME": "localhost" if server is None else server[0],
+        "SERVER_PORT": "80" if server is None else str(server[1]),
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "REMOTE_ADDR": "" if client is None else client[0],
+        "CONTENT_LENGTH": str(len(body)),
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": BytesIO(body),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": False,
+        "wsgi.run_once": False
+    }
+    for raw_name, raw_value in scope.get("headers", []):
+        name: str = raw_name.decode("latin-1").upper().replace("-", "_")
+        value: str = raw_value.decode("latin-1")
+        if name == "CONTENT_LENGTH":
+            continue
+        key: str = name if name == "CONTENT_TYPE" else f"HTTP_{name}"
+        # Repeated headers are joined with commas, except for the cookies (split into several headers by HTTP/2), joined as in HTTP/1.1.
+        separator: str = "; " if key == "HTTP_COOKIE" else ","
+        environ[key] = value if key not in environ else f"{environ[key]}{separator}{value}"
+    return environ
+
+
+# ASGI application that serves a WSGI application (such as the Flask app of a WebSuite, with all of its routes and the /map stubs).
+# The connection itself costs nothing but a coroutine while the request body is received and while the response is sent,
+# so an ASGI server can hold thousands of them open. Only the execution of each request takes a thread, from a pool of
+# max_threads threads, which also bounds how many requests hit the database at once.
+# The whole response is produced in the same thread that ran the request, since the transactions are bound to the thread.
+# The chunks go through a small queue, so a slow client slows down the producer instead of having the response piled up in memory.
+# The request body is counted while it is received, and the request is rejected with 413 as soon as it exceeds max_body_length
+# (or right away, if its Content-Length does), so no body is ever buffered beyond that. None removes the limit.
+class AsgiAdapter:
+
+    def __init__(
+            self,
+            app: WSGIApplication,
+            max_threads: int = 16,
+            queue_size: int = 8,
+            max_body_length: int | None = DEFAULT_MAX_BODY_LENGTH
+    ) -> None:
+        self.__app: WSGIApplication = app
+        self.__executor: ThreadPoolExecutor = ThreadPoolExecutor(max_threads, thread_name_prefix = "asgi")
+        self.__queue_size: int = queue_size
+        self.__max_body_length: int | None = max_body_length
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "lifespan":
+            await self.__lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            raise ValueError(f"Unsupported ASGI scope type {scope['type']}")
+        body: bytes | None = await self.__read_body(scope, receive)
+        if body is None:
+            await self.__too_large(send)
+            return
+        await self.__respond(_environ(scope, body), send)
+
+    async def __lifespan(self, receive: Receive, send: Send) -> None:
+        while True:
+            message: Message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                self.__executor.shutdown(wait = True)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    # None if the body is too large.
+    async def __read_body(self, scope: Scope, receive: Receive) -> bytes | None:
+        limit: int | None = self.__max_body_length
+        if limit is not None:
+            for name, value in scope.get("headers", []):
+                if name.lower() == b"content-length" and value.isdigit() and int(value) > limit:
+                    return None
+        chunks: list[bytes] = []
+        size: int = 0
+        while True:
+            message: Message = await receive()
+            if message["type"] == "http.disconnect":
+                break
+            chunk: bytes = message.get("body", b"")
+            size += len(chunk)
+            if limit is not None and size > limit:
+                return None
+            chunks.append(chunk)
+            if not message.get("more_body", False):
+                break
+        return b"".join(chunks)
+
+    @staticmethod
+    async def __too_large(send: Send) -> None:
+        body: bytes = (para_json(Erro.criar(ConteudoMuitoGrandeException())) + "\n").encode("utf-8")
+        headers: list[tuple[bytes, bytes]] = [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode("ascii"))]
+        await send({"type": "http.response.start", "status": 413, "headers": headers})
+        await send({"type": "http.response.body", "body": body, "more_body": False})
+
+    async def __respond(self, environ: WSGIEnvironment, send: Send) -> None:
+        loop: AbstractEventLoop = get_running_loop()
+        queue: Queue[_Item] = Queue(self.__queue_size)
+        abandoned: Event = Event()
+        started: bool = False
+        finished: bool = False
+        work: Future[None] = loop.run_in_executor(self.__executor, self.__produce, environ, loop, queue, abandoned)
+        try:
+            while not finished:
+                item: _Item = await queue.get()
+                if item is None:
+                    finished = True
+                elif isinstance(item, BaseException):
+                    raise item
+                elif isinstance(item, tuple):
+                    started = True
+                    await send({"type": "http.response.start", "status": item[0], "headers": item[1]})
+                else:
+                    await send({"type": "http.response.body", "body": item, "more_body": True})
+        except Exception:
+            if started:
+                raise
+            await send({"type": "http.response.start", "status": 500, "headers": [(b"content-type", b"text/plain")]})
+            await send({"type": "http.response.body", "body": b"Internal Server Error", "more_body": False})
+            return
+        finally:
+            if not finished:
+                abandoned.set()
+                while not queue.empty():
+                    queue.get_nowait()
+            await work
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+    # Runs in a thread of the pool. The status and the headers are only passed on with the first chunk of the body (or at the end),
+    # so the application may still replace them through start_response with exc_info until then, as WSGI allows.
+    def __produce(self, environ: WSGIEnvironment, loop: AbstractEventLoop, queue: Queue[_Item], abandoned: Event) -> None:
+        pending: list[_Start] = []
+        sent: bool = False
+
+        def put(item: _Item) -> None:
+            if abandoned.is_set():
+                raise _Abandoned()
+            run_coroutine_threadsafe(queue.put(item), loop).result()
+
+        def flush() -> None:
+            nonlocal sent
+            if pending:
+                put(pending.pop())
+                sent = True
+
+        def write(data: bytes) -> None:
+            flush()
+            if data:
+                put(data)
+
+        def start_response(status: str, headers: list[tuple[str, str]], exc_info: _ExcInfo | None = None) -> Callable[[bytes], object]:
+            if exc_info is not None and exc_info[1] is not None and sent:
+                raise exc_info[1].with_traceback(exc_info[2])
+            pending.clear()
+            pending.append((int(status.split(" ", 1)[0]), [(k.lower().encode("latin-1"), v.encode("latin-1")) for k, v in headers]))
+            return write
+
+        try:
+            result: Iterable[bytes] = self.__app(environ, start_response)
+            try:
+                for chunk in result:
+                    write(chunk)
+                flush()
+            finally:
+                close: Callable[[], object] | None = getattr(result, "close", None)
+                if close is not None:
+                    close()
+            put(None)
+        except _Abandoned:
+            pass
+        except Exception as x:
+            try:
+                put(x)
+            except _Abandoned:
+                pass
@@ -0,0 +1,143 @@
+from typing import Any, Callable, Generic, Iterable, override, TypeVar
+from flask import Flask
+from flask.ctx import RequestContext
+from werkzeug import Response
+from wsgiref.types import StartResponse, WSGIApplication, WSGIEnvironment
+from .webrpc import WebSuite
+
+
+_T = TypeVar("_T")  # Delete when PEP 695 is ready.
+_D = Callable[[], tuple[Response, int]]
+
+
+class _Node(Generic[_T]):
+
+    def __init__(self) -> None:
+        self.static: dict[str, _Node[_T]] = {}
+        self.param_name: str | None = None
+        self.param: _Node[_T] | None = None
+        self.targets: dict[str, _T] = {}
+
+
+# A radix tree over the segments of the path. Static segments are tried before the parameter of the same node, and a parameter never
+# matches an empty segment, as in Flask's default converter. Other converters are not supported and the routes using them are refused.
+# class RadixRouter[T]: # PEP 695
+class RadixRouter(Generic[_T]):
+
+    def __init__(self) -> None:
+        self.__root: _Node[_T] = _Node()
+
+    @staticmethod
+    def __param_name(segment: str) -> str | None:
+        if not segment.startswith("<") or not segment.endswith(">"):
+            if "<" in segment or ">" in segment:
+                raise ValueError(f"Unsupported URL segment {segment}")
+            return None
+        inner: str = segment[1:-1]
+        converter, colon, name = inner.rpartition(":")
+        if colon != "" and converter not in ("", "string"):
+            raise ValueError(f"Unsupported URL converter {converter}")
+        return name
+
+    def add(self, method: str, url_template: str, target: _T) -> bool:
+        node: _Node[_T] = self.__root
+        try:
+            for segment in url_template.split("/")[1:]:
+                name: str | None = self.__param_name(segment)
+                if name is None:
+                    node = node.static.setdefault(segment, _Node())
+                    continue
+                if node.param is None:
+                    node.param_name = name
+                    node.param = _Node()
+                elif node.param_name != name:
+                    raise ValueError(f"Conflicting parameter names {node.param_name} and {name}")
+                node = node.param
+        except ValueError:
+            return False
+        if method in node.targets:
+            raise ValueError(f"Duplicated route {method} {url_template}")
+        node.targets[method] = target
+        return True
+
+    def match(self, method: str, path: str) -> tuple[_T, dict[str, str]] | None:
+        if not path.startswith("/"):
+            return None
+        args: dict[str, str] = {}
+        found: _T | None = self.__match(self.__root, method, path.split("/")[1:], 0, args)
+        return None if found is None else (found, args)
+
+    def __match(self, node: _Node[_T], method: str, segments: list[str], i: int, args: dict[str, str]) -> _T | None:
+        if i == len(segments):
+            return node.targets.get(method)
+        segment: str = segments[i]
+        child: _Node[_T] | None = node.static.get(segment)
+        if child is not None:
+            found: _T | None = self.__match(child, method, segments, i + 1, args)
+            if found is not None:
+                return found
+        if node.param is None or node.param_name is None or segment == "":
+            return None
+        args[node.param_name] = segment
+        found = self.__match(node.param, method, segments, i + 1, args)
+        if found is None:
+            del args[node.param_name]
+        return found
+
+
+class _RoutedRequestContext(RequestContext):
+
+    def __init__(self, app: Flask, environ: WSGIEnvironment, view_args: dict[str, Any]) -> None:
+        super().__init__(app, environ)
+        self.__view_args: dict[str, Any] = view_args
+
+    @override
+    def match_request(self) -> None:
+        self.request.view_args = self.__view_args
+
+
+def _path_info(environ: WSGIEnvironment) -> str:
+    path: str = environ.get("PATH_INFO", "")
+    return path.encode("latin-1").decode("utf-8", "replace")
+
+
+# WSGI application that finds the routes of a WebSuite with a RadixRouter instead of Flask's URL map.
+# The request still runs inside a Flask request context, with the before_request and after_request hooks and the session,
+# so the handlers behave exactly as they do under Flask. Anything the router does not find (other routes, HEAD, OPTIONS,
+# wrong methods, redirects) goes to the fallback, which by default is the WSGI application the Flask app had before,
+# so the dispatcher can also replace app.wsgi_app.
+class WsgiDispatcher:
+
+    def __init__(self, suite: WebSuite, fallback: WSGIApplication | None = None) -> None:
+        self.__app: Flask = suite.app
+        self.__fallback: WSGIApplication = fallback if fallback is not None else suite.app.wsgi_app
+        self.__router: RadixRouter[_D] = RadixRouter()
+        for wm, call in suite.routes:
+            self.__router.add(wm.http_method, wm.url_template, call)
+
+    def __call__(self, environ: WSGIEnvironment, start_response: StartResponse) -> Iterable[bytes]:
+        found: tuple[_D, dict[str, str]] | None = self.__router.match(environ["REQUEST_METHOD"], _path_info(environ))
+        if found is None:
+            return self.__fallback(environ, start_response)
+        call, args = found
+        app: Flask = self.__app
+        ctx: RequestContext = _RoutedRequestContext(app, environ, args)
+        error: BaseException | None = None
+        try:
+            ctx.push()
+            # The same as Flask's full_dispatch_request: the errors go first to the registered error handlers (and HTTPExceptions
+            # become their own responses), and only what they do not handle becomes a 500.
+            try:
+                try:
+                    rv: Any = app.preprocess_request()
+                    if rv is None:
+                        rv = call()
+                except Exception as e:
+                    rv = app.handle_user_exception(e)
+                response: Response = app.finalize_request(rv)
+            except Exception as e:
+                error = e
+                response = app.handle_exception(e)
+            return response(environ, start_response)
+        finally:
+            ctx.pop(error)
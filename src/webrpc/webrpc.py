@@ -4,8 +4,9 @@ from typing import Any, Callable, Generic, ParamSpec, TypeVar
 from inspect import signature, Signature, Parameter
 from werkzeug.datastructures.file_storage import FileStorage
 from werkzeug import Response
-from sucesso import RequisicaoMalFormadaException
-from httpwrap import handler, read_body
+from werkzeug.exceptions import RequestEntityTooLarge
+from sucesso import ConteudoMuitoGrandeException, RequisicaoMalFormadaException
+from httpwrap import body_reader, handler
 from functools import wraps
 from types import MappingProxyType
 import sys
@@ -17,6 +18,8 @@ _X = TypeVar("_X")
 _C = Callable[_P, tuple[Response, int]]
 _D = Callable[[], tuple[Response, int]]
 
+DEFAULT_MAX_BODY_LENGTH: int = 1024 * 1024
+
 
 def or_default(default: str | None, data: str | None) -> str:
     if data is None:
@@ -57,6 +60,7 @@ class WebParam(Generic[_X]):
     on_path_to_flask: bool
     full_body: bool
     body_type: str
+    max_body_length: int | None = None
 
     def handle(self) -> _X:
         return self.func()
@@ -160,11 +164,18 @@ def from_body(param_name: str) -> WebParam[str]:
     return WebParam(param_name, str, inner, js, False, True, "")
 
 
-def from_body_typed(param_name: str, target: type[_X], *, json: bool = True, urlencoded: bool = True, multipart: bool = True) -> WebParam[_X]:
-    def inner() -> _X:
-        return read_body(target, json = json, urlencoded = urlencoded, multipart = multipart)
+def from_body_typed(
+        param_name: str,
+        target: type[_X],
+        *,
+        json: bool = True,
+        urlencoded: bool = True,
+        multipart: bool = True,
+        max_length: int = DEFAULT_MAX_BODY_LENGTH
+) -> WebParam[_X]:
+    inner: Callable[[], _X] = body_reader(target, json = json, urlencoded = urlencoded, multipart = multipart)
     js: str = f'__body.body = {param_name};'
-    return WebParam(param_name, target, inner, js, False, True, "json")
+    return WebParam(param_name, target, inner, js, False, True, "json", max_length)
 
 
 def to_int(wrap: Callable[[], str]) -> Callable[[], int]:
@@ -200,6 +211,44 @@ class WebMethod:
     def handle(self) -> list[Any]:
         return [p.handle() for p in self.params]
 
+    @property
+    def max_body_length(self) -> int | None:
+        limits: list[int] = [p.max_body_length for p in self.params if p.max_body_length is not None]
+        return min(limits) if len(limits) > 0 else None
+
+
+# Binds the extractors of the parameters to the function, so each request makes a single call without going through WebMethod.handle.
+def _bind(what: _C[Any], params: list[WebParam[Any]]) -> _D:
+    funcs: list[Callable[[], Any]] = [p.func for p in params]
+    if len(funcs) == 0:
+        return lambda: what()
+    if len(funcs) == 1:
+        f0: Callable[[], Any] = funcs[0]
+        return lambda: what(f0())
+    if len(funcs) == 2:
+        g0: Callable[[], Any] = funcs[0]
+        g1: Callable[[], Any] = funcs[1]
+        return lambda: what(g0(), g1())
+    return lambda: what(*[f() for f in funcs])
+
+
+# Rejects the request by its Content-Length, before the body is read. A body without one (chunked) is read up to a single byte
+# past the limit (the stream silently stops at max_content_length), which is enough to tell that it is too large.
+def _read_body(limit: int | None) -> None:
+    if limit is None:
+        request.get_data()  # Ensure caching
+        return
+    length: int | None = request.content_length
+    if length is not None and length > limit:
+        raise ConteudoMuitoGrandeException()
+    request.max_content_length = limit + 1
+    try:
+        data: bytes = request.get_data()  # Ensure caching
+    except RequestEntityTooLarge:
+        raise ConteudoMuitoGrandeException()
+    if len(data) > limit:
+        raise ConteudoMuitoGrandeException()
+
 
 _first_skeleton: str = "\n".join([
     'const RPC = (() => {',
@@ -337,6 +386,7 @@ class WebSuite:
 
     def __init__(self, app: Flask, map_url: str) -> None:
         self.__methods: list[WebMethod] = []
+        self.__routes: list[tuple[WebMethod, _D]] = []
         self.__flask: Flask = app
         self.__js_stubs: list[str] = [_first_skeleton]
 
@@ -346,6 +396,14 @@ class WebSuite:
             r.headers["Content-Type"] = "text/javascript"
             return r
 
+    @property
+    def app(self) -> Flask:
+        return self.__flask
+
+    @property
+    def routes(self) -> list[tuple[WebMethod, _D]]:
+        return self.__routes[:]
+
     @property
     def js_stubs(self) -> str:
         return "".join(self.__js_stubs) + _last_skeleton
@@ -366,24 +424,25 @@ class WebSuite:
                 js_stub: str = _make_js_stub(what.__name__, s.parameters, wm.params, wm.url_template, wm.http_method)
                 self.__js_stubs.append(js_stub)
 
+            limit: int | None = wm.max_body_length
+            call: _D = _bind(what, wm.params)
+
             @handler
             @wraps(what)
             def inner() -> tuple[Response, int]:
-                request.get_data()  # Ensure caching
+                _read_body(limit)
                 try:
-                    params: list[Any] = wm.handle()
-                    return what(*params)
+                    return call()
                 except BaseException as x:
                     traceback.print_exc(file = sys.stdout)
                     raise x
 
-            t: str = "\n".join([
-                f"@app.route('{wm.url_template}', methods = ['{wm.http_method}'])",
-                f"def {what.__name__}({', '.join([p.name for p in wm.params if p.on_path_to_flask])}):",
-                "\n    return inner()",
-            ])
-            app: Flask = self.__flask
-            exec(t, {"inner": inner, "app": app})
+            # The path parameters are read by the extractors from request.view_args, so Flask's keyword arguments are ignored.
+            def view(**path_params: Any) -> tuple[Response, int]:
+                return inner()
+
+            self.__flask.add_url_rule(wm.url_template, what.__name__, view, methods = [wm.http_method])
+            self.__routes.append((wm, inner))
             return inner
 
         self.__methods.append(wm)
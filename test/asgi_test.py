@@ -0,0 +1,215 @@
+from typing import Any, Iterator
+from asyncio import run
+from dataclasses import dataclass
+from flask import Flask, request
+from httpwrap import empty_json, jsoner, Fluxo
+from validator import dataclass_validate
+from webrpc import AsgiAdapter, from_body_typed, from_path, WebSuite, WsgiDispatcher
+from webrpc.asgi import Message, Scope
+from pytest import raises
+import json
+
+
+@dataclass_validate
+@dataclass(frozen = True)
+class Nome:
+    nome: str
+
+
+def _app() -> Flask:
+    app: Flask = Flask(__name__)
+    ws: WebSuite = WebSuite(app, "/map")
+
+    @ws.route("GET", "/ola/<nome>", from_path("nome"))
+    @jsoner
+    def ola(nome: str) -> str:
+        return f"Olá, {nome}!"
+
+    @ws.route("POST", "/eco", from_body_typed("body", Nome))
+    @jsoner
+    def eco(body: Nome) -> Nome:
+        return body
+
+    @ws.route("GET", "/fluxo")
+    @jsoner
+    def fluxo() -> Fluxo:
+        def gerar() -> Iterator[int]:
+            yield from range(1000)
+        return Fluxo("numeros", gerar())
+
+    @ws.route("POST", "/nada")
+    @empty_json
+    def nada() -> None:
+        pass
+
+    @app.route("/quebrado")
+    def quebrado() -> str:
+        raise ValueError("Quebrado")
+
+    app.wsgi_app = WsgiDispatcher(ws)  # type: ignore[method-assign]
+    return app
+
+
+def _call(adapter: AsgiAdapter, method: str, path: str, body: bytes = b"", headers: list[tuple[bytes, bytes]] = []) -> tuple[int, dict[str, str], bytes]:
+    scope: Scope = {
+        "type": "http",
+        "method": method,
+        "path": path,
+        "query_string": b"",
+        "headers": headers,
+        "server": ("testserver", 80),
+        "client": ("127.0.0.1", 12345)
+    }
+    # The body is split in two messages to exercise more_body.
+    incoming: list[Message] = [
+        {"type": "http.request", "body": body[:3], "more_body": True},
+        {"type": "http.request", "body": body[3:], "more_body": False}
+    ]
+    sent: list[Message] = []
+
+    async def receive() -> Message:
+        return incoming.pop(0)
+
+    async def send(message: Message) -> None:
+        sent.append(message)
+
+    run(adapter(scope, receive, send))
+    assert sent[0]["type"] == "http.response.start"
+    assert all(m["type"] == "http.response.body" for m in sent[1:])
+    assert all(m["more_body"] for m in sent[1:-1])
+    assert not sent[-1]["more_body"]
+    response_headers: dict[str, str] = {k.decode("latin-1"): v.decode("latin-1") for k, v in sent[0]["headers"]}
+    return sent[0]["status"], response_headers, b"".join(m["body"] for m in sent[1:])
+
+
+def _json(body: bytes) -> Any:
+    return json.loads(body.decode("utf-8"))
+
+
+def test_asgi_adapter() -> None:
+    adapter: AsgiAdapter = AsgiAdapter(_app(), max_threads = 2)
+
+    status, headers, body = _call(adapter, "GET", "/ola/Mundão")
+    assert status == 200
+    assert headers["content-type"] == "application/json"
+    assert _json(body) == {"sucesso": True, "conteudo": "Olá, Mundão!", "status": 200}
+
+    payload: bytes = json.dumps({"nome": "Harry"}).encode("utf-8")
+    status, _, body = _call(adapter, "POST", "/eco", payload, [(b"content-type", b"application/json")])
+    assert status == 200
+    assert _json(body) == {"sucesso": True, "conteudo": {"nome": "Harry"}, "status": 200}
+
+    status, _, body = _call(adapter, "GET", "/fluxo")
+    assert status == 200
+    assert _json(body)["conteudo"] == {"numeros": list(range(1000))}
+
+    status, _, body = _call(adapter, "POST", "/nada")
+    assert status == 200
+
+    status, _, body = _call(adapter, "GET", "/map")
+    assert status == 200
+    assert b"async function ola(" in body
+
+    status, _, _ = _call(adapter, "GET", "/nao-existe")
+    assert status == 404
+
+    status, _, _ = _call(adapter, "GET", "/quebrado")
+    assert status == 500
+
+
+# HTTP/2 servers may send each cookie in a header of its own.
+def test_asgi_cookies() -> None:
+    app: Flask = Flask(__name__)
+    ws: WebSuite = WebSuite(app, "/map")
+
+    @ws.route("GET", "/biscoitos")
+    @jsoner
+    def biscoitos() -> dict[str, str]:
+        return dict(request.cookies)
+
+    headers: list[tuple[bytes, bytes]] = [(b"cookie", b"a=1"), (b"accept", b"text/plain"), (b"cookie", b"b=2; c=3")]
+    status, _, body = _call(AsgiAdapter(app), "GET", "/biscoitos", headers = headers)
+    assert status == 200
+    assert _json(body)["conteudo"] == {"a": "1", "b": "2", "c": "3"}
+
+
+def test_asgi_lifespan() -> None:
+    adapter: AsgiAdapter = AsgiAdapter(_app())
+    incoming: list[Message] = [{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}]
+    sent: list[Message] = []
+
+    async def receive() -> Message:
+        return incoming.pop(0)
+
+    async def send(message: Message) -> None:
+        sent.append(message)
+
+    run(adapter({"type": "lifespan"}, receive, send))
+    assert sent == [{"type": "lifespan.startup.complete"}, {"type": "lifespan.shutdown.complete"}]
+
+
+def test_asgi_client_gone() -> None:
+    app: Flask = Flask(__name__)
+    ws: WebSuite = WebSuite(app, "/map")
+    fechado: list[bool] = []
+
+    @ws.route("GET", "/infinito")
+    @jsoner
+    def infinito() -> Fluxo:
+        def gerar() -> Iterator[int]:
+            try:
+                i: int = 0
+                while True:
+                    yield i
+                    i += 1
+            finally:
+                fechado.append(True)
+        return Fluxo("numeros", gerar())
+
+    adapter: AsgiAdapter = AsgiAdapter(app, max_threads = 1, queue_size = 2)
+    scope: Scope = {"type": "http", "method": "GET", "path": "/infinito", "query_string": b"", "headers": []}
+    sent: list[Message] = []
+
+    async def receive() -> Message:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: Message) -> None:
+        if len(sent) == 5:
+            raise ConnectionResetError()
+        sent.append(message)
+
+    with raises(ConnectionResetError):
+        run(adapter(scope, receive, send))
+    assert fechado == [True]
+
+
+def test_asgi_body_too_large() -> None:
+    adapter: AsgiAdapter = AsgiAdapter(_app(), max_body_length = 16)
+    scope: Scope = {"type": "http", "method": "POST", "path": "/eco", "query_string": b"", "headers": []}
+    received: list[int] = []
+    sent: list[Message] = []
+
+    # A chunked body, without Content-Length, that would never end.
+    async def receive() -> Message:
+        received.append(1)
+        return {"type": "http.request", "body": b"1234", "more_body": True}
+
+    async def send(message: Message) -> None:
+        sent.append(message)
+
+    run(adapter(scope, receive, send))
+    assert len(received) == 5
+    assert sent[0]["status"] == 413
+    assert _json(sent[1]["body"])["tipo"] == "ConteudoMuitoGrandeException"
+
+    received.clear()
+    sent.clear()
+    scope["headers"] = [(b"content-length", b"17")]
+    run(adapter(scope, receive, send))
+    assert received == []
+    assert sent[0]["status"] == 413
+
+    # Right at the limit.
+    status, _, body = _call(adapter, "POST", "/eco", b'{"nome":"Harry"}', [(b"content-type", b"application/json")])
+    assert status == 200
+    assert _json(body)["conteudo"] == {"nome": "Harry"}
@@ -1,5 +1,5 @@
-from typing import cast, Sequence
-from connection.conn import RAW_DATA, MisplacedOperationError, UnsupportedOperationError
+from typing import cast, Iterator, Sequence
+from connection.conn import Descriptor, RAW_DATA, MisplacedOperationError, UnsupportedOperationError
 from connection.trans import TransactedConnection
 from pytest import raises
 from dataclasses import dataclass
@@ -170,6 +170,27 @@ def test_fetchmany_class_lambda(c: TransactedConnection) -> None:
     assert p3 == []
 
 
+@applier_trans(dbs_f, assert_dbf_ok)
+def test_iter_class(c: TransactedConnection) -> None:
+    it: Iterator[Fruit] = c.execute_streaming("SELECT pk_fruit, name FROM fruit ORDER BY pk_fruit").iter_class(Fruit, 2)
+    assert next(it) == Fruit(1, "orange")
+    assert list(it) == [Fruit(2, "strawberry"), Fruit(3, "lemon")]
+
+
+@applier_trans(dbs_f, assert_dbf_ok)
+def test_iter_class_empty(c: TransactedConnection) -> None:
+    it: Iterator[Fruit] = c.execute_streaming("SELECT pk_fruit, name FROM fruit WHERE pk_fruit = 666").iter_class(Fruit)
+    assert list(it) == []
+
+
+@applier_trans(dbs_f, assert_dbf_ok)
+def test_iter_class_abandoned(c: TransactedConnection) -> None:
+    it: Iterator[Fruit] = c.execute_streaming("SELECT pk_fruit, name FROM fruit ORDER BY pk_fruit").iter_class(Fruit, 1)
+    assert next(it) == Fruit(1, "orange")
+    c.execute("SELECT pk_fruit, name FROM fruit WHERE pk_fruit = 3")
+    assert c.fetchall_class(Fruit) == [Fruit(3, "lemon")]
+
+
 @applier(dbs_f, assert_dbf_ok)
 def test_execute_insert(db: DbTestConfig) -> None:
     conn: TransactedConnection = db.conn
@@ -364,6 +385,26 @@ def test_description_trans(c: TransactedConnection) -> None:
         assert f == Fruit(5, "watermelon")
 
 
+@applier(dbs_f, assert_dbf_ok)
+def test_description_memoized(db: DbTestConfig) -> None:
+    with db.conn as c:
+        c.execute("SELECT pk_fruit, name FROM fruit WHERE pk_fruit < 3 ORDER BY pk_fruit")
+        assert c.fetchone_class(Fruit) == Fruit(1, "orange")
+        d1: Descriptor = c.description
+        assert c.fetchone_class(Fruit) == Fruit(2, "strawberry")
+        assert c.description is d1
+
+        c.execute("SELECT name FROM fruit WHERE pk_fruit = 1")
+        c.fetchone()
+        d2: Descriptor = c.description
+        assert d2 is not d1
+        assert [d2.column_names[i] for i in range(len(d2.column_names))] == ["name"]
+
+        c.execute("SELECT pk_fruit, name FROM fruit WHERE pk_fruit = 3")
+        assert c.fetchone_class(Fruit) == Fruit(3, "lemon")
+        assert c.description is d1
+
+
 @applier(dbs_f, assert_dbf_ok)
 def test_description_nonfetched_1(db: DbTestConfig) -> None:
     with db.conn as c:
@@ -1,4 +1,5 @@
-from typing import Sequence
+from typing import Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from connection.conn import RAW_DATA, IntegrityViolationException, TransactionNotActiveException
 from connection.trans import TransactedConnection
 from pytest import raises
@@ -107,6 +108,27 @@ def test_transact_rollback(db: DbTestConfig) -> None:
         assert all == [(1, "orange"), (2, "strawberry"), (3, "lemon")]
 
 
+@applier(dbs_f, assert_dbf_ok)
+def test_transact_generator(db: DbTestConfig) -> None:
+    conn: TransactedConnection = db.conn
+
+    @conn.transact
+    def x() -> Iterator[RAW_DATA]:
+        conn.execute("SELECT name FROM fruit ORDER BY pk_fruit")
+        while True:
+            t: tuple[RAW_DATA, ...] | None = conn.fetchone()
+            if t is None:
+                return
+            yield t[0]
+
+    g: Iterator[RAW_DATA] = x()
+    assert conn.reenter_count == 0
+    assert next(g) == "orange"
+    assert conn.reenter_count == 1
+    assert list(g) == ["strawberry", "lemon"]
+    assert conn.reenter_count == 0
+
+
 @applier(dbs_f, assert_dbf_ok)
 def test_no_transaction(db: DbTestConfig) -> None:
     conn: TransactedConnection = db.conn
@@ -135,6 +157,45 @@ def test_transaction_nesting_counting(db: DbTestConfig) -> None:
     assert not conn.is_active
 
 
+@applier(dbs_f, assert_dbf_ok)
+def test_transaction_scope(db: DbTestConfig) -> None:
+    conn: TransactedConnection = db.conn
+
+    with raises(TransactionNotActiveException):
+        conn.scope
+    with conn as c1:
+        c1.scope["x"] = 1
+        with conn as c2:
+            assert c2.scope == {"x": 1}
+            c2.scope["y"] = 2
+        assert c1.scope == {"x": 1, "y": 2}
+    with raises(TransactionNotActiveException):
+        conn.scope
+    with conn as c3:
+        assert c3.scope == {}
+
+
+@applier(dbs_f, assert_dbf_ok)
+def test_after_commit(db: DbTestConfig) -> None:
+    conn: TransactedConnection = db.conn
+    done: list[str] = []
+
+    with raises(TransactionNotActiveException):
+        conn.after_commit(lambda: done.append("never"))
+    with conn as c1:
+        with conn as c2:
+            c2.after_commit(lambda: done.append(f"inner {conn.is_active}"))
+        assert done == []
+        c1.after_commit(lambda: done.append(f"outer {conn.is_active}"))
+    assert done == ["inner False", "outer False"]
+
+    with raises(ValueError):
+        with conn as c3:
+            c3.after_commit(lambda: done.append("rolled back"))
+            raise ValueError()
+    assert done == ["inner False", "outer False"]
+
+
 @applier(dbs_f, assert_dbf_ok)
 def test_transaction_nesting_inheritance(db: DbTestConfig) -> None:
     conn: TransactedConnection = db.conn
@@ -147,6 +208,45 @@ def test_transaction_nesting_inheritance(db: DbTestConfig) -> None:
         assert t == (4, "melon")
 
 
+@applier(dbs_f, assert_dbf_ok)
+def test_transaction_per_thread(db: DbTestConfig) -> None:
+    conn: TransactedConnection = db.conn
+
+    def elsewhere() -> bool:
+        return conn.is_active
+
+    with conn:
+        assert conn.is_active
+        with ThreadPoolExecutor(1) as executor:
+            assert not executor.submit(elsewhere).result()
+
+
+@applier(dbs_f, assert_dbf_ok)
+def test_transaction_propagate(db: DbTestConfig) -> None:
+    conn: TransactedConnection = db.conn
+
+    def insert() -> int:
+        with conn as c:
+            assert c.reenter_count == 2
+            c.execute("INSERT INTO fruit (name) VALUES ('melon')")
+            return c.asserted_lastrowid
+
+    with raises(TransactionNotActiveException):
+        conn.propagate(insert)
+
+    with conn as c1:
+        c1.scope["x"] = 1
+        with ThreadPoolExecutor(1) as executor:
+            assert executor.submit(c1.propagate(insert)).result() == 4
+            assert executor.submit(c1.propagate(lambda: conn.scope["x"])).result() == 1
+            assert not executor.submit(lambda: conn.is_active).result()
+        assert c1.reenter_count == 1
+
+    with conn as c2:
+        c2.execute("SELECT pk_fruit, name FROM fruit WHERE pk_fruit = 4")
+        assert c2.fetchone() == (4, "melon")
+
+
 @applier(dbs_f, assert_dbf_ok)
 def test_autocommit(db: DbTestConfig) -> None:
     conn: TransactedConnection = db.conn
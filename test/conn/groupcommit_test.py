@@ -0,0 +1,191 @@
+from typing import Iterator
+from contextvars import ContextVar
+from pathlib import Path
+from sqlite3 import OperationalError
+from threading import Barrier, current_thread, Thread
+from connection.conn import IntegrityViolationException, UnsupportedOperationError
+from connection.groupcommit import GroupCommitConnection
+from connection.sqlite3conn import SqliteConnectionData
+from connection.trans import read_only
+from pytest import raises
+
+
+def _connect(tmp_path: Path, size: int = 32, delay: int = 2) -> GroupCommitConnection:
+    file_name: str = str(tmp_path / "fruits.db")
+    with SqliteConnectionData.create(file_name = file_name, profile = "server").connect() as c:
+        c.execute("CREATE TABLE fruit (pk_fruit INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL UNIQUE)")
+        c.execute("INSERT INTO fruit (name) VALUES ('orange')")
+    data: SqliteConnectionData = SqliteConnectionData.create(
+        file_name = file_name,
+        profile = "server",
+        group_commit = True,
+        group_commit_size = size,
+        group_commit_delay = delay
+    )
+    conn = data.connect()
+    assert isinstance(conn, GroupCommitConnection)
+    return conn
+
+
+def _names(conn: GroupCommitConnection) -> list[str]:
+    @conn.transact
+    @read_only
+    def names() -> list[str]:
+        conn.execute("SELECT name FROM fruit ORDER BY pk_fruit")
+        return [str(r[0]) for r in conn.fetchall()]
+    return names()
+
+
+def test_group_commit(tmp_path: Path) -> None:
+    conn: GroupCommitConnection = _connect(tmp_path, size = 8, delay = 500)
+    barrier: Barrier = Barrier(8)
+    results: dict[str, int] = {}
+
+    @conn.transact
+    def insert(name: str) -> int:
+        assert conn.reenter_count == 1
+        conn.execute("INSERT INTO fruit (name) VALUES (?)", [name])
+        return conn.asserted_lastrowid
+
+    def work(name: str) -> None:
+        barrier.wait()
+        results[name] = insert(name)
+
+    threads: list[Thread] = [Thread(target = work, args = (f"fruit {i}", )) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    conn.stop()
+
+    assert sorted(results.values()) == list(range(2, 10))
+    assert sorted(_names(conn)) == sorted(["orange"] + [f"fruit {i}" for i in range(8)])
+    batches, commits = conn.commit_statistics
+    assert commits == 8
+    assert batches < 8
+
+
+def test_failure_is_isolated(tmp_path: Path) -> None:
+    conn: GroupCommitConnection = _connect(tmp_path, size = 4, delay = 500)
+    barrier: Barrier = Barrier(4)
+    errors: dict[str, BaseException] = {}
+
+    @conn.transact
+    def insert(name: str) -> None:
+        conn.execute("INSERT INTO fruit (name) VALUES (?)", [name + " (half)"])
+        conn.execute("INSERT INTO fruit (name) VALUES (?)", [name])
+
+    def work(name: str) -> None:
+        barrier.wait()
+        try:
+            insert(name)
+        except BaseException as x:
+            errors[name] = x
+
+    threads: list[Thread] = [Thread(target = work, args = (name, )) for name in ["lemon", "orange", "grape", "banana"]]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    conn.stop()
+
+    assert list(errors.keys()) == ["orange"]
+    assert isinstance(errors["orange"], IntegrityViolationException)
+    assert sorted(_names(conn)) == sorted(["orange", "lemon (half)", "lemon", "grape (half)", "grape", "banana (half)", "banana"])
+
+
+def test_nested_and_context(tmp_path: Path) -> None:
+    conn: GroupCommitConnection = _connect(tmp_path)
+    var: ContextVar[str] = ContextVar("var", default = "none")
+
+    @conn.transact
+    def inner(name: str) -> int:
+        assert conn.reenter_count == 1
+        conn.execute("INSERT INTO fruit (name) VALUES (?)", [name])
+        return conn.asserted_lastrowid
+
+    @conn.transact
+    def outer() -> tuple[int, str]:
+        conn.scope["x"] = 1
+        pk: int = inner(var.get())
+        assert conn.scope["x"] == 1
+        return pk, var.get()
+
+    var.set("strawberry")
+    assert outer() == (2, "strawberry")
+    assert not conn.is_active
+    assert _names(conn) == ["orange", "strawberry"]
+    conn.stop()
+
+    # The writer starts again when needed.
+    var.set("lemon")
+    assert outer() == (3, "lemon")
+    conn.stop()
+
+
+def test_after_commit(tmp_path: Path) -> None:
+    conn: GroupCommitConnection = _connect(tmp_path)
+    done: list[tuple[str, bool]] = []
+
+    @conn.transact
+    def insert(name: str) -> None:
+        conn.execute("INSERT INTO fruit (name) VALUES (?)", [name])
+        conn.after_commit(lambda: done.append((current_thread().name, conn.is_active)))
+
+    insert("lemon")
+    assert done == [(current_thread().name, False)]
+    with raises(IntegrityViolationException):
+        insert("orange")
+    assert len(done) == 1
+    conn.stop()
+
+
+def test_read_only(tmp_path: Path) -> None:
+    conn: GroupCommitConnection = _connect(tmp_path)
+
+    @conn.transact
+    @read_only
+    def sneaky() -> None:
+        conn.execute("INSERT INTO fruit (name) VALUES ('lemon')")
+
+    with raises(OperationalError):
+        sneaky()
+    with raises(OperationalError):
+        with conn as c:
+            c.execute("INSERT INTO fruit (name) VALUES ('lemon')")
+    assert _names(conn) == ["orange"]
+
+    @conn.transact
+    @read_only
+    def stream() -> Iterator[str]:
+        conn.execute("SELECT name FROM fruit")
+        for r in conn.fetchall():
+            yield str(r[0])
+
+    assert list(stream()) == ["orange"]
+
+    def writer_stream() -> Iterator[str]:
+        yield "x"
+
+    with raises(UnsupportedOperationError):
+        conn.transact(writer_stream)
+    conn.stop()
+
+
+def test_script(tmp_path: Path) -> None:
+    conn: GroupCommitConnection = _connect(tmp_path)
+
+    @conn.transact
+    def script(last: str) -> None:
+        conn.executescript(
+            "INSERT INTO fruit (name) VALUES ('lemon; lime');\n"
+            "CREATE TRIGGER IF NOT EXISTS no_grape BEFORE INSERT ON fruit WHEN new.name = 'grape' BEGIN SELECT RAISE(ABORT, 'no; grape'); END;\n"
+            f"INSERT INTO fruit (name) VALUES ('{last}');\n"
+        )
+
+    script("strawberry")
+    assert _names(conn) == ["orange", "lemon; lime", "strawberry"]
+    with raises(IntegrityViolationException):
+        script("grape")
+    assert _names(conn) == ["orange", "lemon; lime", "strawberry"]
+    conn.stop()
@@ -2,6 +2,7 @@ from typing import Any
 from pytest import raises
 from connection.conn import ColumnDescriptor, Descriptor, NullStatus, TypeCode
 from dataclasses import dataclass
+from enum import Enum
 from validator import dataclass_validate
 from connection.inflater import ColumnNames
 from dacite.exceptions import MissingValueError, WrongTypeError, UnexpectedDataError
@@ -596,3 +597,75 @@ def test_rows_to_classes_lambda_mixed_data() -> None:
 
     with raises(ValueError, match = "^Column descriptions and rows do not have the same length.$"):
         columns.rows_to_classes_lambda(make, rows)
+
+
+# Tests of the compiled inflaters
+
+class Ripeness(Enum):
+    GREEN = 1
+    RIPE = 2
+
+
+@dataclass_validate
+@dataclass(frozen = True)
+class FruitBasket:
+    name: str
+    ripeness: Ripeness
+    weight: float | None
+    count: int = 12
+
+
+def test_row_to_class_columns_out_of_order() -> None:
+    columns: ColumnNames = make_columns(["grape", "lemon", "strawberry"])
+    result: FruitSalad = columns.row_to_class(FruitSalad, (27, 1, "xyz"))
+    assert result == FruitSalad(1, "xyz", 27)
+
+
+def test_row_to_class_enum_optional_and_default() -> None:
+    columns: ColumnNames = make_columns(["ripeness", "weight", "name"])
+    rows: list[tuple[Any, ...]] = [(2, None, "apple"), (1, 3.5, "pear")]
+    result: list[FruitBasket] = columns.rows_to_classes(FruitBasket, rows)
+    assert result == [FruitBasket("apple", Ripeness.RIPE, None, 12), FruitBasket("pear", Ripeness.GREEN, 3.5, 12)]
+
+
+def test_row_to_class_optional_type_mismatch() -> None:
+    columns: ColumnNames = make_columns(["ripeness", "weight", "name"])
+    with raises(WrongTypeError):
+        columns.row_to_class(FruitBasket, (2, "heavy", "apple"))
+
+
+def test_row_to_class_bad_enum() -> None:
+    columns: ColumnNames = make_columns(["ripeness", "weight", "name"])
+    with raises(ValueError):
+        columns.row_to_class(FruitBasket, (3, None, "apple"))
+
+
+def test_rows_to_classes_no_rows_name_mismatch() -> None:
+    columns: ColumnNames = make_columns(["lemon", "orange", "grape"])
+    assert columns.rows_to_classes(FruitSalad, []) == []
+
+
+# Not validated, since the validator is stricter than dacite about the numeric tower.
+@dataclass(frozen = True)
+class Scale:
+    weight: float
+    tare: float | None
+    impedance: complex
+    label: str | None
+
+
+def test_row_to_class_numeric_tower() -> None:
+    columns: ColumnNames = make_columns(["weight", "tare", "impedance", "label"])
+    result: Scale = columns.row_to_class(Scale, (3, 1, 2, "kitchen"))
+    assert result == Scale(3, 1, 2, "kitchen")
+    assert columns.row_to_class(Scale, (3.5, None, 1.5 + 2j, None)) == Scale(3.5, None, 1.5 + 2j, None)
+    with raises(WrongTypeError):
+        columns.row_to_class(Scale, ("3", None, 2, None))
+
+
+def test_row_to_class_missing_optional() -> None:
+    columns: ColumnNames = make_columns(["impedance", "weight"])
+    assert columns.row_to_class(Scale, (2, 3.5)) == Scale(3.5, None, 2, None)
+    assert columns.rows_to_classes(Scale, [(2, 3.5), (1, 1)]) == [Scale(3.5, None, 2, None), Scale(1, None, 1, None)]
+    with raises(MissingValueError):
+        make_columns(["tare", "label"]).row_to_class(Scale, (None, None))
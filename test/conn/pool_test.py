@@ -0,0 +1,170 @@
+from typing import Sequence
+from pathlib import Path
+from connection.conn import BadDatabaseConfigException, IntegrityViolationException, PoolExhaustedException, RAW_DATA, SimpleConnection
+from connection.load import DatabaseConfig
+from connection.pool import ConnectionPool, PoolConfig, PooledConnectionData, PooledTransactedConnection
+from connection.sqlite3conn import SqliteConnectionData
+from connection.trans import TransactedConnection
+from pytest import raises
+from threading import Thread
+
+
+_fruits: SqliteConnectionData = SqliteConnectionData.create(file_name = "test/fruits-ok.db")
+
+
+class _Clock:
+
+    def __init__(self) -> None:
+        self.now: float = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_borrow_reuses_connection() -> None:
+    pool: ConnectionPool = ConnectionPool(_fruits.make_connection, PoolConfig(max_size = 2))
+    c1: SimpleConnection = pool.borrow()
+    raw: object = c1.raw_connection
+    assert pool.statistics.borrowed == 1
+    c1.close()
+    c1.close()
+    assert pool.statistics.borrowed == 0
+    assert pool.statistics.idle == 1
+    c2: SimpleConnection = pool.borrow()
+    assert c2.raw_connection is raw
+    c2.close()
+    assert pool.statistics.created == 1
+    pool.close()
+    assert pool.statistics.idle == 0
+
+
+def test_min_size_prefills() -> None:
+    pool: ConnectionPool = ConnectionPool(_fruits.make_connection, PoolConfig(min_size = 2, max_size = 3))
+    assert pool.statistics.created == 2
+    assert pool.statistics.idle == 2
+    pool.close()
+
+
+def test_acquire_timeout() -> None:
+    pool: ConnectionPool = ConnectionPool(_fruits.make_connection, PoolConfig(max_size = 1, acquire_timeout = 0.05))
+    c1: SimpleConnection = pool.borrow()
+    with raises(PoolExhaustedException):
+        pool.borrow()
+    assert pool.statistics.timeouts == 1
+    assert pool.statistics.waits == 1
+    c1.close()
+    pool.close()
+
+
+def test_waiter_gets_returned_connection() -> None:
+    pool: ConnectionPool = ConnectionPool(_fruits.make_connection, PoolConfig(max_size = 1, acquire_timeout = 5.0))
+    c1: SimpleConnection = pool.borrow()
+    got: list[SimpleConnection] = []
+    t: Thread = Thread(target = lambda: got.append(pool.borrow()))
+    t.start()
+    while pool.statistics.waits == 0:
+        pass
+    c1.close()
+    t.join()
+    assert len(got) == 1
+    assert pool.statistics.created == 1
+    assert pool.statistics.max_wait_time > 0
+    got[0].close()
+    pool.close()
+
+
+def test_health_check_discards_broken_connection() -> None:
+    pool: ConnectionPool = ConnectionPool(_fruits.make_connection, PoolConfig(max_size = 1))
+    c1: SimpleConnection = pool.borrow()
+    c1.close()
+    c1.raw_connection.close()  # type: ignore
+    c2: SimpleConnection = pool.borrow()
+    t: tuple[RAW_DATA, ...] | None = c2.execute("SELECT 1").fetchone()
+    assert t == (1, )
+    assert pool.statistics.created == 2
+    assert pool.statistics.discarded == 1
+    c2.close()
+    pool.close()
+
+
+def test_max_lifetime_and_idle_timeout() -> None:
+    clock: _Clock = _Clock()
+    pool: ConnectionPool = ConnectionPool(_fruits.make_connection, PoolConfig(min_size = 1, max_size = 2, idle_timeout = 10.0, max_lifetime = 100.0), clock)
+    c1: SimpleConnection = pool.borrow()
+    c2: SimpleConnection = pool.borrow()
+    c1.close()
+    c2.close()
+    assert pool.statistics.idle == 2
+
+    clock.now = 50
+    pool.borrow().close()
+    assert pool.statistics.discarded == 1
+    assert pool.statistics.idle == 1
+
+    clock.now = 150
+    pool.borrow().close()
+    assert pool.statistics.discarded == 2
+    assert pool.statistics.created == 3
+    pool.close()
+
+
+def test_pooled_transacted_connection() -> None:
+    d: DatabaseConfig = DatabaseConfig("sqlite", {"file_name": "test/fruits-ok.db"}, {"max_size": 2, "idle_timeout": 60})
+    conn: TransactedConnection = d.connect()
+    assert isinstance(conn, PooledTransactedConnection)
+    for _ in range(3):
+        with conn as c:
+            all: Sequence[tuple[RAW_DATA, ...]] = c.execute("SELECT pk_fruit, name FROM fruit ORDER BY pk_fruit").fetchall()
+            assert all == [(1, "orange"), (2, "strawberry"), (3, "lemon")]
+            assert conn.statistics.borrowed == 1
+    assert conn.statistics.borrowed == 0
+    assert conn.statistics.created == 1
+    conn.pool.close()
+
+
+# The deferred foreign key is only checked by the commit, which fails. The connection must go back to the pool anyway.
+def test_failed_commit_gives_back(tmp_path: Path) -> None:
+    file_name: str = str(tmp_path / "fk.db")
+    with SqliteConnectionData.create(file_name = file_name).connect() as c:
+        c.execute("CREATE TABLE parent (pk INTEGER PRIMARY KEY)")
+        c.execute("CREATE TABLE child (pk INTEGER PRIMARY KEY, fk INTEGER NOT NULL REFERENCES parent (pk) DEFERRABLE INITIALLY DEFERRED)")
+    data: SqliteConnectionData = SqliteConnectionData.create(file_name = file_name)
+    conn: PooledTransactedConnection = PooledConnectionData.create(inner = data, config = PoolConfig(max_size = 1)).connect()
+    callbacks: list[str] = []
+
+    with raises(IntegrityViolationException):
+        with conn as c:
+            conn.after_commit(lambda: callbacks.append("committed"))
+            c.execute("INSERT INTO child (pk, fk) VALUES (1, 42)")
+    assert conn.statistics.borrowed == 0
+    assert not conn.is_active
+    assert callbacks == []
+
+    with conn as c:
+        c.execute("INSERT INTO parent (pk) VALUES (42)")
+        c.execute("INSERT INTO child (pk, fk) VALUES (1, 42)")
+    with data.connect() as c:
+        assert c.execute("SELECT pk, fk FROM child").fetchall() == [(1, 42)]
+    conn.pool.close()
+
+
+def test_pool_from_json() -> None:
+    d: DatabaseConfig = DatabaseConfig.from_json('{"flavor": "sqlite", "properties": {"file_name": "test/fruits-ok.db"}, "pool": {"min_size": 1}}')
+    conn: TransactedConnection = d.connect()
+    assert isinstance(conn, PooledTransactedConnection)
+    assert conn.pool.config == PoolConfig(min_size = 1)
+    conn.pool.close()
+
+
+def test_bad_pool_config() -> None:
+    with raises(BadDatabaseConfigException):
+        DatabaseConfig("sqlite", {"file_name": "test/fruits-ok.db"}, {"pikachu": 1}).connect()
+    with raises(BadDatabaseConfigException):
+        DatabaseConfig("sqlite", {"file_name": "test/fruits-ok.db"}, {"min_size": 3, "max_size": 2}).connect()
+
+
+def test_pooled_connection_data() -> None:
+    d: PooledConnectionData = PooledConnectionData.create(inner = _fruits, config = PoolConfig())
+    assert d.placeholder == "?"
+    assert d.database_type == "Sqlite"
+    assert d.database_name == "test/fruits-ok.db"
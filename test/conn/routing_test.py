@@ -0,0 +1,230 @@
+from typing import Any, Iterator
+from gc import collect
+from weakref import ref, ReferenceType
+from contextvars import Context, copy_context
+from json import dumps
+from pathlib import Path
+from connection.conn import BadDatabaseConfigException
+from connection.load import DatabaseConfig
+from connection.pool import PoolConfig
+from connection.routing import RoutingConnectionData, RoutingStatistics, RoutingTransactedConnection, WriteTracker
+from connection.sqlite3conn import SqliteConnectionData
+from connection.trans import ConnectionData, read_only, TransactedConnection
+from pytest import raises
+
+
+# Each database knows its own name, so the tests can tell where each transaction went.
+def _node(tmp_path: Path, name: str, ro: bool) -> SqliteConnectionData:
+    file_name: str = str(tmp_path / f"{name}.db")
+    with SqliteConnectionData.create(file_name = file_name).connect() as c:
+        c.execute("CREATE TABLE node (name TEXT NOT NULL)")
+        c.execute("INSERT INTO node (name) VALUES (?)", [name])
+    return SqliteConnectionData.create(file_name = file_name, read_only = ro)
+
+
+def _data(tmp_path: Path, stickiness: float = 60.0) -> RoutingConnectionData:
+    replicas: list[ConnectionData] = [_node(tmp_path, "replica 1", True), _node(tmp_path, "replica 2", True)]
+    return RoutingConnectionData.create(primary = _node(tmp_path, "primary", False), replicas = replicas, stickiness = stickiness)
+
+
+def _where(conn: TransactedConnection) -> str:
+    conn.execute("SELECT name FROM node")
+    return ", ".join(str(r[0]) for r in conn.fetchall())
+
+
+def test_reads_go_to_replicas(tmp_path: Path) -> None:
+    conn: RoutingTransactedConnection = _data(tmp_path).connect()
+
+    @conn.transact
+    @read_only
+    def where() -> str:
+        return _where(conn)
+
+    assert [where() for _ in range(4)] == ["replica 1", "replica 2", "replica 1", "replica 2"]
+    assert conn.statistics == RoutingStatistics(0, [2, 2], [0, 0])
+
+    @conn.transact
+    def where_rw() -> str:
+        return _where(conn)
+
+    assert where_rw() == "primary"
+    with conn as c:
+        assert _where(c) == "primary"
+
+
+def test_least_outstanding(tmp_path: Path) -> None:
+    conn: RoutingTransactedConnection = _data(tmp_path).connect()
+
+    @conn.transact
+    @read_only
+    def where() -> str:
+        return _where(conn)
+
+    @conn.transact
+    @read_only
+    def stream() -> Iterator[str]:
+        yield _where(conn)
+        yield _where(conn)
+
+    # While the stream is not over, its transaction is active in its context. So, it runs in a context of its own.
+    ctx: Context = copy_context()
+    s: Iterator[str] = stream()
+    assert ctx.run(next, s) == "replica 1"
+    assert conn.statistics.outstanding == [1, 0]
+    assert [where() for _ in range(3)] == ["replica 2", "replica 2", "replica 2"]
+    assert ctx.run(next, s) == "replica 1"
+    assert ctx.run(list, s) == []
+    assert conn.statistics == RoutingStatistics(0, [1, 3], [0, 0])
+
+
+def test_read_your_writes(tmp_path: Path) -> None:
+    conn: RoutingTransactedConnection = _data(tmp_path).connect()
+
+    @conn.transact
+    @read_only
+    def where() -> str:
+        return _where(conn)
+
+    @conn.transact
+    def write(name: str) -> str:
+        conn.execute("UPDATE node SET name = ?", [name])
+        return where()
+
+    assert where() == "replica 1"
+    # A read nested into a write stays in the primary, and so do the reads of the session after the write.
+    assert write("primary (changed)") == "primary (changed)"
+    assert where() == "primary (changed)"
+    assert conn.statistics.reads_on_primary == 1
+
+    # Other sessions still read from the replicas.
+    conn.session_key = lambda: "someone else"
+    assert where() == "replica 2"
+    conn.session_key = lambda: "me"
+    assert write("primary (again)") == "primary (again)"
+    assert where() == "primary (again)"
+
+
+def _read_and_write(conn: RoutingTransactedConnection) -> None:
+    @conn.transact
+    @read_only
+    def where() -> str:
+        return _where(conn)
+
+    @conn.transact
+    def write() -> None:
+        conn.execute("UPDATE node SET name = name")
+
+    where()
+    write()
+    where()
+
+
+# The connections share the same context variables, so creating more connections does not put more variables in the context.
+def test_no_context_variables_per_connection(tmp_path: Path) -> None:
+    data: RoutingConnectionData = _data(tmp_path)
+    _read_and_write(data.connect())
+    before: int = len(copy_context())
+    for _ in range(3):
+        _read_and_write(data.connect())
+    assert len(copy_context()) == before
+
+
+# The state kept in the context for each connection does not keep it alive after it is gone.
+def test_connection_is_freed(tmp_path: Path) -> None:
+    conn: RoutingTransactedConnection = _data(tmp_path).connect()
+    _read_and_write(conn)
+    freed: ReferenceType[RoutingTransactedConnection] = ref(conn)
+    del conn
+    collect()
+    assert freed() is None
+
+
+# Stands for the session cookie, which goes with the client to whichever process serves it.
+class _Cookie(WriteTracker):
+
+    def __init__(self) -> None:
+        self.last: float | None = None
+
+    def wrote(self) -> None:
+        self.last = 0.0
+
+    def wrote_within(self, seconds: float) -> bool:
+        return self.last is not None
+
+
+# Two connections to the same databases stand for two worker processes.
+def test_write_tracker(tmp_path: Path) -> None:
+    data: RoutingConnectionData = _data(tmp_path)
+    first: RoutingTransactedConnection = data.connect()
+    second: RoutingTransactedConnection = data.connect()
+    cookie: _Cookie = _Cookie()
+    first.write_tracker = cookie
+    second.write_tracker = cookie
+    assert second.write_tracker is cookie
+
+    @second.transact
+    @read_only
+    def where() -> str:
+        return _where(second)
+
+    assert where() == "replica 1"
+    with first as c:
+        c.execute("UPDATE node SET name = 'primary (changed)'")
+    assert cookie.last is not None
+    assert where() == "primary (changed)"
+
+    cookie.last = None
+    assert where() == "replica 2"
+
+
+def test_no_stickiness(tmp_path: Path) -> None:
+    conn: RoutingTransactedConnection = _data(tmp_path, stickiness = 0).connect()
+
+    @conn.transact
+    @read_only
+    def where() -> str:
+        return _where(conn)
+
+    with conn as c:
+        c.execute("UPDATE node SET name = 'primary (changed)'")
+    assert where() == "replica 1"
+
+
+def test_bad_config(tmp_path: Path) -> None:
+    primary: SqliteConnectionData = SqliteConnectionData.create(file_name = str(tmp_path / "primary.db"))
+    with raises(BadDatabaseConfigException):
+        RoutingConnectionData.create(primary = primary, replicas = [])
+    with raises(BadDatabaseConfigException):
+        RoutingConnectionData.create(primary = primary, replicas = [primary], stickiness = -1)
+
+
+def test_load(tmp_path: Path) -> None:
+    for name in ["primary", "replica 1", "replica 2"]:
+        _node(tmp_path, name, False)
+    props: dict[str, Any] = {
+        "flavor": "sqlite",
+        "properties": {"file_name": str(tmp_path / "primary.db"), "profile": "server"},
+        "pool": {"max_size": 2},
+        "routing": {
+            "stickiness": 1,
+            "replicas": [{"file_name": str(tmp_path / "replica 1.db"), "read_only": True}, {"file_name": str(tmp_path / "replica 2.db"), "read_only": True}]
+        }
+    }
+    config: DatabaseConfig = DatabaseConfig.from_json(dumps(props))
+    conn: TransactedConnection = config.connect()
+    assert isinstance(conn, RoutingTransactedConnection)
+    assert [p.config for p in conn.pools] == [PoolConfig(max_size = 2)] * 3
+
+    @conn.transact
+    @read_only
+    def where() -> str:
+        return _where(conn)
+
+    assert [where(), where()] == ["replica 1", "replica 2"]
+    for p in conn.pools:
+        p.close()
+
+    with raises(BadDatabaseConfigException):
+        DatabaseConfig.from_json('{"flavor": "sqlite", "properties": {"file_name": "x.db"}, "routing": {"replicas": "x.db"}}').connect()
+    with raises(BadDatabaseConfigException):
+        DatabaseConfig.from_json('{"flavor": "sqlite", "properties": {"file_name": "x.db"}, "routing": {"replicas": [{}], "lag": 3}}').connect()
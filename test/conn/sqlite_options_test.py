@@ -0,0 +1,78 @@
+from pathlib import Path
+from sqlite3 import OperationalError
+from connection.conn import BadDatabaseConfigException
+from connection.sqlite3conn import SqliteConnectionData
+from connection.trans import TransactedConnection
+from validator import set_validation_mode, ValidationMode
+from pytest import raises
+
+
+def _pragma(conn: TransactedConnection, name: str) -> object:
+    with conn as c:
+        c.execute(f"PRAGMA {name}")
+        row: tuple[object, ...] | None = c.fetchone()
+        assert row is not None
+        return row[0]
+
+
+def test_default_profile() -> None:
+    d: SqliteConnectionData = SqliteConnectionData.create(file_name = "x.db")
+    assert d == SqliteConnectionData("x.db")
+    assert d.pragmas == ["PRAGMA foreign_keys = ON;"]
+
+
+def test_server_profile() -> None:
+    d: SqliteConnectionData = SqliteConnectionData.create(file_name = "x.db", profile = "server", cache_size = -2000)
+    assert d.journal_mode == "WAL"
+    assert d.synchronous == "NORMAL"
+    assert d.busy_timeout == 5000
+    assert d.temp_store == "MEMORY"
+    assert d.cached_statements == 256
+    assert d.cache_size == -2000
+
+
+def test_bad_options() -> None:
+    with raises(BadDatabaseConfigException):
+        SqliteConnectionData.create(file_name = "x.db", profile = "turbo")
+    with raises(BadDatabaseConfigException):
+        SqliteConnectionData.create(file_name = "x.db", journal_mode = "WAL; DROP TABLE fruit")
+    with raises(BadDatabaseConfigException):
+        SqliteConnectionData.create(file_name = "x.db", synchronous = "SOMETIMES")
+    with raises(BadDatabaseConfigException):
+        SqliteConnectionData.create(file_name = "x.db", temp_store = "CLOUD")
+    with raises(BadDatabaseConfigException):
+        SqliteConnectionData.create(file_name = "x.db", busy_timeout = -1)
+
+
+def test_bad_options_without_validation() -> None:
+    set_validation_mode(ValidationMode.BOUNDARY)
+    try:
+        with raises(BadDatabaseConfigException):
+            SqliteConnectionData.create(file_name = ":memory:", journal_mode = "WAL; DROP TABLE x")
+    finally:
+        set_validation_mode(ValidationMode.FULL)
+
+
+def test_pragmas_applied(tmp_path: Path) -> None:
+    conn: TransactedConnection = SqliteConnectionData.create(file_name = str(tmp_path / "server.db"), profile = "server").connect()
+    assert _pragma(conn, "journal_mode") == "wal"
+    assert _pragma(conn, "synchronous") == 1
+    assert _pragma(conn, "busy_timeout") == 5000
+    assert _pragma(conn, "temp_store") == 2
+    assert _pragma(conn, "cache_size") == -64 * 1024
+    assert _pragma(conn, "foreign_keys") == 1
+
+
+def test_read_only(tmp_path: Path) -> None:
+    file_name: str = str(tmp_path / "read only.db")
+    with SqliteConnectionData.create(file_name = file_name).connect() as c:
+        c.execute("CREATE TABLE fruit (name TEXT NOT NULL)")
+        c.execute("INSERT INTO fruit (name) VALUES ('orange')")
+
+    ro: TransactedConnection = SqliteConnectionData.create(file_name = file_name, profile = "server", read_only = True).connect()
+    with ro as c:
+        c.execute("SELECT name FROM fruit")
+        assert c.fetchall() == [("orange", )]
+    with raises(OperationalError):
+        with ro as c:
+            c.execute("INSERT INTO fruit (name) VALUES ('lemon')")
@@ -0,0 +1,33 @@
+from pathlib import Path
+from shutil import copy2
+from flask import Flask
+from flask.testing import FlaskClient
+from werkzeug.test import TestResponse
+from connection.load import DatabaseConfig
+from cofre_de_senhas.controller import criar_app
+
+
+def _app(tmp_path: Path) -> Flask:
+    arquivo: Path = tmp_path / "cofre.db"
+    copy2("test/cofre-teste.db", arquivo)
+    return criar_app(DatabaseConfig("sqlite", {"file_name": str(arquivo)}))
+
+
+def _tipo(r: TestResponse) -> str:
+    return str(r.get_json()["tipo"])
+
+
+# As estatísticas das conexões são só para os administradores.
+def test_healthcheck_exige_admin(tmp_path: Path) -> None:
+    c: FlaskClient = _app(tmp_path).test_client()
+    for caminho in ["/healthcheck/pool", "/healthcheck/routing"]:
+        assert _tipo(c.get(caminho)) == "UsuarioNaoLogadoException"
+
+    assert c.post("/login", json = {"login": "Harry Potter", "senha": "alohomora"}).status_code == 200
+    for caminho in ["/healthcheck/pool", "/healthcheck/routing"]:
+        assert _tipo(c.get(caminho)) == "PermissaoNegadaException"
+
+    assert c.post("/login", json = {"login": "Dumbledore", "senha": "expecto patronum"}).status_code == 200
+    for caminho in ["/healthcheck/pool", "/healthcheck/routing"]:
+        r: TestResponse = c.get(caminho)
+        assert r.status_code == 200
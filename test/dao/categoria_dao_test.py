@@ -8,7 +8,7 @@ from ..fixtures import (
 )
 from connection.trans import TransactedConnection
 from connection.conn import IntegrityViolationException
-from cofre_de_senhas.dao import CategoriaDAO, CategoriaPK, DadosCategoria, DadosCategoriaSemPK, NomeCategoriaUK
+from cofre_de_senhas.dao import CategoriaDAO, CategoriaPK, DadosCategoria, DadosCategoriaSemPK, NomeCategoriaUK, BuscaPagina
 from cofre_de_senhas.categoria.categoria_dao_impl import CategoriaDAOImpl
 from pytest import raises
 
@@ -166,6 +166,15 @@ def test_listar_tudo(c: TransactedConnection) -> None:
     assert lido == todas_categorias
 
 
+@applier_trans(dbs, assert_db_ok)
+def test_listar_pagina(c: TransactedConnection) -> None:
+    dao: CategoriaDAO = CategoriaDAOImpl(c)
+    assert dao.listar_pagina(BuscaPagina(None, 4)) == todas_categorias[:4]
+    assert dao.listar_pagina(BuscaPagina(todas_categorias[3].pk_categoria, 4)) == todas_categorias[4:8]
+    assert dao.listar_pagina(BuscaPagina(todas_categorias[7].pk_categoria, 4)) == todas_categorias[8:]
+    assert dao.listar_pagina(BuscaPagina(None, 100)) == todas_categorias
+
+
 @applier_trans(dbs, assert_db_ok)
 def test_listar_tudo_apos_insercao(c: TransactedConnection) -> None:
     dao: CategoriaDAO = CategoriaDAOImpl(c)
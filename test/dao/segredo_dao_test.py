@@ -3,7 +3,7 @@ from ..fixtures import (
     dbs, assert_db_ok,
     todos_segredos, parte_segredos, visiv_segredos, harry_segredos, hermi_segredos,
     harry_potter, dumbledore, voldemort, hermione, snape, snape_sem_pk,
-    dbz, lotr, star_wars, oppenheimer, star_trek, star_trek_sem_pk,
+    segredo_m1, dbz, lotr, star_wars, oppenheimer, star_trek, star_trek_sem_pk,
     qa, aplicacao, integracao, producao,
     lixo1, lixo2, lixo3
 )
@@ -12,7 +12,8 @@ from connection.conn import IntegrityViolationException
 from cofre_de_senhas.dao import (
     CategoriaDAO, UsuarioDAO, SegredoDAO,
     BuscaPermissaoPorLogin, SegredoPK, DadosSegredo, DadosSegredoSemPK, CampoDeSegredo, PermissaoDeSegredo,
-    DadosCategoria, CategoriaDeSegredo, UsuarioPK, DadosUsuarioSemPK, LoginUsuarioUK
+    DadosCategoria, CategoriaDeSegredo, UsuarioPK, DadosUsuarioSemPK, LoginUsuarioUK,
+    AgregadoSegredo, DadosUsuarioComPermissao, BuscaSegredos
 )
 from cofre_de_senhas.categoria.categoria_dao_impl import CategoriaDAOImpl
 from cofre_de_senhas.segredo.segredo_dao_impl import SegredoDAOImpl
@@ -254,6 +255,36 @@ def test_criar_campo_segredo_duplicado(c: TransactedConnection) -> None:
     ]
 
 
+@applier_trans(dbs, assert_db_ok)
+def test_criar_campos_segredo(c: TransactedConnection) -> None:
+    dao: SegredoDAO = SegredoDAOImpl(c)
+    dao.criar_campos_segredo([
+        CampoDeSegredo(star_wars.pk_segredo, "Pequeno, mas poderoso", "Yoda"),
+        CampoDeSegredo(star_wars.pk_segredo, "Contrabandista", "Han Solo")
+    ])
+    dao.criar_campos_segredo([])
+    pk: SegredoPK = SegredoPK(star_wars.pk_segredo)
+    campos: list[CampoDeSegredo] = dao.ler_campos_segredo(pk)
+    assert campos == [
+        CampoDeSegredo(star_wars.pk_segredo, "Contrabandista", "Han Solo"),
+        CampoDeSegredo(star_wars.pk_segredo, "Nome do cara vestido de preto", "Darth Vader"),
+        CampoDeSegredo(star_wars.pk_segredo, "Nome do imperador", "Palpatine"),
+        CampoDeSegredo(star_wars.pk_segredo, "Pequeno, mas poderoso", "Yoda"),
+        CampoDeSegredo(star_wars.pk_segredo, "Robô chato e falastrão", "C3PO")
+    ]
+
+
+@applier_trans(dbs, assert_db_ok)
+def test_criar_campos_segredo_duplicado(c: TransactedConnection) -> None:
+    dao: SegredoDAO = SegredoDAOImpl(c)
+
+    with raises(IntegrityViolationException):
+        dao.criar_campos_segredo([
+            CampoDeSegredo(star_wars.pk_segredo, "Pequeno, mas poderoso", "Yoda"),
+            CampoDeSegredo(star_wars.pk_segredo, "Robô chato e falastrão", "R2D2")
+        ])
+
+
 @applier_trans(dbs, assert_db_ok)
 def test_criar_permissao(c: TransactedConnection) -> None:
     dao: SegredoDAO = SegredoDAOImpl(c)
@@ -268,6 +299,17 @@ def test_criar_permissao(c: TransactedConnection) -> None:
     assert perm1 == perm2
 
 
+@applier_trans(dbs, assert_db_ok)
+def test_criar_permissoes(c: TransactedConnection) -> None:
+    dao: SegredoDAO = SegredoDAOImpl(c)
+    perm1: PermissaoDeSegredo = PermissaoDeSegredo(hermione.pk_usuario, oppenheimer.pk_segredo, 2)
+    perm2: PermissaoDeSegredo = PermissaoDeSegredo(dumbledore.pk_usuario, oppenheimer.pk_segredo, 3)
+    dao.criar_permissoes([perm1, perm2])
+    dao.criar_permissoes([])
+    assert dao.buscar_permissao(BuscaPermissaoPorLogin(oppenheimer.pk_segredo, hermione.login)) == perm1
+    assert dao.buscar_permissao(BuscaPermissaoPorLogin(oppenheimer.pk_segredo, dumbledore.login)) == perm2
+
+
 @applier_trans(dbs, assert_db_ok)
 def test_criar_permissao_usuario_nao_existe(c: TransactedConnection) -> None:
     dao1: SegredoDAO = SegredoDAOImpl(c)
@@ -378,6 +420,18 @@ def test_criar_categoria_segredo(c: TransactedConnection) -> None:
     assert dados == [producao, qa]
 
 
+@applier_trans(dbs, assert_db_ok)
+def test_criar_categorias_segredo(c: TransactedConnection) -> None:
+    dao1: SegredoDAO = SegredoDAOImpl(c)
+    dao2: CategoriaDAO = CategoriaDAOImpl(c)
+    cs1: CategoriaDeSegredo = CategoriaDeSegredo(oppenheimer.pk_segredo, qa.pk_categoria)
+    cs2: CategoriaDeSegredo = CategoriaDeSegredo(oppenheimer.pk_segredo, producao.pk_categoria)
+    dao1.criar_categorias_segredo([cs1, cs2])
+    dao1.criar_categorias_segredo([])
+    dados: list[DadosCategoria] = dao2.listar_por_segredo(SegredoPK(oppenheimer.pk_segredo))
+    assert dados == [producao, qa]
+
+
 @applier_trans(dbs, assert_db_ok)
 def test_criar_categoria_segredo_com_segredo_que_nao_existe(c: TransactedConnection) -> None:
     dao1: SegredoDAO = SegredoDAOImpl(c)
@@ -439,6 +493,113 @@ def test_buscar_categoria_segredo_nao_existe(c: TransactedConnection) -> None:
     assert dados == []
 
 
+@applier_trans(dbs, assert_db_ok)
+def test_alterar_e_deletar_campos_segredo(c: TransactedConnection) -> None:
+    dao: SegredoDAO = SegredoDAOImpl(c)
+    pk: SegredoPK = SegredoPK(star_wars.pk_segredo)
+    dao.alterar_campos_segredo([CampoDeSegredo(star_wars.pk_segredo, "Robô chato e falastrão", "R2D2")])
+    dao.deletar_campos_segredo([
+        CampoDeSegredo(star_wars.pk_segredo, "Nome do imperador", "Palpatine"),
+        CampoDeSegredo(star_wars.pk_segredo, "Não existe", "Qualquer coisa")
+    ])
+    dao.alterar_campos_segredo([])
+    dao.deletar_campos_segredo([])
+    campos: list[CampoDeSegredo] = dao.ler_campos_segredo(pk)
+    assert campos == [
+        CampoDeSegredo(star_wars.pk_segredo, "Nome do cara vestido de preto", "Darth Vader"),
+        CampoDeSegredo(star_wars.pk_segredo, "Robô chato e falastrão", "R2D2")
+    ]
+
+
+@applier_trans(dbs, assert_db_ok)
+def test_alterar_e_deletar_permissoes(c: TransactedConnection) -> None:
+    dao: SegredoDAO = SegredoDAOImpl(c)
+    dao.alterar_permissoes([PermissaoDeSegredo(harry_potter.pk_usuario, dbz.pk_segredo, 3)])
+    dao.deletar_permissoes([PermissaoDeSegredo(harry_potter.pk_usuario, lotr.pk_segredo, 2)])
+    dao.alterar_permissoes([])
+    dao.deletar_permissoes([])
+    perm1: PermissaoDeSegredo | None = dao.buscar_permissao(BuscaPermissaoPorLogin(dbz.pk_segredo, harry_potter.login))
+    perm2: PermissaoDeSegredo | None = dao.buscar_permissao(BuscaPermissaoPorLogin(lotr.pk_segredo, harry_potter.login))
+    assert perm1 == PermissaoDeSegredo(harry_potter.pk_usuario, dbz.pk_segredo, 3)
+    assert perm2 is None
+
+
+@applier_trans(dbs, assert_db_ok)
+def test_deletar_categorias_segredo(c: TransactedConnection) -> None:
+    dao1: SegredoDAO = SegredoDAOImpl(c)
+    dao2: CategoriaDAO = CategoriaDAOImpl(c)
+    dao1.deletar_categorias_segredo([CategoriaDeSegredo(lotr.pk_segredo, aplicacao.pk_categoria)])
+    dao1.deletar_categorias_segredo([])
+    dados: list[DadosCategoria] = dao2.listar_por_segredo(SegredoPK(lotr.pk_segredo))
+    assert dados == [integracao]
+
+
+@applier_trans(dbs, assert_db_ok)
+def test_pesquisar_visiveis(c: TransactedConnection) -> None:
+    dao: SegredoDAO = SegredoDAOImpl(c)
+    assert dao.pesquisar(BuscaSegredos(hermione.pk_usuario, "", [], None, 100)) == visiv_segredos
+    assert dao.pesquisar(BuscaSegredos(harry_potter.pk_usuario, "", [], None, 100)) == harry_segredos
+    assert dao.pesquisar(BuscaSegredos(None, "", [], None, 100)) == todos_segredos
+
+
+@applier_trans(dbs, assert_db_ok)
+def test_pesquisar_por_nome_e_categoria(c: TransactedConnection) -> None:
+    dao: SegredoDAO = SegredoDAOImpl(c)
+    assert dao.pesquisar(BuscaSegredos(None, "s", [], None, 100)) == [segredo_m1, lotr, star_wars]
+    assert dao.pesquisar(BuscaSegredos(None, "_", [], None, 100)) == []
+    assert dao.pesquisar(BuscaSegredos(None, "s", [aplicacao.nome], None, 100)) == [segredo_m1, lotr]
+    assert dao.pesquisar(BuscaSegredos(None, "", [aplicacao.nome, integracao.nome, aplicacao.nome], None, 100)) == [lotr]
+
+
+@applier_trans(dbs, assert_db_ok)
+def test_pesquisar_paginado(c: TransactedConnection) -> None:
+    dao: SegredoDAO = SegredoDAOImpl(c)
+    assert dao.pesquisar(BuscaSegredos(None, "", [], None, 2)) == [segredo_m1, dbz]
+    assert dao.pesquisar(BuscaSegredos(None, "", [], dbz.pk_segredo, 2)) == [lotr, star_wars]
+    assert dao.pesquisar(BuscaSegredos(None, "", [], oppenheimer.pk_segredo, 2)) == []
+
+
+@applier_trans(dbs, assert_db_ok)
+def test_buscar_agregados(c: TransactedConnection) -> None:
+    dao: SegredoDAO = SegredoDAOImpl(c)
+    pk1: SegredoPK = SegredoPK(star_wars.pk_segredo)
+    pk2: SegredoPK = SegredoPK(lixo1)
+    pk3: SegredoPK = SegredoPK(lotr.pk_segredo)
+    pk4: SegredoPK = SegredoPK(oppenheimer.pk_segredo)
+    lido: list[AgregadoSegredo] = dao.buscar_agregados([pk1, pk2, pk3, pk4])
+    assert lido == [
+        AgregadoSegredo(
+            lotr,
+            [CampoDeSegredo(lotr.pk_segredo, "Nome da montanha dos anões", "Monte Erebus")],
+            [DadosUsuarioComPermissao(harry_potter.pk_usuario, harry_potter.login, harry_potter.fk_nivel_acesso, harry_potter.hash_com_sal, 2)],
+            [aplicacao, integracao]
+        ),
+        AgregadoSegredo(
+            star_wars,
+            [
+                CampoDeSegredo(star_wars.pk_segredo, "Nome do cara vestido de preto", "Darth Vader"),
+                CampoDeSegredo(star_wars.pk_segredo, "Nome do imperador", "Palpatine"),
+                CampoDeSegredo(star_wars.pk_segredo, "Robô chato e falastrão", "C3PO")
+            ],
+            [DadosUsuarioComPermissao(harry_potter.pk_usuario, harry_potter.login, harry_potter.fk_nivel_acesso, harry_potter.hash_com_sal, 3)],
+            [producao]
+        ),
+        AgregadoSegredo(
+            oppenheimer,
+            [CampoDeSegredo(oppenheimer.pk_segredo, "Átomos para fazer bomba", "Urânio e plutônio")],
+            [],
+            []
+        )
+    ]
+
+
+@applier_trans(dbs, assert_db_ok)
+def test_buscar_agregados_nao_existem(c: TransactedConnection) -> None:
+    dao: SegredoDAO = SegredoDAOImpl(c)
+    assert dao.buscar_agregados([SegredoPK(lixo1), SegredoPK(lixo2)]) == []
+    assert dao.buscar_agregados([]) == []
+
+
 # @applier_trans(dbs, assert_db_ok)
 # def test_criar_listar_por_permissao(c: TransactedConnection) -> None:
 #     pk: SegredoPk = SegredoPK(dbz.pk_segredo)
@@ -8,7 +8,7 @@ from ..fixtures import (
 )
 from connection.trans import TransactedConnection
 from connection.conn import IntegrityViolationException
-from cofre_de_senhas.dao import UsuarioDAO, UsuarioPK, DadosUsuario, DadosUsuarioSemPK, LoginUsuarioUK
+from cofre_de_senhas.dao import UsuarioDAO, UsuarioPK, DadosUsuario, DadosUsuarioSemPK, LoginUsuarioUK, BuscaPagina
 from cofre_de_senhas.usuario.usuario_dao_impl import UsuarioDAOImpl
 from pytest import raises
 
@@ -141,6 +141,15 @@ def test_listar_tudo(c: TransactedConnection) -> None:
     assert lido == todos_usuarios
 
 
+@applier_trans(dbs, assert_db_ok)
+def test_listar_pagina(c: TransactedConnection) -> None:
+    dao: UsuarioDAO = UsuarioDAOImpl(c)
+    assert dao.listar_pagina(BuscaPagina(None, 2)) == todos_usuarios[:2]
+    assert dao.listar_pagina(BuscaPagina(todos_usuarios[1].pk_usuario, 2)) == todos_usuarios[2:4]
+    assert dao.listar_pagina(BuscaPagina(None, 100)) == todos_usuarios
+    assert dao.listar_pagina(BuscaPagina(todos_usuarios[-1].pk_usuario, 100)) == []
+
+
 @applier_trans(dbs, assert_db_ok)
 def test_listar_tudo_apos_insercao(c: TransactedConnection) -> None:
     dao: UsuarioDAO = UsuarioDAOImpl(c)
@@ -205,6 +214,17 @@ def test_salvar_usuario_com_pk_nao_existe(c: TransactedConnection) -> None:
     assert lido is None
 
 
+@applier_trans(dbs, assert_db_ok)
+def test_substituir_hash(c: TransactedConnection) -> None:
+    dao: UsuarioDAO = UsuarioDAOImpl(c)
+    pk: UsuarioPK = UsuarioPK(voldemort.pk_usuario)
+    assert not dao.substituir_hash(pk, sectumsempra, "x" * 144)  # O hash não é mais esse, então nada muda.
+    assert dao.buscar_por_pk(pk) == voldemort
+
+    assert dao.substituir_hash(pk, voldemort.hash_com_sal, "x" * 144)
+    assert dao.buscar_por_pk(pk) == DadosUsuario(voldemort.pk_usuario, voldemort.login, voldemort.fk_nivel_acesso, "x" * 144)
+
+
 @applier_trans(dbs, assert_db_ok)
 def test_criar_usuario_tipo_nao_existe(c: TransactedConnection) -> None:
     dao: UsuarioDAO = UsuarioDAOImpl(c)
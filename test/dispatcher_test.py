@@ -0,0 +1,130 @@
+from typing import Any
+from flask import abort, Flask, request, Response, session
+from flask.testing import FlaskClient
+from httpwrap import empty_json, jsoner
+from webrpc import from_path, from_path_int, from_query_string, RadixRouter, WebSuite, WsgiDispatcher
+from werkzeug.test import TestResponse
+from pytest import raises
+
+
+def test_radix_router() -> None:
+    r: RadixRouter[str] = RadixRouter()
+    assert r.add("GET", "/usuarios/nome/<nome>", "a")
+    assert r.add("PUT", "/usuarios/nome/<nome>", "b")
+    assert r.add("GET", "/usuarios/nome/", "c")
+    assert r.add("POST", "/usuarios/nome//alterar-nivel", "d")
+    assert r.add("POST", "/usuarios/nome/<nome>/alterar-nivel", "e")
+    assert r.add("GET", "/usuarios/nome/fixo", "f")
+    assert r.add("GET", "/", "g")
+    assert not r.add("GET", "/usuarios/chave/<int:pk>", "x")
+    assert not r.add("GET", "/usuarios/pk<pk>", "x")
+    assert not r.add("GET", "/usuarios/nome/<login>", "x")
+
+    assert r.match("GET", "/usuarios/nome/harry") == ("a", {"nome": "harry"})
+    assert r.match("PUT", "/usuarios/nome/harry") == ("b", {"nome": "harry"})
+    assert r.match("GET", "/usuarios/nome/") == ("c", {})
+    assert r.match("POST", "/usuarios/nome//alterar-nivel") == ("d", {})
+    assert r.match("POST", "/usuarios/nome/hermione/alterar-nivel") == ("e", {"nome": "hermione"})
+    assert r.match("GET", "/usuarios/nome/fixo") == ("f", {})
+    assert r.match("PUT", "/usuarios/nome/fixo") == ("b", {"nome": "fixo"})
+    assert r.match("GET", "/") == ("g", {})
+
+    assert r.match("DELETE", "/usuarios/nome/harry") is None
+    assert r.match("GET", "/usuarios/nome") is None
+    assert r.match("GET", "/usuarios/nome//alterar-nivel") is None
+    assert r.match("GET", "/usuarios/nome/harry/potter") is None
+    assert r.match("GET", "usuarios") is None
+
+    with raises(ValueError):
+        r.add("GET", "/usuarios/nome/<nome>", "z")
+
+
+def test_wsgi_dispatcher() -> None:
+    app: Flask = Flask(__name__)
+    app.secret_key = "xpto"
+    ws: WebSuite = WebSuite(app, "/map")
+    hooks: list[str] = []
+
+    @app.before_request
+    def antes() -> None:
+        hooks.append("antes")
+
+    @app.after_request
+    def depois(response: Response) -> Response:
+        response.headers["X-Depois"] = "sim"
+        return response
+
+    @ws.route("GET", "/coisas/<nome>/<pk>", from_path("nome"), from_path_int("pk"), from_query_string("q", "nada"))
+    @jsoner
+    def coisa(nome: str, pk: int, q: str) -> dict[str, Any]:
+        return {"nome": nome, "pk": pk, "q": q, "visitas": session.get("visitas", 0)}
+
+    @ws.route("POST", "/visitar")
+    @empty_json
+    def visitar() -> None:
+        session["visitas"] = session.get("visitas", 0) + 1
+
+    @app.route("/flask")
+    def so_flask() -> str:
+        return "flask"
+
+    app.wsgi_app = WsgiDispatcher(ws)  # type: ignore[method-assign]
+    c: FlaskClient = app.test_client()
+
+    r1: TestResponse = c.get("/coisas/ção/42?q=x")
+    assert r1.status_code == 200
+    assert r1.json == {"sucesso": True, "conteudo": {"nome": "ção", "pk": 42, "q": "x", "visitas": 0}, "status": 200}
+    assert r1.headers["X-Depois"] == "sim"
+    assert hooks == ["antes"]
+
+    assert c.post("/visitar").status_code == 200
+    assert c.post("/visitar").status_code == 200
+    r2: TestResponse = c.get("/coisas/a/1")
+    assert r2.json == {"sucesso": True, "conteudo": {"nome": "a", "pk": 1, "q": "nada", "visitas": 2}, "status": 200}
+
+    r3: TestResponse = c.get("/coisas/a/b")
+    assert r3.status_code == 400
+
+    assert c.get("/flask").text == "flask"
+    assert c.head("/coisas/a/1").status_code == 200
+    assert c.delete("/coisas/a/1").status_code == 405
+    assert c.get("/nada").status_code == 404
+    assert "coisa" in c.get("/map").text
+
+
+class _Bloqueado(Exception):
+    pass
+
+
+# Os erros passam pelos error handlers registrados, como no Flask, antes de virarem um 500.
+def test_wsgi_dispatcher_error_handlers() -> None:
+    app: Flask = Flask(__name__)
+    ws: WebSuite = WebSuite(app, "/map")
+
+    @app.before_request
+    def antes() -> None:
+        q: str | None = request.args.get("erro")
+        if q == "bloqueado":
+            raise _Bloqueado()
+        if q == "proibido":
+            abort(403)
+        if q == "quebrado":
+            raise ValueError()
+
+    @app.errorhandler(_Bloqueado)
+    def bloqueado(e: _Bloqueado) -> tuple[str, int]:
+        return "bloqueado", 423
+
+    @ws.route("GET", "/coisa")
+    @empty_json
+    def coisa() -> None:
+        pass
+
+    app.wsgi_app = WsgiDispatcher(ws)  # type: ignore[method-assign]
+    c: FlaskClient = app.test_client()
+    assert c.get("/coisa").status_code == 200
+    r: TestResponse = c.get("/coisa?erro=bloqueado")
+    assert r.status_code == 423
+    assert r.data == b"bloqueado"
+    assert c.get("/coisa?erro=proibido").status_code == 403
+    assert c.get("/coisa?erro=quebrado").status_code == 500
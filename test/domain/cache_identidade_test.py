@@ -0,0 +1,144 @@
+from contextvars import Context
+from connection.sqlite3conn import SqliteConnectionData
+from connection.trans import TransactedConnection
+from cofre_de_senhas.service import ChaveUsuario, NivelAcesso
+from cofre_de_senhas.usuario.usuario import CacheIdentidade, Usuario
+
+
+_harry: Usuario = Usuario(1, "Harry Potter", NivelAcesso.NORMAL, "xyz")
+
+
+class _Clock:
+
+    def __init__(self) -> None:
+        self.now: float = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _Carregador:
+
+    def __init__(self) -> None:
+        self.chamadas: int = 0
+
+    def __call__(self, chave: ChaveUsuario) -> Usuario | None:
+        self.chamadas += 1
+        return _harry if chave.valor == _harry.pk_usuario else None
+
+
+def _conectar() -> TransactedConnection:
+    return SqliteConnectionData.create(file_name = "test/fruits-ok.db").connect()
+
+
+def test_cache_por_transacao() -> None:
+    conn: TransactedConnection = _conectar()
+    cache: CacheIdentidade = CacheIdentidade(conn)
+    c: _Carregador = _Carregador()
+    with conn:
+        assert cache.buscar(ChaveUsuario(1), c) == _harry
+        assert cache.buscar(ChaveUsuario(1), c) == _harry
+        assert cache.buscar(ChaveUsuario(2), c) is None
+        assert cache.buscar(ChaveUsuario(2), c) is None
+        assert c.chamadas == 2
+    with conn:
+        assert cache.buscar(ChaveUsuario(1), c) == _harry
+        assert c.chamadas == 3
+
+
+def test_cache_sem_transacao() -> None:
+    cache: CacheIdentidade = CacheIdentidade(_conectar())
+    c: _Carregador = _Carregador()
+    assert cache.buscar(ChaveUsuario(1), c) == _harry
+    assert cache.buscar(ChaveUsuario(1), c) == _harry
+    assert c.chamadas == 2
+
+
+def test_cache_invalidar_na_transacao() -> None:
+    conn: TransactedConnection = _conectar()
+    cache: CacheIdentidade = CacheIdentidade(conn)
+    c: _Carregador = _Carregador()
+    with conn:
+        cache.buscar(ChaveUsuario(1), c)
+        cache.invalidar(ChaveUsuario(1))
+        cache.buscar(ChaveUsuario(1), c)
+        assert c.chamadas == 2
+
+
+def test_cache_global_com_ttl() -> None:
+    conn: TransactedConnection = _conectar()
+    clock: _Clock = _Clock()
+    cache: CacheIdentidade = CacheIdentidade(conn, 10.0, clock)
+    c: _Carregador = _Carregador()
+    with conn:
+        cache.buscar(ChaveUsuario(1), c)
+        cache.buscar(ChaveUsuario(2), c)
+    with conn:
+        cache.buscar(ChaveUsuario(1), c)
+        cache.buscar(ChaveUsuario(2), c)
+    assert c.chamadas == 3  # Ausências não são lembradas entre transações.
+
+    clock.now = 9.5
+    cache.buscar(ChaveUsuario(1), c)
+    assert c.chamadas == 3
+
+    clock.now = 10.0
+    cache.buscar(ChaveUsuario(1), c)
+    assert c.chamadas == 4
+
+    cache.invalidar(ChaveUsuario(1))
+    cache.buscar(ChaveUsuario(1), c)
+    assert c.chamadas == 5
+
+
+# Outra requisição, sem a transação corrente.
+def _fora(cache: CacheIdentidade, chave: ChaveUsuario, c: _Carregador) -> Usuario | None:
+    return Context().run(cache.buscar, chave, c)
+
+
+def test_cache_invalidar_depois_do_commit() -> None:
+    conn: TransactedConnection = _conectar()
+    cache: CacheIdentidade = CacheIdentidade(conn, 10.0, _Clock())
+    c: _Carregador = _Carregador()
+    cache.buscar(ChaveUsuario(1), c)
+    with conn:
+        cache.invalidar(ChaveUsuario(1))
+        # Quem alterou não usa o que está lembrado, nem lembra para os outros o que ainda não foi confirmado.
+        cache.buscar(ChaveUsuario(1), c)
+        assert c.chamadas == 2
+        _fora(cache, ChaveUsuario(1), c)
+        assert c.chamadas == 2
+    _fora(cache, ChaveUsuario(1), c)
+    assert c.chamadas == 3
+    _fora(cache, ChaveUsuario(1), c)
+    assert c.chamadas == 3
+
+
+def test_cache_invalidar_com_rollback() -> None:
+    conn: TransactedConnection = _conectar()
+    cache: CacheIdentidade = CacheIdentidade(conn, 10.0, _Clock())
+    c: _Carregador = _Carregador()
+    cache.buscar(ChaveUsuario(1), c)
+    try:
+        with conn:
+            cache.invalidar(ChaveUsuario(1))
+            raise KeyError()
+    except KeyError:
+        pass
+    cache.buscar(ChaveUsuario(1), c)
+    assert c.chamadas == 1
+
+
+# Uma busca que começou antes de uma invalidação terminar não lembra o que encontrou, que pode ser a versão antiga.
+def test_cache_busca_concorrente_com_invalidacao() -> None:
+    cache: CacheIdentidade = CacheIdentidade(_conectar(), 10.0, _Clock())
+    c: _Carregador = _Carregador()
+
+    def carregar_durante_alteracao(chave: ChaveUsuario) -> Usuario | None:
+        cache.invalidar(chave)
+        return c(chave)
+
+    cache.buscar(ChaveUsuario(1), carregar_durante_alteracao)
+    cache.buscar(ChaveUsuario(1), c)
+    cache.buscar(ChaveUsuario(1), c)
+    assert c.chamadas == 2
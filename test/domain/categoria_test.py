@@ -8,7 +8,7 @@ from cofre_de_senhas.erro import (
     CategoriaNaoExisteException, CategoriaJaExisteException,
     ValorIncorretoException, ExclusaoSemCascataException
 )
-from cofre_de_senhas.service import Servicos, NomeCategoria, CategoriaComChave, ChaveCategoria, RenomeCategoria, ResultadoListaDeCategorias
+from cofre_de_senhas.service import Servicos, NomeCategoria, CategoriaComChave, ChaveCategoria, RenomeCategoria, ResultadoListaDeCategorias, Paginacao
 
 
 tudo: ResultadoListaDeCategorias = ResultadoListaDeCategorias([
@@ -598,6 +598,66 @@ def test_listar_categorias_UNLE(ctx: ContextoOperacao) -> None:
         assert isinstance(x, UsuarioNaoLogadoException)
 
 
+# Método listar_pagina(self, pagina: Paginacao) -> ResultadoListaDeCategorias | _UNLE | _UBE | _LEE | _VIE
+
+
+@applier_ctx
+def test_listar_pagina_categorias_ok(ctx: ContextoOperacao) -> None:
+    with ctx.servicos_normal() as r:
+        s: Servicos = r.servicos
+        lidas: list[CategoriaComChave] = []
+        continuacao: str | None = None
+        for _ in range(3):
+            x: ResultadoListaDeCategorias | BaseException = s.categoria.listar_pagina(Paginacao(continuacao, 4))
+            assert isinstance(x, ResultadoListaDeCategorias)
+            assert len(x.lista) <= 4
+            lidas.extend(x.lista)
+            continuacao = x.continuacao
+        assert continuacao is None
+        assert lidas == tudo.lista
+
+
+@applier_ctx
+def test_listar_pagina_categorias_limite_minimo(ctx: ContextoOperacao) -> None:
+    with ctx.servicos_admin() as r:
+        s: Servicos = r.servicos
+        x: ResultadoListaDeCategorias | BaseException = s.categoria.listar_pagina(Paginacao(limite = 0))
+        assert isinstance(x, ResultadoListaDeCategorias)
+        assert x.lista == tudo.lista[:1]
+
+
+@applier_ctx
+def test_listar_pagina_categorias_continuacao_invalida(ctx: ContextoOperacao) -> None:
+    with ctx.servicos_normal() as r:
+        s: Servicos = r.servicos
+        x: ResultadoListaDeCategorias | BaseException = s.categoria.listar_pagina(Paginacao("Y2F0ZWdvcmlhOnBpa2FjaHU="))
+        assert isinstance(x, ValorIncorretoException)
+
+
+@applier_ctx
+def test_listar_pagina_categorias_LEE(ctx: ContextoOperacao) -> None:
+    with ctx.servicos_usuario_nao_existe() as r:
+        s: Servicos = r.servicos
+        x: ResultadoListaDeCategorias | BaseException = s.categoria.listar_pagina(Paginacao())
+        assert isinstance(x, LoginExpiradoException)
+
+
+@applier_ctx
+def test_listar_pagina_categorias_UBE(ctx: ContextoOperacao) -> None:
+    with ctx.servicos_banido() as r:
+        s: Servicos = r.servicos
+        x: ResultadoListaDeCategorias | BaseException = s.categoria.listar_pagina(Paginacao())
+        assert isinstance(x, UsuarioBanidoException)
+
+
+@applier_ctx
+def test_listar_pagina_categorias_UNLE(ctx: ContextoOperacao) -> None:
+    with ctx.servicos_nao_logar() as r:
+        s: Servicos = r.servicos
+        x: ResultadoListaDeCategorias | BaseException = s.categoria.listar_pagina(Paginacao())
+        assert isinstance(x, UsuarioNaoLogadoException)
+
+
 # Método criar_bd(self) -> None
 
 
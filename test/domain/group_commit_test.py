@@ -0,0 +1,103 @@
+import hasher
+from typing import Iterator
+from pathlib import Path
+from shutil import copy2
+from threading import Barrier, Thread
+from connection.groupcommit import GroupCommitConnection
+from connection.sqlite3conn import SqliteConnectionData
+from connection.trans import read_only
+from cofre_de_senhas.service import (
+    GerenciadorLogin, Servicos, ChaveUsuario, LoginUsuario, LoginComSenha, ChaveCategoria, NomeCategoria, CategoriaComChave, ChaveSegredo,
+    Paginacao, PesquisaSegredos, ResultadoListaDeCategorias, ResultadoListaDeUsuarios, ResultadoPesquisaDeSegredos, SegredoComChave, UsuarioComChave
+)
+from cofre_de_senhas.service_impl import ServicosImpl
+from ..fixtures import GerenciadorLoginChave, GerenciadorLoginSimples, dumbledore, harry_potter, qa, lotr, todas_categorias
+
+
+def _conectar(tmp_path: Path, original: str = "cofre-teste.db", gl: GerenciadorLogin | None = None) -> tuple[GroupCommitConnection, Servicos]:
+    arquivo: Path = tmp_path / "cofre-teste.db"
+    copy2(Path(__file__).parent.parent / original, arquivo)
+    conn = SqliteConnectionData.create(file_name = str(arquivo), profile = "server", group_commit = True).connect()
+    assert isinstance(conn, GroupCommitConnection)
+    return conn, ServicosImpl(GerenciadorLoginChave(ChaveUsuario(dumbledore.pk_usuario)) if gl is None else gl, conn)
+
+
+# Todos os métodos marcados com @read_only rodam numa conexão somente leitura. Se algum deles tentasse escrever, falharia.
+def test_leituras_nao_escrevem(tmp_path: Path) -> None:
+    conn, s = _conectar(tmp_path)
+
+    assert isinstance(s.usuario.buscar_por_login(LoginUsuario(dumbledore.login)), UsuarioComChave)
+    assert isinstance(s.usuario.buscar_por_chave(ChaveUsuario(dumbledore.pk_usuario)), UsuarioComChave)
+    assert isinstance(s.usuario.listar(), ResultadoListaDeUsuarios)
+    assert isinstance(s.usuario.listar_pagina(Paginacao(limite = 2)), ResultadoListaDeUsuarios)
+    assert isinstance(s.categoria.buscar_por_nome(NomeCategoria(qa.nome)), CategoriaComChave)
+    assert isinstance(s.categoria.buscar_por_chave(ChaveCategoria(qa.pk_categoria)), CategoriaComChave)
+    assert isinstance(s.categoria.listar(), ResultadoListaDeCategorias)
+    assert isinstance(s.categoria.listar_pagina(Paginacao(limite = 2)), ResultadoListaDeCategorias)
+    assert isinstance(s.segredo.buscar_por_chave(ChaveSegredo(lotr.pk_segredo)), SegredoComChave)
+    assert isinstance(s.segredo.listar(), ResultadoPesquisaDeSegredos)
+    assert isinstance(s.segredo.listar_pagina(Paginacao(limite = 2)), ResultadoPesquisaDeSegredos)
+    assert isinstance(s.segredo.pesquisar(PesquisaSegredos("", [])), ResultadoPesquisaDeSegredos)
+    fluxo: Iterator[object] = s.segredo.listar_fluxo()
+    assert len(list(fluxo)) > 0
+    assert conn.commit_statistics == (0, 0)
+    conn.stop()
+
+
+def test_escritas_concorrentes(tmp_path: Path) -> None:
+    conn, s = _conectar(tmp_path)
+    nomes: list[str] = [f"Categoria {i}" for i in range(8)]
+    barreira: Barrier = Barrier(len(nomes))
+    criadas: list[CategoriaComChave | BaseException] = []
+
+    def criar(nome: str) -> None:
+        barreira.wait()
+        criadas.append(s.categoria.criar(NomeCategoria(nome)))
+
+    threads: list[Thread] = [Thread(target = criar, args = (nome, )) for nome in nomes]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    conn.stop()
+
+    assert all(isinstance(c, CategoriaComChave) for c in criadas)
+    assert sorted(c.nome for c in criadas if isinstance(c, CategoriaComChave)) == nomes
+    lista: ResultadoListaDeCategorias | BaseException = s.categoria.listar()
+    assert isinstance(lista, ResultadoListaDeCategorias)
+    assert len(lista.lista) == len(todas_categorias) + len(nomes)
+    assert conn.commit_statistics[1] == len(nomes)
+
+
+def test_criar_bd(tmp_path: Path) -> None:
+    conn, s = _conectar(tmp_path, "empty.db")
+    s.bd.criar_bd()
+    with conn as c:
+        c.execute("SELECT COUNT(*) FROM enum_tipo_segredo")
+        assert c.fetchall() == [(3, )]
+    conn.stop()
+
+
+# A senha é conferida fora do escritor. Só a gravação do hash refeito passa por ele, e só quando o hash precisa ser refeito.
+def test_login_fora_do_escritor(tmp_path: Path) -> None:
+    conn, s = _conectar(tmp_path, gl = GerenciadorLoginSimples())
+    senha: LoginComSenha = LoginComSenha(harry_potter.login, "alohomora")
+
+    def hash_atual() -> str:
+        @conn.transact
+        @read_only
+        def ler() -> str:
+            conn.execute("SELECT hash_com_sal FROM usuario WHERE pk_usuario = ?", [harry_potter.pk_usuario])
+            return str(conn.fetchall()[0][0])
+        return ler()
+
+    assert isinstance(s.usuario.login(senha), UsuarioComChave)
+    assert conn.commit_statistics == (1, 1)
+    novo: str = hash_atual()
+    assert novo != harry_potter.hash_com_sal
+    assert hasher.comparar_hash(novo, "alohomora")
+
+    assert isinstance(s.usuario.login(senha), UsuarioComChave)
+    assert conn.commit_statistics == (1, 1)
+    assert hash_atual() == novo
+    conn.stop()
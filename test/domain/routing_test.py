@@ -0,0 +1,49 @@
+from pathlib import Path
+from shutil import copy2
+from connection.routing import RoutingConnectionData, RoutingStatistics, RoutingTransactedConnection
+from connection.sqlite3conn import SqliteConnectionData
+from cofre_de_senhas.service import Servicos, ChaveUsuario, NomeCategoria, CategoriaComChave, ResultadoListaDeCategorias
+from cofre_de_senhas.service_impl import ServicosImpl
+from ..fixtures import GerenciadorLoginChave, dumbledore, qa, todas_categorias
+
+
+# As réplicas são cópias do banco que não recebem as escritas, assim dá para saber de onde cada leitura veio.
+def _conectar(tmp_path: Path) -> tuple[RoutingTransactedConnection, Servicos]:
+    def copia(nome: str, ro: bool) -> SqliteConnectionData:
+        arquivo: Path = tmp_path / nome
+        copy2(Path(__file__).parent.parent / "cofre-teste.db", arquivo)
+        return SqliteConnectionData.create(file_name = str(arquivo), read_only = ro)
+
+    dados: RoutingConnectionData = RoutingConnectionData.create(
+        primary = copia("primario.db", False),
+        replicas = [copia("replica1.db", True), copia("replica2.db", True)]
+    )
+    conn: RoutingTransactedConnection = dados.connect()
+    return conn, ServicosImpl(GerenciadorLoginChave(ChaveUsuario(dumbledore.pk_usuario)), conn)
+
+
+def test_leituras_nas_replicas(tmp_path: Path) -> None:
+    conn, s = _conectar(tmp_path)
+
+    assert isinstance(s.categoria.buscar_por_nome(NomeCategoria(qa.nome)), CategoriaComChave)
+    lista: ResultadoListaDeCategorias | BaseException = s.categoria.listar()
+    assert isinstance(lista, ResultadoListaDeCategorias)
+    assert len(lista.lista) == len(todas_categorias)
+    assert conn.statistics == RoutingStatistics(0, [1, 1], [0, 0])
+
+
+def test_le_o_que_escreveu(tmp_path: Path) -> None:
+    conn, s = _conectar(tmp_path)
+
+    assert isinstance(s.categoria.criar(NomeCategoria("Millenium Falcon")), CategoriaComChave)
+    assert isinstance(s.categoria.buscar_por_nome(NomeCategoria("Millenium Falcon")), CategoriaComChave)
+    lista: ResultadoListaDeCategorias | BaseException = s.categoria.listar()
+    assert isinstance(lista, ResultadoListaDeCategorias)
+    assert len(lista.lista) == len(todas_categorias) + 1
+    assert conn.statistics == RoutingStatistics(2, [0, 0], [0, 0])
+
+    # Em outra sessão, a leitura vai para uma réplica, onde a categoria nova não chegou.
+    conn.session_key = lambda: "outra sessão"
+    lista = s.categoria.listar()
+    assert isinstance(lista, ResultadoListaDeCategorias)
+    assert len(lista.lista) == len(todas_categorias)
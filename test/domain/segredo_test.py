@@ -12,7 +12,7 @@ from cofre_de_senhas.erro import (
 from cofre_de_senhas.service import (
     Servicos,
     ChaveSegredo, SegredoSemChave, SegredoComChave,
-    ResultadoPesquisaDeSegredos, CabecalhoSegredoComChave,
+    ResultadoPesquisaDeSegredos, CabecalhoSegredoComChave, PesquisaSegredos, Paginacao,
     TipoSegredo, TipoPermissao
 )
 from sucesso import ConteudoBloqueadoException
@@ -149,6 +149,198 @@ def test_listar_segredos_UNLE(ctx: ContextoOperacao) -> None:
         assert isinstance(x, UsuarioNaoLogadoException)
 
 
+# Método listar_pagina(self, pagina: Paginacao) -> ResultadoPesquisaDeSegredos | _UNLE | _UBE | _LEE | _VIE
+
+
+@applier_ctx
+def test_listar_pagina_segredos_ok1(ctx: ContextoOperacao) -> None:
+    with ctx.servicos_normal() as r:
+        s: Servicos = r.servicos
+        x: ResultadoPesquisaDeSegredos | BaseException = s.segredo.listar_pagina(Paginacao(limite = 3))
+        assert isinstance(x, ResultadoPesquisaDeSegredos)
+        assert x.segredos == nem_tudo.segredos[:3]
+        assert x.continuacao is not None
+        y: ResultadoPesquisaDeSegredos | BaseException = s.segredo.listar_pagina(Paginacao(x.continuacao, 3))
+        assert y == ResultadoPesquisaDeSegredos(nem_tudo.segredos[3:])
+
+
+@applier_ctx
+def test_listar_pagina_segredos_ok2(ctx: ContextoOperacao) -> None:
+    with ctx.servicos_admin() as r:
+        s: Servicos = r.servicos
+        x: ResultadoPesquisaDeSegredos | BaseException = s.segredo.listar_pagina(Paginacao())
+        assert x == tudo
+
+
+@applier_ctx
+def test_listar_pagina_segredos_continuacao_invalida(ctx: ContextoOperacao) -> None:
+    with ctx.servicos_normal() as r:
+        s: Servicos = r.servicos
+        x: ResultadoPesquisaDeSegredos | BaseException = s.segredo.listar_pagina(Paginacao("!!!"))
+        assert isinstance(x, ValorIncorretoException)
+
+
+@applier_ctx
+def test_listar_pagina_segredos_LEE(ctx: ContextoOperacao) -> None:
+    with ctx.servicos_usuario_nao_existe() as r:
+        s: Servicos = r.servicos
+        x: ResultadoPesquisaDeSegredos | BaseException = s.segredo.listar_pagina(Paginacao())
+        assert isinstance(x, LoginExpiradoException)
+
+
+@applier_ctx
+def test_listar_pagina_segredos_UBE(ctx: ContextoOperacao) -> None:
+    with ctx.servicos_banido() as r:
+        s: Servicos = r.servicos
+        x: ResultadoPesquisaDeSegredos | BaseException = s.segredo.listar_pagina(Paginacao())
+        assert isinstance(x, UsuarioBanidoException)
+
+
+@applier_ctx
+def test_listar_pagina_segredos_UNLE(ctx: ContextoOperacao) -> None:
+    with ctx.servicos_nao_logar() as r:
+        s: Servicos = r.servicos
+        x: ResultadoPesquisaDeSegredos | BaseException = s.segredo.listar_pagina(Paginacao())
+        assert isinstance(x, UsuarioNaoLogadoException)
+
+
+# Método listar_fluxo(self) -> Iterator[CabecalhoSegredoComChave]
+
+
+@applier_ctx
+def test_listar_fluxo_segredos_ok1(ctx: ContextoOperacao) -> None:
+    with ctx.servicos_normal() as r:
+        s: Servicos = r.servicos
+        x: list[CabecalhoSegredoComChave] = list(s.segredo.listar_fluxo())
+        assert x == nem_tudo.segredos
+
+
+@applier_ctx
+def test_listar_fluxo_segredos_ok2(ctx: ContextoOperacao) -> None:
+    with ctx.servicos_admin() as r:
+        s: Servicos = r.servicos
+        x: list[CabecalhoSegredoComChave] = list(s.segredo.listar_fluxo())
+        assert x == tudo.segredos
+
+
+@applier_ctx
+def test_listar_fluxo_segredos_LEE(ctx: ContextoOperacao) -> None:
+    with ctx.servicos_usuario_nao_existe() as r:
+        s: Servicos = r.servicos
+        with raises(LoginExpiradoException):
+            list(s.segredo.listar_fluxo())
+
+
+@applier_ctx
+def test_listar_fluxo_segredos_UBE(ctx: ContextoOperacao) -> None:
+    with ctx.servicos_banido() as r:
+        s: Servicos = r.servicos
+        with raises(UsuarioBanidoException):
+            list(s.segredo.listar_fluxo())
+
+
+@applier_ctx
+def test_listar_fluxo_segredos_UNLE(ctx: ContextoOperacao) -> None:
+    with ctx.servicos_nao_logar() as r:
+        s: Servicos = r.servicos
+        with raises(UsuarioNaoLogadoException):
+            list(s.segredo.listar_fluxo())
+
+
+# Método pesquisar(self, dados: PesquisaSegredos) -> ResultadoPesquisaDeSegredos | _UNLE | _UBE | _SNEE | _LEE | _VIE
+
+
+@applier_ctx
+def test_pesquisar_segredos_ok1(ctx: ContextoOperacao) -> None:
+    with ctx.servicos_normal() as r:
+        s: Servicos = r.servicos
+        x: ResultadoPesquisaDeSegredos | BaseException = s.segredo.pesquisar(PesquisaSegredos("", []))
+        assert x == nem_tudo
+
+
+@applier_ctx
+def test_pesquisar_segredos_ok2(ctx: ContextoOperacao) -> None:
+    with ctx.servicos_admin() as r:
+        s: Servicos = r.servicos
+        x: ResultadoPesquisaDeSegredos | BaseException = s.segredo.pesquisar(PesquisaSegredos("", []))
+        assert x == tudo
+
+
+@applier_ctx
+def test_pesquisar_segredos_por_nome(ctx: ContextoOperacao) -> None:
+    with ctx.servicos_normal() as r:
+        s: Servicos = r.servicos
+        x: ResultadoPesquisaDeSegredos | BaseException = s.segredo.pesquisar(PesquisaSegredos("STAR", []))
+        assert x == ResultadoPesquisaDeSegredos([c_star_wars])
+        y: ResultadoPesquisaDeSegredos | BaseException = s.segredo.pesquisar(PesquisaSegredos("%", []))
+        assert y == ResultadoPesquisaDeSegredos([])
+
+
+@applier_ctx
+def test_pesquisar_segredos_por_categorias(ctx: ContextoOperacao) -> None:
+    with ctx.servicos_normal() as r:
+        s: Servicos = r.servicos
+        x: ResultadoPesquisaDeSegredos | BaseException = s.segredo.pesquisar(PesquisaSegredos("", ["Aplicação"]))
+        assert x == ResultadoPesquisaDeSegredos([c_m1, c_lotr])
+        y: ResultadoPesquisaDeSegredos | BaseException = s.segredo.pesquisar(PesquisaSegredos("", ["Aplicação", "Integração"]))
+        assert y == ResultadoPesquisaDeSegredos([c_lotr])
+        z: ResultadoPesquisaDeSegredos | BaseException = s.segredo.pesquisar(PesquisaSegredos("", ["Não existe"]))
+        assert z == ResultadoPesquisaDeSegredos([])
+
+
+@applier_ctx
+def test_pesquisar_segredos_paginado(ctx: ContextoOperacao) -> None:
+    with ctx.servicos_admin() as r:
+        s: Servicos = r.servicos
+        x: ResultadoPesquisaDeSegredos | BaseException = s.segredo.pesquisar(PesquisaSegredos("", [], limite = 2))
+        assert isinstance(x, ResultadoPesquisaDeSegredos)
+        assert x.segredos == [c_m1, c_dbz]
+        assert x.continuacao is not None
+        y: ResultadoPesquisaDeSegredos | BaseException = s.segredo.pesquisar(PesquisaSegredos("", [], x.continuacao, 2))
+        assert isinstance(y, ResultadoPesquisaDeSegredos)
+        assert y.segredos == [c_lotr, c_star_wars]
+        assert y.continuacao is not None
+        z: ResultadoPesquisaDeSegredos | BaseException = s.segredo.pesquisar(PesquisaSegredos("", [], y.continuacao, 2))
+        assert z == ResultadoPesquisaDeSegredos([c_oppenheimer])
+
+
+@applier_ctx
+def test_pesquisar_segredos_continuacao_invalida(ctx: ContextoOperacao) -> None:
+    with ctx.servicos_normal() as r:
+        s: Servicos = r.servicos
+        x: ResultadoPesquisaDeSegredos | BaseException = s.segredo.pesquisar(PesquisaSegredos("", [], "!!!"))
+        assert isinstance(x, ValorIncorretoException)
+        y: ResultadoPesquisaDeSegredos | BaseException = s.segredo.listar_pagina(Paginacao(limite = 1))
+        assert isinstance(y, ResultadoPesquisaDeSegredos)
+        assert y.continuacao is not None
+        z: ResultadoPesquisaDeSegredos | BaseException = s.segredo.pesquisar(PesquisaSegredos("", [], y.continuacao))
+        assert isinstance(z, ValorIncorretoException)
+
+
+@applier_ctx
+def test_pesquisar_segredos_LEE(ctx: ContextoOperacao) -> None:
+    with ctx.servicos_usuario_nao_existe() as r:
+        s: Servicos = r.servicos
+        x: ResultadoPesquisaDeSegredos | BaseException = s.segredo.pesquisar(PesquisaSegredos("", []))
+        assert isinstance(x, LoginExpiradoException)
+
+
+@applier_ctx
+def test_pesquisar_segredos_UBE(ctx: ContextoOperacao) -> None:
+    with ctx.servicos_banido() as r:
+        s: Servicos = r.servicos
+        x: ResultadoPesquisaDeSegredos | BaseException = s.segredo.pesquisar(PesquisaSegredos("", []))
+        assert isinstance(x, UsuarioBanidoException)
+
+
+@applier_ctx
+def test_pesquisar_segredos_UNLE(ctx: ContextoOperacao) -> None:
+    with ctx.servicos_nao_logar() as r:
+        s: Servicos = r.servicos
+        x: ResultadoPesquisaDeSegredos | BaseException = s.segredo.pesquisar(PesquisaSegredos("", []))
+        assert isinstance(x, UsuarioNaoLogadoException)
+
+
 # Método criar(self, dados: SegredoSemChave) -> SegredoComChave | _UNLE | _UBE | _UNEE | _CNEE | _PNE | _LEE | _VIE
 
 
@@ -1,3 +1,4 @@
+from typing import Any, cast
 from ..fixtures import (
     applier_ctx, applier_ctx_local, ContextoOperacao, ContextoOperacaoLocal,
     harry_potter, voldemort, dumbledore, hermione, snape,
@@ -7,7 +8,7 @@ from ..fixtures import (
 from cofre_de_senhas.service import (
     Servicos,
     LoginUsuario, LoginComSenha, TrocaSenha, SenhaAlterada, ResetLoginUsuario, RenomeUsuario,
-    ChaveUsuario, NivelAcesso, UsuarioComChave, UsuarioNovo, UsuarioComNivel, ResultadoListaDeUsuarios
+    ChaveUsuario, NivelAcesso, UsuarioComChave, UsuarioNovo, UsuarioComNivel, ResultadoListaDeUsuarios, Paginacao
 )
 from cofre_de_senhas.erro import (
     UsuarioBanidoException, LoginExpiradoException, PermissaoNegadaException, UsuarioNaoLogadoException, SenhaErradaException,
@@ -16,6 +17,7 @@ from cofre_de_senhas.erro import (
 )
 from sucesso import ConteudoBloqueadoException
 from cofre_de_senhas.service_impl import ServicosImpl
+import hasher
 
 
 tudo: ResultadoListaDeUsuarios = ResultadoListaDeUsuarios([
@@ -308,6 +310,63 @@ def test_listar_usuarios_UNLE(ctx: ContextoOperacao) -> None:
         assert isinstance(x, UsuarioNaoLogadoException)
 
 
+# Método listar_pagina(self, pagina: Paginacao) -> ResultadoListaDeUsuarios | _UNLE | _UBE | _LEE | _VIE
+
+
+@applier_ctx
+def test_listar_pagina_usuarios_ok(ctx: ContextoOperacao) -> None:
+    with ctx.servicos_normal() as r:
+        s: Servicos = r.servicos
+        x: ResultadoListaDeUsuarios | BaseException = s.usuario.listar_pagina(Paginacao(limite = 3))
+        assert isinstance(x, ResultadoListaDeUsuarios)
+        assert x.lista == tudo.lista[:3]
+        assert x.continuacao is not None
+        y: ResultadoListaDeUsuarios | BaseException = s.usuario.listar_pagina(Paginacao(x.continuacao, 3))
+        assert y == ResultadoListaDeUsuarios(tudo.lista[3:])
+
+
+@applier_ctx
+def test_listar_pagina_usuarios_inteira(ctx: ContextoOperacao) -> None:
+    with ctx.servicos_admin() as r:
+        s: Servicos = r.servicos
+        x: ResultadoListaDeUsuarios | BaseException = s.usuario.listar_pagina(Paginacao(limite = len(tudo.lista)))
+        assert x == tudo
+
+
+@applier_ctx
+def test_listar_pagina_usuarios_continuacao_invalida(ctx: ContextoOperacao) -> None:
+    with ctx.servicos_normal() as r:
+        s: Servicos = r.servicos
+        x: ResultadoListaDeUsuarios | BaseException = s.usuario.listar_pagina(Paginacao("Pikachu!"))
+        assert isinstance(x, ValorIncorretoException)
+        y: ResultadoListaDeUsuarios | BaseException = s.usuario.listar_pagina(Paginacao("Y2F0ZWdvcmlhOjE="))  # Continuação de categoria.
+        assert isinstance(y, ValorIncorretoException)
+
+
+@applier_ctx
+def test_listar_pagina_usuarios_LEE(ctx: ContextoOperacao) -> None:
+    with ctx.servicos_usuario_nao_existe() as r:
+        s: Servicos = r.servicos
+        x: ResultadoListaDeUsuarios | BaseException = s.usuario.listar_pagina(Paginacao())
+        assert isinstance(x, LoginExpiradoException)
+
+
+@applier_ctx
+def test_listar_pagina_usuarios_UBE(ctx: ContextoOperacao) -> None:
+    with ctx.servicos_banido() as r:
+        s: Servicos = r.servicos
+        x: ResultadoListaDeUsuarios | BaseException = s.usuario.listar_pagina(Paginacao())
+        assert isinstance(x, UsuarioBanidoException)
+
+
+@applier_ctx
+def test_listar_pagina_usuarios_UNLE(ctx: ContextoOperacao) -> None:
+    with ctx.servicos_nao_logar() as r:
+        s: Servicos = r.servicos
+        x: ResultadoListaDeUsuarios | BaseException = s.usuario.listar_pagina(Paginacao())
+        assert isinstance(x, UsuarioNaoLogadoException)
+
+
 # Método login(self, quem_faz: LoginComSenha) -> UsuarioComChave | _UBE | _SEE
 
 
@@ -341,6 +400,37 @@ def test_login_ok3(ctx: ContextoOperacaoLocal) -> None:
         ctx.verificar()
 
 
+@applier_ctx_local
+def test_login_refaz_hash(ctx: ContextoOperacaoLocal) -> None:
+    def hash_atual() -> str:
+        with ctx.conn as z:
+            z.execute("SELECT hash_com_sal FROM usuario WHERE pk_usuario = ?", [harry_potter.pk_usuario])
+            h: Any = z.fetchone()
+            assert h is not None
+            return cast(str, h[0])
+
+    assert hash_atual() == harry_potter.hash_com_sal
+    assert hasher.precisa_rehash(hash_atual())
+
+    with ctx.servicos_normal_login() as r:
+        s1: Servicos = r.servicos
+        x1: UsuarioComChave | BaseException = s1.usuario.login(LoginComSenha(harry_potter.login, "alohomora"))
+        assert x1 == UsuarioComChave(ChaveUsuario(harry_potter.pk_usuario), harry_potter.login, NivelAcesso.NORMAL)
+
+    novo: str = hash_atual()
+    assert novo != harry_potter.hash_com_sal
+    assert len(novo) == 144
+    assert not hasher.precisa_rehash(novo)
+    assert hasher.comparar_hash(novo, "alohomora")
+
+    # Com o hash já atualizado, o login seguinte não o altera mais.
+    with ctx.servicos_normal_login() as r:
+        s2: Servicos = r.servicos
+        x2: UsuarioComChave | BaseException = s2.usuario.login(LoginComSenha(harry_potter.login, "alohomora"))
+        assert x2 == UsuarioComChave(ChaveUsuario(harry_potter.pk_usuario), harry_potter.login, NivelAcesso.NORMAL)
+    assert hash_atual() == novo
+
+
 @applier_ctx
 def test_login_UBE(ctx: ContextoOperacao) -> None:
     with ctx.servicos_nao_logar() as r:
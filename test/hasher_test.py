@@ -1,4 +1,9 @@
-from hasher import criar_hash, string_random, comparar_hash
+from typing import override
+from threading import Lock, Thread
+from time import perf_counter
+from hasher import AlgoritmoHash, configurar_hash, criar_hash, string_random, comparar_hash, precisa_rehash, Pbkdf2, Scrypt
+from pytest import raises
+import os
 
 alohomora       : str = "SbhhiMEETzPiquOxabc178eb35f26c8f59981b01a11cbec48b16f6a8e2c204f4a9a1b633c9199e0b3b2a64b13e49226306bb451c57c851f3c6e872885115404cb74279db7f5372ea"  # noqa: E203,E501
 avada_kedavra   : str = "ZisNWkdEImMneIcX8ac8780d30e67df14c1afbaf256e1ee45afd1d3cf2654d154b2e9c63541a40d4132a9beed69c4a47b3f2e5612c2751cdfa3abfaed9797fe54777e2f3dfe6aaa0"  # noqa: E203,E501
@@ -21,7 +26,8 @@ def test_random_string() -> None:
 
 def test_hash() -> None:
     a = criar_hash("alohomora")
-    assert len(a) == 144  # 16 do sal + 128 do hash
+    assert len(a) == 144
+    assert a.startswith("$scrypt$n=16384,r=8,p=1$")
     assert comparar_hash(a, "alohomora")
     assert not comparar_hash(a, "avada kedavra")
     assert not comparar_hash(a, "Alohomora")
@@ -33,3 +39,91 @@ def test_passwords() -> None:
     assert comparar_hash(alohomora, "alohomora")
     assert comparar_hash(expecto_patronum, "expecto patronum")
     assert comparar_hash(sectumsempra, "sectumsempra")
+
+
+def test_passwords_rehash() -> None:
+    assert precisa_rehash(alohomora)
+    assert not precisa_rehash(criar_hash("alohomora"))
+
+
+def test_pbkdf2() -> None:
+    try:
+        configurar_hash(Pbkdf2(1000))
+        a: str = criar_hash("alohomora")
+        assert len(a) == 144
+        assert a.startswith("$pbkdf2-sha256$i=1000$")
+        assert comparar_hash(a, "alohomora")
+        assert not comparar_hash(a, "Alohomora")
+        assert not precisa_rehash(a)
+
+        # Os parâmetros ficam no próprio hash, então mudá-los não invalida os hashes antigos, mas faz com que precisem ser refeitos.
+        configurar_hash(Pbkdf2(2000))
+        assert comparar_hash(a, "alohomora")
+        assert precisa_rehash(a)
+        configurar_hash(Scrypt(2 ** 10))
+        assert comparar_hash(a, "alohomora")
+        assert precisa_rehash(a)
+        b: str = criar_hash("alohomora")
+        assert b.startswith("$scrypt$n=1024,r=8,p=1$")
+        assert comparar_hash(b, "alohomora")
+    finally:
+        configurar_hash(Scrypt())
+
+
+def test_invalid() -> None:
+    a: str = criar_hash("alohomora")
+    assert not comparar_hash(a.replace("scrypt", "bcrypt"), "alohomora")
+    assert not comparar_hash(a.replace("n=16384", "x=16384"), "alohomora")
+    assert not comparar_hash("$scrypt$n=16384,r=8,p=1$", "alohomora")
+    assert not comparar_hash("$scrypt$n=16384,r=8,p=1$çç$abc", "x")
+    assert not comparar_hash(a[:-1] + "ç", "alohomora")
+    with raises(ValueError):
+        Scrypt(1000)
+    with raises(ValueError):
+        Pbkdf2(0)
+    with raises(ValueError):
+        Pbkdf2(1000, "nao-existe")
+    with raises(ValueError):
+        configurar_hash(Scrypt(), 0)
+
+
+def test_paralelismo() -> None:
+    algoritmo: AlgoritmoHash = Scrypt(2 ** 12)
+    ativos: list[int] = [0, 0]
+    trava: Lock = Lock()
+
+    class Contador(AlgoritmoHash):
+
+        @property
+        @override
+        def nome(self) -> str:
+            return algoritmo.nome
+
+        @property
+        @override
+        def parametros(self) -> str:
+            return algoritmo.parametros
+
+        @override
+        def derivar(self, senha: bytes, sal: bytes) -> bytes:
+            with trava:
+                ativos[0] += 1
+                ativos[1] = max(ativos[0], ativos[1])
+            t: float = perf_counter()
+            while perf_counter() - t < 0.02:
+                pass
+            r: bytes = algoritmo.derivar(senha, sal)
+            with trava:
+                ativos[0] -= 1
+            return r
+
+    try:
+        configurar_hash(Contador(), 2)
+        threads: list[Thread] = [Thread(target = criar_hash, args = ("alohomora", )) for i in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert ativos == [0, 2]
+    finally:
+        configurar_hash(Scrypt(), os.cpu_count() or 1)
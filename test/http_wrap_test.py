@@ -1,9 +1,21 @@
 from threading import Thread
+from io import BytesIO
 from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from flask.testing import FlaskClient
+from werkzeug.test import TestResponse
 from werkzeug.serving import BaseWSGIServer, make_server
-from httpwrap import empty_json, bodyless
+from typing import Any, Iterator
+from enum import Enum, IntEnum
+from httpwrap import empty_json, bodyless, jsoner, para_json, Fluxo
+from sucesso import RequisicaoMalFormadaException
 from webrpc import from_body_typed, from_path, from_path_int, from_path_float, WebSuite
 from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from uuid import UUID
+from pytest import raises
+import json
 import requests
 
 
@@ -12,6 +24,44 @@ class Foo:
     x: int
 
 
+class Cor(IntEnum):
+    AZUL = 1
+    VERDE = 2
+
+
+class Sabor(Enum):
+    DOCE = "doce"
+
+
+@dataclass(frozen = True)
+class Bar:
+    zeta: str
+    alfa: Foo
+    cor: Cor
+    cores: dict[str, Cor]
+    foos: list[Foo]
+    talvez: str | None
+    sabor: Sabor
+    qualquer: Any
+
+
+@dataclass(frozen = True)
+class Baz:
+    foo: Foo
+    cor: Cor
+    cores: dict[str, Cor]
+    nomes: list[str]
+    talvez: int | None = None
+
+
+@dataclass(frozen = True)
+class Medida:
+    peso: float
+    tara: float | None
+    carga: complex
+    nome: str | None
+
+
 header: str = "\n".join([
     'const RPC = (() => {',
     '    const __NO_RESPONSE   = 0, __JSON_RESPONSE = 1, __BLOB_RESPONSE = 2;',
@@ -213,6 +263,108 @@ def test_post() -> None:
         t.join()
 
 
+def test_jsoner_fluxo() -> None:
+    app: Flask = Flask(__name__)
+    ws: WebSuite = WebSuite(app, "/map")
+    porta = 9999
+
+    def foos(n: int) -> Iterator[Foo]:
+        for i in range(n):
+            yield Foo(i)
+
+    def falha() -> Iterator[Foo]:
+        for foo in foos(1):
+            if foo.x == 0:
+                raise RequisicaoMalFormadaException()
+            yield foo
+
+    @ws.route("GET", "/muitos")
+    @jsoner
+    def muitos() -> Fluxo:
+        return Fluxo("foos", foos(5000))
+
+    @ws.route("GET", "/nenhum")
+    @jsoner
+    def nenhum() -> Fluxo:
+        return Fluxo("foos", foos(0))
+
+    @ws.route("GET", "/falha")
+    @jsoner
+    def erro() -> Fluxo:
+        return Fluxo("foos", falha())
+
+    server: BaseWSGIServer = make_server("0.0.0.0", porta, app, True)
+    app.app_context().push()
+
+    def trabalho() -> None:
+        server.serve_forever()
+
+    t: Thread = Thread(target = trabalho)
+    t.start()
+
+    try:
+        session: requests.Session = requests.Session()
+        session.trust_env = False
+
+        r1: requests.Response = session.get(f"http://127.0.0.1:{porta}/muitos")
+        assert r1.status_code == 200
+        assert r1.headers.get("Content-Length") is None
+        assert r1.json() == {"sucesso": True, "conteudo": {"foos": [{"x": i} for i in range(5000)]}, "status": 200}
+
+        r2: requests.Response = session.get(f"http://127.0.0.1:{porta}/nenhum")
+        assert r2.status_code == 200
+        assert r2.json() == {"sucesso": True, "conteudo": {"foos": []}, "status": 200}
+
+        r3: requests.Response = session.get(f"http://127.0.0.1:{porta}/falha")
+        assert r3.status_code == 400
+        assert r3.json()["tipo"] == "RequisicaoMalFormadaException"
+
+    finally:
+        server.shutdown()
+        t.join()
+
+
+def test_para_json() -> None:
+    b: Bar = Bar("ç", Foo(1), Cor.VERDE, {"b": Cor.AZUL, "a": Cor.VERDE}, [Foo(2), Foo(3)], None, Sabor.DOCE, (Foo(4), Sabor.DOCE, [Cor.AZUL]))
+    esperado: str = "".join([
+        '{"alfa":{"x":1},"cor":2,"cores":{"a":2,"b":1},"foos":[{"x":2},{"x":3}],',
+        '"qualquer":[{"x":4},"doce",[1]],"sabor":"doce","talvez":null,"zeta":"\\u00e7"}'
+    ])
+    assert json.loads(para_json(b)) == json.loads(esperado)
+    assert para_json([b, b]).replace("ç", "\\u00e7") == f"[{esperado},{esperado}]"
+    assert para_json({"x": [Cor.AZUL, 2.5, True]}) == '{"x":[1,2.5,true]}'
+
+
+@dataclass(frozen = True)
+class Recibo:
+    quando: date
+    valor: Decimal
+    codigo: UUID
+    extra: Any
+
+
+def test_para_json_tipos_do_app() -> None:
+    codigo: UUID = UUID("12345678-1234-5678-1234-567812345678")
+    r: Recibo = Recibo(date(2024, 2, 29), Decimal("12.50"), codigo, [datetime(2024, 2, 29, 13, 45, tzinfo = timezone.utc)])
+    esperado: dict[str, Any] = {
+        "quando": "Thu, 29 Feb 2024 00:00:00 GMT",
+        "valor": "12.50",
+        "codigo": "12345678-1234-5678-1234-567812345678",
+        "extra": ["Thu, 29 Feb 2024 13:45:00 GMT"]
+    }
+    assert json.loads(para_json(r)) == esperado
+
+    # Dentro de uma aplicação, vale o default do provedor de JSON dela, como no jsonify.
+    app: Flask = Flask(__name__)
+    app.json.default = lambda v: f"<{v}>" if isinstance(v, UUID) else DefaultJSONProvider.default(v)  # type: ignore[attr-defined]
+    with app.app_context():
+        assert json.loads(para_json(r))["codigo"] == "<12345678-1234-5678-1234-567812345678>"
+        assert json.loads(app.json.dumps(codigo)) == "<12345678-1234-5678-1234-567812345678>"
+
+    with raises(TypeError):
+        para_json({"x": object()})
+
+
 def test_post_param() -> None:
     app: Flask = Flask(__name__)
     ws: WebSuite = WebSuite(app, "/map")
@@ -286,6 +438,80 @@ def test_post_body() -> None:
         t.join()
 
 
+def _tipo_erro(r: TestResponse) -> str:
+    j: Any = r.json
+    assert j is not None
+    return str(j["tipo"])
+
+
+def test_post_body_typed() -> None:
+    app: Flask = Flask(__name__)
+    ws: WebSuite = WebSuite(app, "/map")
+    recebidos: list[Baz] = []
+
+    @ws.route("POST", "/baz", from_body_typed("baz", Baz))
+    @empty_json
+    def baz(body: Baz) -> None:
+        recebidos.append(body)
+
+    @ws.route("POST", "/pequeno", from_body_typed("foo", Foo, max_length = 10))
+    @empty_json
+    def pequeno(body: Foo) -> None:
+        pass
+
+    c: FlaskClient = app.test_client()
+    ok: dict[str, Any] = {"foo": {"x": 1}, "cor": 2, "cores": {"a": 1}, "nomes": ["x", "y"], "ignorado": True}
+    assert c.post("/baz", json = ok).status_code == 200
+    assert c.post("/baz", json = ok | {"talvez": 5}).status_code == 200
+    assert recebidos == [Baz(Foo(1), Cor.VERDE, {"a": Cor.AZUL}, ["x", "y"]), Baz(Foo(1), Cor.VERDE, {"a": Cor.AZUL}, ["x", "y"], 5)]
+
+    assert _tipo_erro(c.post("/baz", json = ok | {"nomes": ["x", 3]})) == "WrongTypeError"
+    assert _tipo_erro(c.post("/baz", json = ok | {"foo": 7})) == "WrongTypeError"
+    assert _tipo_erro(c.post("/baz", json = {"cor": 1})) == "MissingValueError"
+    assert c.post("/baz", json = [1, 2]).status_code == 400
+    assert len(recebidos) == 2
+
+    assert c.post("/pequeno", json = {"x": 1}).status_code == 200
+    r: TestResponse = c.post("/pequeno", json = {"x": 1, "y": "123456789"})
+    assert r.status_code == 413
+    assert _tipo_erro(r) == "ConteudoMuitoGrandeException"
+
+    # Sem Content-Length (chunked), o corpo é cortado ao passar do limite.
+    def chunked(corpo: bytes) -> TestResponse:
+        h: dict[str, str] = {"Content-Type": "application/json", "Transfer-Encoding": "chunked"}
+        return c.post("/pequeno", input_stream = BytesIO(corpo), headers = h, environ_overrides = {"wsgi.input_terminated": True})
+
+    assert chunked(b'{"x": 1}').status_code == 200
+    assert chunked(b'{"x": 123}').status_code == 200  # Exatamente no limite.
+    assert chunked(b'{"x": 1234}').status_code == 413
+    r = chunked(b'{"x": 1, "y": "' + b"9" * 100_000 + b'"}')
+    assert r.status_code == 413
+    assert _tipo_erro(r) == "ConteudoMuitoGrandeException"
+
+
+# Como no dacite, um int serve onde se espera um float ou um complex, e os campos Optional sem valor padrão podem faltar.
+def test_post_body_typed_como_dacite() -> None:
+    app: Flask = Flask(__name__)
+    ws: WebSuite = WebSuite(app, "/map")
+    recebidos: list[Medida] = []
+
+    @ws.route("POST", "/medida", from_body_typed("medida", Medida))
+    @empty_json
+    def medida(body: Medida) -> None:
+        recebidos.append(body)
+
+    c: FlaskClient = app.test_client()
+    assert c.post("/medida", json = {"peso": 3, "tara": 1, "carga": 2, "nome": "caixa"}).status_code == 200
+    assert c.post("/medida", json = {"peso": 3.5, "carga": 2.5}).status_code == 200
+    assert recebidos == [Medida(3, 1, 2, "caixa"), Medida(3.5, None, 2.5, None)]
+    assert isinstance(recebidos[0].peso, int)
+
+    assert _tipo_erro(c.post("/medida", json = {"peso": "3", "carga": 2})) == "WrongTypeError"
+    assert _tipo_erro(c.post("/medida", json = {"peso": True, "carga": 2, "tara": "x"})) == "WrongTypeError"
+    assert _tipo_erro(c.post("/medida", json = {"tara": 1, "carga": 2})) == "MissingValueError"
+    assert len(recebidos) == 2
+
+
 def test_map_simple_get() -> None:
     app: Flask = Flask(__name__)
     ws: WebSuite = WebSuite(app, "/map")
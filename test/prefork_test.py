@@ -0,0 +1,97 @@
+from typing import Callable, Iterable
+from http.client import HTTPConnection, HTTPResponse
+from threading import Thread
+from time import monotonic, sleep
+from wsgiref.types import StartResponse, WSGIEnvironment
+from connection.load import DatabaseConfig
+from servidor import ConfiguracaoServidor, criar_servidor
+from prefork import ConfiguracaoPrefork, Mestre
+from werkzeug.serving import BaseWSGIServer
+from pytest import raises
+import os
+import signal
+
+
+def _servir(config: DatabaseConfig, chave_secreta: str | None, fd: int) -> Callable[[], None]:
+    def app(environ: WSGIEnvironment, start_response: StartResponse) -> Iterable[bytes]:
+        corpo: bytes = f"{os.getpid()} {chave_secreta}".encode("ascii")
+        start_response("200 OK", [("Content-Type", "text/plain"), ("Content-Length", str(len(corpo)))])
+        return [corpo]
+
+    server: BaseWSGIServer = criar_servidor("0.0.0.0", 0, app, ConfiguracaoServidor(trabalhadores = 2, keep_alive = 0.0), fd)
+    t: Thread = Thread(target = server.serve_forever)
+    t.start()
+    return server.shutdown
+
+
+def _pedir(porta: int) -> tuple[int, str]:
+    c: HTTPConnection = HTTPConnection("127.0.0.1", porta, timeout = 10)
+    try:
+        c.request("GET", "/")
+        r: HTTPResponse = c.getresponse()
+        pid, chave = r.read().decode("ascii").split(" ")
+        return int(pid), chave
+    finally:
+        c.close()
+
+
+def _esperar(porta: int, condicao: Callable[[dict[int, str]], bool]) -> dict[int, str]:
+    vistos: dict[int, str] = {}
+    limite: float = monotonic() + 20
+    while monotonic() < limite:
+        pid, chave = _pedir(porta)
+        vistos[pid] = chave
+        if condicao(vistos):
+            return vistos
+    raise AssertionError(f"Condição não atingida: {vistos}")
+
+
+def test_configuracao_invalida() -> None:
+    with raises(ValueError):
+        ConfiguracaoPrefork(processos = 0)
+    with raises(ValueError):
+        ConfiguracaoPrefork(processos = 1, intervalo_reinicio = -1.0)
+
+
+def test_prefork() -> None:
+    leituras: list[int] = []
+
+    def ler_chave(config: DatabaseConfig) -> str:
+        leituras.append(1)
+        return f"chave{len(leituras)}"
+
+    config: DatabaseConfig = DatabaseConfig("sqlite", {})
+    mestre: Mestre = Mestre(0, lambda: config, ler_chave, _servir, ConfiguracaoPrefork(processos = 3, intervalo_reinicio = 0.0), 5.0)
+    porta: int = mestre.porta
+    pid_mestre: int = os.fork()
+    if pid_mestre == 0:
+        try:
+            mestre.executar()
+        finally:
+            os._exit(0)
+    try:
+        # A chave é lida uma vez só pelo mestre e compartilhada por todos os trabalhadores.
+        primeiros: dict[int, str] = _esperar(porta, lambda v: len(v) == 3)
+        assert set(primeiros.values()) == {"chave1"}
+        assert pid_mestre not in primeiros
+
+        # Um trabalhador que morre é substituído.
+        morto: int = next(iter(primeiros))
+        os.kill(morto, signal.SIGKILL)
+        _esperar(porta, lambda v: morto not in v and len(v) == 3)
+
+        # SIGHUP relê a chave e troca todos os trabalhadores.
+        os.kill(pid_mestre, signal.SIGHUP)
+        recarregados: dict[int, str] = _esperar(porta, lambda v: sum(1 for c in v.values() if c == "chave2") == 3)
+        sleep(0.5)
+        for _ in range(20):
+            pid, chave = _pedir(porta)
+            assert chave == "chave2"
+            assert pid in recarregados
+    finally:
+        os.kill(pid_mestre, signal.SIGTERM)
+        _, status = os.waitpid(pid_mestre, 0)
+    assert os.waitstatus_to_exitcode(status) == 0
+    for pid in recarregados:
+        with raises(ProcessLookupError):
+            os.kill(pid, 0)
@@ -0,0 +1,180 @@
+from typing import Iterable
+from threading import Event, Thread
+from socket import create_connection, socket
+from time import monotonic
+from wsgiref.types import StartResponse, WSGIEnvironment
+from servidor import ConfiguracaoServidor, criar_servidor, ServidorComPool
+from werkzeug.serving import BaseWSGIServer
+from pytest import raises
+
+
+class _App:
+
+    def __init__(self) -> None:
+        self.liberar: Event = Event()
+        self.entrou: Event = Event()
+
+    def __call__(self, environ: WSGIEnvironment, start_response: StartResponse) -> Iterable[bytes]:
+        if environ["PATH_INFO"] == "/lento":
+            self.entrou.set()
+            self.liberar.wait(10)
+        start_response("200 OK", [("Content-Type", "text/plain"), ("Content-Length", "2")])
+        return [b"ok"]
+
+
+def _servir(app: _App, config: ConfiguracaoServidor) -> tuple[BaseWSGIServer, Thread]:
+    server: BaseWSGIServer = criar_servidor("127.0.0.1", 0, app, config)
+    t: Thread = Thread(target = server.serve_forever)
+    t.start()
+    return server, t
+
+
+def _conectar(server: BaseWSGIServer) -> socket:
+    return create_connection(("127.0.0.1", server.server_port), timeout = 10)
+
+
+def _pedir(s: socket, caminho: str) -> None:
+    s.sendall(f"GET {caminho} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode("ascii"))
+
+
+def _ler_tudo(s: socket) -> bytes:
+    partes: list[bytes] = []
+    while True:
+        parte: bytes = s.recv(65536)
+        if parte == b"":
+            return b"".join(partes)
+        partes.append(parte)
+
+
+def _ler_resposta(s: socket) -> bytes:
+    resposta: bytes = b""
+    while not resposta.endswith(b"ok"):
+        parte: bytes = s.recv(65536)
+        assert parte != b""
+        resposta += parte
+    return resposta
+
+
+def test_configuracao_invalida() -> None:
+    with raises(ValueError):
+        ConfiguracaoServidor(trabalhadores = -1)
+    with raises(ValueError):
+        ConfiguracaoServidor(fila = 0)
+    with raises(ValueError):
+        ConfiguracaoServidor(keep_alive = -1.0)
+    with raises(ValueError):
+        ConfiguracaoServidor(drenagem = -1.0)
+
+
+def test_sem_trabalhadores_usa_thread_por_conexao() -> None:
+    server: BaseWSGIServer = criar_servidor("127.0.0.1", 0, _App(), ConfiguracaoServidor(trabalhadores = 0))
+    try:
+        assert not isinstance(server, ServidorComPool)
+        assert server.multithread
+    finally:
+        server.server_close()
+
+
+def test_fila_cheia_responde_503() -> None:
+    app: _App = _App()
+    server, t = _servir(app, ConfiguracaoServidor(trabalhadores = 1, fila = 1, keep_alive = 0.0))
+    ocupando: socket = _conectar(server)
+    _pedir(ocupando, "/lento")
+    assert app.entrou.wait(10)
+    esperando: socket = _conectar(server)
+    recusado: socket = _conectar(server)
+    try:
+        _pedir(esperando, "/")
+        resposta: bytes = _ler_tudo(recusado)
+        assert resposta.startswith(b"HTTP/1.1 503 ")
+        assert b"Retry-After: 1\r\n" in resposta
+        assert b'"status":503,' in resposta
+        app.liberar.set()
+        assert _ler_tudo(ocupando).endswith(b"ok")
+        assert _ler_tudo(esperando).endswith(b"ok")
+    finally:
+        app.liberar.set()
+        server.shutdown()
+        t.join()
+        for s in [ocupando, esperando, recusado]:
+            s.close()
+
+
+def test_shutdown_drena_e_fecha_ociosas() -> None:
+    app: _App = _App()
+    server, t = _servir(app, ConfiguracaoServidor(trabalhadores = 2, fila = 4, keep_alive = 30.0))
+    ocioso: socket = _conectar(server)
+    lento: socket = _conectar(server)
+    try:
+        _pedir(ocioso, "/")
+        _ler_resposta(ocioso)
+        _pedir(lento, "/lento")
+        assert app.entrou.wait(10)
+
+        desligando: Thread = Thread(target = server.shutdown)
+        inicio: float = monotonic()
+        desligando.start()
+        assert _ler_tudo(ocioso) == b""
+        app.liberar.set()
+        assert _ler_tudo(lento).endswith(b"ok")
+        desligando.join(10)
+        assert not desligando.is_alive()
+        assert monotonic() - inicio < 10
+    finally:
+        app.liberar.set()
+        server.shutdown()
+        t.join()
+        ocioso.close()
+        lento.close()
+
+
+def test_shutdown_com_fila_cheia_respeita_drenagem() -> None:
+    app: _App = _App()
+    server, t = _servir(app, ConfiguracaoServidor(trabalhadores = 1, fila = 1, keep_alive = 0.0, drenagem = 0.5))
+    ocupando: socket = _conectar(server)
+    _pedir(ocupando, "/lento")
+    assert app.entrou.wait(10)
+    esperando: socket = _conectar(server)
+    recusado: socket = _conectar(server)
+    try:
+        # A recusa mostra que a fila já está cheia, com o único trabalhador ocupado.
+        assert _ler_tudo(recusado).startswith(b"HTTP/1.1 503 ")
+        inicio: float = monotonic()
+        server.shutdown()
+        assert monotonic() - inicio < 5
+    finally:
+        app.liberar.set()
+        server.shutdown()
+        t.join()
+        for s in [ocupando, esperando, recusado]:
+            s.close()
+
+
+def test_ociosas_cedem_o_trabalhador() -> None:
+    app: _App = _App()
+    server, t = _servir(app, ConfiguracaoServidor(trabalhadores = 2, fila = 1, keep_alive = 30.0))
+    ociosos: list[socket] = []
+    novos: list[socket] = []
+    try:
+        # Uma de cada vez, para que a segunda não encontre a fila ainda ocupada pela primeira.
+        for _ in range(2):
+            s: socket = _conectar(server)
+            ociosos.append(s)
+            _pedir(s, "/")
+            _ler_resposta(s)
+
+        # Os dois trabalhadores estão presos nas conexões ociosas, mas as novas são atendidas, uma depois da outra.
+        inicio: float = monotonic()
+        for _ in range(4):
+            s = _conectar(server)
+            novos.append(s)
+            _pedir(s, "/")
+            assert _ler_resposta(s).startswith(b"HTTP/1.1 200 ")
+        assert monotonic() - inicio < 10
+        assert _ler_tudo(ociosos[0]) == b""
+        assert _ler_tudo(ociosos[1]) == b""
+    finally:
+        server.shutdown()
+        t.join()
+        for s in ociosos + novos:
+            s.close()
@@ -0,0 +1,68 @@
+from typing import Iterator
+from validator import (
+    TypeValidationError, dataclass_validate, ValidationMode, set_validation_mode, get_validation_mode,
+    validation_boundary, validation_count, reset_validation_count
+)
+from dataclasses import dataclass
+from pytest import fixture, raises
+
+
+@dataclass_validate
+@dataclass(frozen = True)
+class Wand:
+    wood: str
+    length: float
+
+    def __post_type_validate__(self) -> None:
+        if self.length <= 0:
+            raise ValueError("Too short")
+
+
+@fixture(autouse = True)
+def restore_mode() -> Iterator[None]:
+    yield
+    set_validation_mode(ValidationMode.FULL)
+
+
+def test_default_is_full() -> None:
+    assert get_validation_mode() == ValidationMode.FULL
+    with raises(TypeValidationError):
+        Wand(42, 11.0)  # type: ignore
+
+
+def test_off() -> None:
+    set_validation_mode(ValidationMode.OFF)
+    assert Wand(42, 11.0).wood == 42  # type: ignore
+    with validation_boundary():
+        assert Wand(42, 12.0).wood == 42  # type: ignore
+    with raises(ValueError):
+        Wand("holly", -1.0)
+
+
+def test_boundary() -> None:
+    set_validation_mode(ValidationMode.BOUNDARY)
+    assert Wand(42, 11.0).wood == 42  # type: ignore
+    with validation_boundary():
+        with raises(TypeValidationError):
+            Wand(42, 11.0)  # type: ignore
+        with raises(ValueError):
+            Wand("holly", -1.0)
+    assert Wand(42, 11.0).wood == 42  # type: ignore
+    with raises(ValueError):
+        Wand("holly", -1.0)
+
+
+def test_counter() -> None:
+    reset_validation_count()
+    Wand("holly", 11.0)
+    Wand("elder", 15.0)
+    assert validation_count() == 2
+
+    set_validation_mode(ValidationMode.BOUNDARY)
+    Wand("yew", 13.5)
+    with validation_boundary():
+        Wand("vine", 10.75)
+    assert validation_count() == 3
+
+    reset_validation_count()
+    assert validation_count() == 0
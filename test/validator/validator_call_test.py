@@ -1,6 +1,6 @@
 from validator import TypeValidationError, dataclass_validate
 from dataclasses import dataclass
-from typing import Any, Callable, ParamSpec, TypeVar
+from typing import Any, Callable, Iterator, ParamSpec, TypeVar
 from pytest import raises
 
 
@@ -384,3 +384,19 @@ def test_with_generic_type_param() -> None:
     assert z == "B"
     assert t1.u(int) == 42
     assert z == "C"
+
+
+def test_with_generic_of_unreachable_type() -> None:
+    class Escondido:
+        pass
+
+    def foo() -> Iterator[Escondido]:
+        yield Escondido()
+
+    @dataclass_validate
+    @dataclass(frozen = True)
+    class HasCall:
+        x1: Callable[..., Any]
+
+    t1: HasCall = HasCall(foo)
+    assert t1.x1 == foo
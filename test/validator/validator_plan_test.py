@@ -0,0 +1,71 @@
+from validator import TypeValidationError, dataclass_validate, dataclass_validate_local
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Literal, Optional
+from pytest import raises
+
+
+class Color(Enum):
+    RED = 1
+    BLUE = 2
+
+
+@dataclass_validate
+@dataclass(frozen = True)
+class Painting:
+    name: str
+    color: Color
+    size: int | None
+    tags: list[str]
+    notes: dict[str, str]
+    kind: Literal["oil", "watercolor"]
+    extra: Any
+
+
+def test_fast_path_accepts() -> None:
+    p: Painting = Painting("Mona Lisa", Color.RED, None, ["old", "famous"], {"author": "Leonardo"}, "oil", 42)
+    assert p.tags == ["old", "famous"]
+
+
+def test_fast_path_rejects_simple() -> None:
+    with raises(TypeValidationError, match = r"\[name\]: must be an instance of type <class 'str'>, but received <class 'int'>"):
+        Painting(42, Color.RED, None, [], {}, "oil", 42)  # type: ignore
+
+
+def test_fast_path_rejects_enum() -> None:
+    with raises(TypeValidationError):
+        Painting("Mona Lisa", 1, None, [], {}, "oil", 42)  # type: ignore
+
+
+def test_fast_path_rejects_list_item() -> None:
+    with raises(TypeValidationError):
+        Painting("Mona Lisa", Color.RED, None, ["old", 5], {}, "oil", 42)  # type: ignore
+
+
+def test_fast_path_rejects_dict_value() -> None:
+    with raises(TypeValidationError):
+        Painting("Mona Lisa", Color.RED, None, [], {"author": 5}, "oil", 42)  # type: ignore
+
+
+def test_fast_path_rejects_literal() -> None:
+    with raises(TypeValidationError):
+        Painting("Mona Lisa", Color.RED, None, [], {}, "acrylic", 42)  # type: ignore
+
+
+def test_forward_reference_defined_later() -> None:
+    ns: dict[str, Any] = {}
+
+    @dataclass_validate_local(ns)
+    @dataclass(frozen = True)
+    class Frame:
+        inside: Optional["Canvas"]
+
+    @dataclass_validate_local(ns)
+    @dataclass(frozen = True)
+    class Canvas:
+        width: int
+
+    assert Frame(Canvas(5)).inside == Canvas(5)
+    assert Frame(None).inside is None
+    with raises(TypeValidationError):
+        Frame(5)  # type: ignore